@@ -5,12 +5,23 @@ Processes all badge/achievement CSV exports from GamiPress
 and generates SQL for Supabase upload
 """
 
-import csv
-import re
+import argparse
+import itertools
 import json
 import os
+import sys
+import time
 from datetime import datetime
 
+from build_cache import run_cached
+from csv_chunks import DEFAULT_CHUNK_BYTES, csv_chunk_tasks, map_csv_chunks
+from csv_index import read_rows_by_id
+from html_cleanup import clean_html
+from sql_batches import DEFAULT_BATCH_SIZE, insert_batches, write_sql_file
+from sql_copy import COPY_FORMATS, copy_batches
+
+GAMIPRESS_DIR = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/docs/Wordpress CSV\'s/Gamipress Gamification Exports'
+
 # Badge categories and their corresponding CSV files
 BADGE_CATEGORIES = {
     'attack': 'Attack-Badges-Export-2025-July-31-1836.csv',
@@ -22,6 +33,65 @@ BADGE_CATEGORIES = {
     'completed_workouts': 'Completed-Workouts-Export-2025-July-31-1849.csv'
 }
 
+BADGES_SQL = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/badges_import.sql'
+BADGES_SUMMARY = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/badges_summary.json'
+
+BADGES_TABLE_SQL = """
+-- POWLAX Badges and Achievements Table
+CREATE TABLE IF NOT EXISTS badges (
+    id SERIAL PRIMARY KEY,
+    original_id INTEGER UNIQUE,
+    title VARCHAR(255) NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    description TEXT,
+    excerpt TEXT,
+    slug VARCHAR(255) UNIQUE,
+    image_url TEXT,
+    earned_by_type VARCHAR(50),
+    earned_by_config JSONB DEFAULT '{}'::jsonb,
+    points_required INTEGER,
+    points_type_required VARCHAR(50),
+    maximum_earnings INTEGER DEFAULT 1,
+    is_hidden BOOLEAN DEFAULT FALSE,
+    is_sequential BOOLEAN DEFAULT FALSE,
+    congratulations_text TEXT,
+    metadata JSONB DEFAULT '{}'::jsonb,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Create indexes
+CREATE INDEX idx_badge_category ON badges(category);
+CREATE INDEX idx_badge_earned_by ON badges(earned_by_type);
+CREATE INDEX idx_badge_points_type ON badges(points_type_required);
+CREATE INDEX idx_badge_hidden ON badges(is_hidden);
+
+-- Badge progress tracking table
+CREATE TABLE IF NOT EXISTS user_badge_progress (
+    id SERIAL PRIMARY KEY,
+    user_id UUID REFERENCES auth.users,
+    badge_id INTEGER REFERENCES badges(id),
+    progress INTEGER DEFAULT 0,
+    earned_count INTEGER DEFAULT 0,
+    first_earned_at TIMESTAMP,
+    last_earned_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW(),
+    UNIQUE(user_id, badge_id)
+);
+
+-- Badge requirements table (for complex multi-step badges)
+CREATE TABLE IF NOT EXISTS badge_requirements (
+    id SERIAL PRIMARY KEY,
+    badge_id INTEGER REFERENCES badges(id),
+    requirement_type VARCHAR(50),
+    requirement_config JSONB,
+    sequence_order INTEGER,
+    is_optional BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+"""
+
 # Point type mappings
 POINT_TYPE_MAP = {
     'lax-credit': 'lax_credit',
@@ -34,19 +104,20 @@ POINT_TYPE_MAP = {
     'flex-point': 'flex_point'
 }
 
-def clean_html(text):
-    """Remove HTML tags and WordPress shortcodes"""
-    if not text:
-        return ""
-    # Remove HTML comments
-    text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    # Remove WordPress shortcodes
-    text = re.sub(r'\[.*?\]', '', text)
-    # Clean up whitespace
-    text = ' '.join(text.split())
-    return text.strip()
+BADGE_COLUMNS = [
+    'original_id', 'title', 'category', 'description', 'excerpt', 'slug',
+    'image_url', 'earned_by_type', 'earned_by_config', 'points_required',
+    'points_type_required', 'maximum_earnings', 'is_hidden', 'is_sequential',
+    'congratulations_text', 'metadata'
+]
+
+# Columns refreshed when a badge is imported again
+BADGE_CONFLICT_UPDATES = [
+    'title = EXCLUDED.title',
+    'category = EXCLUDED.category',
+    'description = EXCLUDED.description',
+    'updated_at = NOW()'
+]
 
 def extract_image_url(url_field):
     """Extract the first image URL from pipe-separated list"""
@@ -136,152 +207,19 @@ def parse_badge_data(row, category):
     
     return badge_data
 
-def create_badge_sql(badge):
-    """Generate SQL insert for a badge"""
-    sql = f"""
-INSERT INTO badges (
-    original_id,
-    title,
-    category,
-    description,
-    excerpt,
-    slug,
-    image_url,
-    earned_by_type,
-    earned_by_config,
-    points_required,
-    points_type_required,
-    maximum_earnings,
-    is_hidden,
-    is_sequential,
-    congratulations_text,
-    metadata,
-    created_at
-) VALUES (
-    {badge['id']},
-    '{badge['title'].replace("'", "''")}',
-    '{badge['category']}',
-    {f"'{badge['description'].replace("'", "''")}'" if badge['description'] else 'NULL'},
-    {f"'{badge['excerpt'].replace("'", "''")}'" if badge['excerpt'] else 'NULL'},
-    '{badge['slug']}',
-    {f"'{badge['image_url']}'" if badge['image_url'] else 'NULL'},
-    '{badge['earned_by_type']}',
-    '{json.dumps(badge['earned_by_config'])}'::jsonb,
-    {badge['points_required'] or 'NULL'},
-    {f"'{badge['points_type_required']}'" if badge['points_type_required'] else 'NULL'},
-    {badge['maximum_earnings'] or 1},
-    {str(badge['hidden']).lower()},
-    {str(badge['sequential']).lower()},
-    {f"'{badge['congratulations_text'].replace("'", "''")}'" if badge['congratulations_text'] else 'NULL'},
-    '{json.dumps(badge['metadata'])}'::jsonb,
-    NOW()
-) ON CONFLICT (original_id) DO UPDATE SET
-    title = EXCLUDED.title,
-    category = EXCLUDED.category,
-    description = EXCLUDED.description,
-    updated_at = NOW();"""
-    return sql
+def iter_parsed_badges(rows, category):
+    """Yield parsed badges from export rows, skipping rows that fail to parse"""
+    for row in rows:
+        if row.get('ID') and row.get('Title'):
+            try:
+                yield parse_badge_data(row, category)
+            except Exception as e:
+                print(f"Error processing badge {row.get('ID', 'unknown')}: {e}")
 
-def main():
-    base_dir = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/docs/Wordpress CSV\'s/Gamipress Gamification Exports'
-    output_sql = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/badges_import.sql'
-    output_summary = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/badges_summary.json'
-    
-    all_badges = []
-    sql_statements = []
-    
-    # Create table definition
-    table_sql = """
--- POWLAX Badges and Achievements Table
-CREATE TABLE IF NOT EXISTS badges (
-    id SERIAL PRIMARY KEY,
-    original_id INTEGER UNIQUE,
-    title VARCHAR(255) NOT NULL,
-    category VARCHAR(50) NOT NULL,
-    description TEXT,
-    excerpt TEXT,
-    slug VARCHAR(255) UNIQUE,
-    image_url TEXT,
-    earned_by_type VARCHAR(50),
-    earned_by_config JSONB DEFAULT '{}'::jsonb,
-    points_required INTEGER,
-    points_type_required VARCHAR(50),
-    maximum_earnings INTEGER DEFAULT 1,
-    is_hidden BOOLEAN DEFAULT FALSE,
-    is_sequential BOOLEAN DEFAULT FALSE,
-    congratulations_text TEXT,
-    metadata JSONB DEFAULT '{}'::jsonb,
-    created_at TIMESTAMP DEFAULT NOW(),
-    updated_at TIMESTAMP DEFAULT NOW()
-);
-
--- Create indexes
-CREATE INDEX idx_badge_category ON badges(category);
-CREATE INDEX idx_badge_earned_by ON badges(earned_by_type);
-CREATE INDEX idx_badge_points_type ON badges(points_type_required);
-CREATE INDEX idx_badge_hidden ON badges(is_hidden);
-
--- Badge progress tracking table
-CREATE TABLE IF NOT EXISTS user_badge_progress (
-    id SERIAL PRIMARY KEY,
-    user_id UUID REFERENCES auth.users,
-    badge_id INTEGER REFERENCES badges(id),
-    progress INTEGER DEFAULT 0,
-    earned_count INTEGER DEFAULT 0,
-    first_earned_at TIMESTAMP,
-    last_earned_at TIMESTAMP,
-    created_at TIMESTAMP DEFAULT NOW(),
-    updated_at TIMESTAMP DEFAULT NOW(),
-    UNIQUE(user_id, badge_id)
-);
-
--- Badge requirements table (for complex multi-step badges)
-CREATE TABLE IF NOT EXISTS badge_requirements (
-    id SERIAL PRIMARY KEY,
-    badge_id INTEGER REFERENCES badges(id),
-    requirement_type VARCHAR(50),
-    requirement_config JSONB,
-    sequence_order INTEGER,
-    is_optional BOOLEAN DEFAULT FALSE,
-    created_at TIMESTAMP DEFAULT NOW()
-);
-"""
-    
-    sql_statements.append(table_sql)
-    
-    # Process each badge category
-    for category, filename in BADGE_CATEGORIES.items():
-        file_path = os.path.join(base_dir, filename)
-        if not os.path.exists(file_path):
-            print(f"⚠️  Skipping {category} - file not found: {filename}")
-            continue
-        
-        with open(file_path, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            category_badges = []
-            
-            for row in reader:
-                if row.get('ID') and row.get('Title'):
-                    try:
-                        badge = parse_badge_data(row, category)
-                        category_badges.append(badge)
-                        all_badges.append(badge)
-                        sql_statements.append(create_badge_sql(badge))
-                    except Exception as e:
-                        print(f"Error processing badge {row.get('ID', 'unknown')}: {e}")
-            
-            print(f"✅ Processed {len(category_badges)} badges from {category}")
-    
-    # Write SQL file
-    with open(output_sql, 'w', encoding='utf-8') as f:
-        f.write('-- POWLAX Badges and Achievements Import\n')
-        f.write(f'-- Generated: {datetime.now().isoformat()}\n')
-        f.write(f'-- Total Badges: {len(all_badges)}\n\n')
-        f.write('\n'.join(sql_statements))
-    
-    # Generate summary
-    summary = {
-        'total_badges': len(all_badges),
+def new_badge_summary():
+    """Empty running statistics for the badges summary JSON"""
+    return {
+        'total_badges': 0,
         'by_category': {},
         'by_earned_type': {},
         'by_points_type': {},
@@ -291,60 +229,264 @@ CREATE TABLE IF NOT EXISTS badge_requirements (
             'average': 0
         },
         'hidden_badges': 0,
-        'sequential_badges': 0
+        'sequential_badges': 0,
+        # Running totals for the average, removed by finish_badge_summary
+        'points_total': 0,
+        'points_count': 0
     }
+
+def add_badge_to_summary(summary, badge):
+    """Update running summary statistics with one badge"""
+    summary['total_badges'] += 1
+    
+    # Count by category
+    cat = badge['category']
+    summary['by_category'][cat] = summary['by_category'].get(cat, 0) + 1
+    
+    # Count by earned type
+    etype = badge['earned_by_type']
+    summary['by_earned_type'][etype] = summary['by_earned_type'].get(etype, 0) + 1
+    
+    # Count by points type
+    if badge['points_type_required']:
+        ptype = badge['points_type_required']
+        summary['by_points_type'][ptype] = summary['by_points_type'].get(ptype, 0) + 1
+    
+    # Track point requirements
+    points = badge['points_required']
+    if points:
+        requirements = summary['point_requirements']
+        if requirements['min'] is None or points < requirements['min']:
+            requirements['min'] = points
+        if requirements['max'] is None or points > requirements['max']:
+            requirements['max'] = points
+        summary['points_total'] += points
+        summary['points_count'] += 1
+    
+    # Count special flags
+    if badge['hidden']:
+        summary['hidden_badges'] += 1
+    if badge['sequential']:
+        summary['sequential_badges'] += 1
+
+def finish_badge_summary(summary):
+    """Turn the running point totals into the average"""
+    points_total = summary.pop('points_total')
+    points_count = summary.pop('points_count')
+    if points_count:
+        summary['point_requirements']['average'] = points_total / points_count
+
+def merge_badge_summary(summary, partial):
+    """Fold the running summary of a later run of badges into summary"""
+    summary['total_badges'] += partial['total_badges']
+    for key in ('by_category', 'by_earned_type', 'by_points_type'):
+        for name, count in partial[key].items():
+            summary[key][name] = summary[key].get(name, 0) + count
+    requirements = summary['point_requirements']
+    for bound, better in (('min', min), ('max', max)):
+        value = partial['point_requirements'][bound]
+        if value is not None:
+            requirements[bound] = value if requirements[bound] is None else better(requirements[bound], value)
+    for key in ('hidden_badges', 'sequential_badges', 'points_total', 'points_count'):
+        summary[key] += partial[key]
+
+def parse_badge_rows(rows, category):
+    """Parse one category's export rows; returns (badges, running summary)"""
+    summary = new_badge_summary()
+    badges = []
+    for badge in iter_parsed_badges(rows, category):
+        add_badge_to_summary(summary, badge)
+        badges.append(badge)
+    return badges, summary
+
+def badge_parts(base_dir=GAMIPRESS_DIR, workers=1, chunk_bytes=DEFAULT_CHUNK_BYTES, stats=None, out=None):
+    """Yield (badges, running summary) for record-aligned chunks of every
+    category export, in BADGE_CATEGORIES and file order.
+
+    Chunks of all categories share one process pool when workers is not 1,
+    so the category exports are parsed concurrently while results are still
+    merged in BADGE_CATEGORIES order. If given, stats is filled with the
+    rows, badges, bytes and worker seconds of every category read.
+    """
+    plan = []
+    tasks = []
+    for category, filename in BADGE_CATEGORIES.items():
+        file_path = os.path.join(base_dir, filename)
+        if not os.path.exists(file_path):
+            plan.append((category, filename, None))
+            continue
+        category_tasks = csv_chunk_tasks(file_path, chunk_bytes)
+        plan.append((category, filename, len(category_tasks)))
+        tasks.extend(task + (category,) for task in category_tasks)
+    
+    results = map_csv_chunks(parse_badge_rows, tasks, workers, timed=True)
+    for category, filename, task_count in plan:
+        if task_count is None:
+            print(f"⚠️  Skipping {category} - file not found: {filename}", file=out)
+            continue
+        category_stats = {'rows': 0, 'badges': 0,
+                          'bytes': os.path.getsize(os.path.join(base_dir, filename)), 'seconds': 0.0}
+        for _ in range(task_count):
+            (badges, partial), rows, seconds = next(results)
+            category_stats['rows'] += rows
+            category_stats['badges'] += len(badges)
+            category_stats['seconds'] += seconds
+            yield badges, partial
+        if stats is not None:
+            stats[category] = category_stats
+        print(f"✅ Processed {category_stats['badges']} badges from {category}", file=out)
+
+def print_category_stats(stats, out=None):
+    """Per-category ingestion report; seconds are worker time, so with
+    several workers they overlap"""
+    print("\n⏱️  Category Ingestion:", file=out)
+    for category, category_stats in stats.items():
+        print(f"    - {category}: {category_stats['rows']} rows, {category_stats['badges']} badges, "
+              f"{category_stats['bytes'] / 1024:.1f} KB, {category_stats['seconds'] * 1000:.1f} ms", file=out)
+    if stats:
+        slowest = max(stats, key=lambda category: stats[category]['seconds'])
+        largest = max(stats, key=lambda category: stats[category]['bytes'])
+        print(f"    Slowest: {slowest}; largest: {largest}", file=out)
+
+def badges_by_id(ids, base_dir=GAMIPRESS_DIR):
+    """Parse just the badges with these IDs, looked up in every category
+    export's offset index; returns them in ids order. Warnings go to
+    stderr, so the SQL printed for them can be piped to psql"""
+    found = {}
+    for category, filename in BADGE_CATEGORIES.items():
+        file_path = os.path.join(base_dir, filename)
+        if not os.path.exists(file_path):
+            continue
+        try:
+            rows = read_rows_by_id(file_path, [badge_id for badge_id in ids if str(badge_id) not in found])
+        except KeyError as e:
+            print(f"⚠️  Skipping {category} - {e}", file=sys.stderr)
+            continue
+        for badge in iter_parsed_badges(rows.values(), category):
+            found[str(badge['id'])] = badge
+    for badge_id in ids:
+        if str(badge_id) not in found:
+            print(f"⚠️  Badge {badge_id} not found in any category export", file=sys.stderr)
+    return [found[str(badge_id)] for badge_id in ids if str(badge_id) in found]
+
+def badge_record(badge):
+    """Column values for a badge, in BADGE_COLUMNS order"""
+    return [
+        badge['id'],
+        badge['title'],
+        badge['category'],
+        badge['description'] or None,
+        badge['excerpt'] or None,
+        badge['slug'],
+        badge['image_url'] or None,
+        badge['earned_by_type'],
+        badge['earned_by_config'],
+        badge['points_required'] or None,
+        badge['points_type_required'] or None,
+        badge['maximum_earnings'] or 1,
+        badge['hidden'],
+        badge['sequential'],
+        badge['congratulations_text'] or None,
+        badge['metadata']
+    ]
+
+def create_badge_sql(badges, batch_size=DEFAULT_BATCH_SIZE, copy_format=None):
+    """Generate batched SQL inserts, or COPY blocks, for badges"""
+    records = (badge_record(badge) for badge in badges)
+    if copy_format:
+        return copy_batches(
+            'badges', BADGE_COLUMNS, records, copy_format, batch_size,
+            conflict_columns=['original_id'], conflict_updates=BADGE_CONFLICT_UPDATES
+        )
+    return insert_batches(
+        'badges', BADGE_COLUMNS, records, batch_size,
+        conflict_columns=['original_id'], conflict_updates=BADGE_CONFLICT_UPDATES,
+        expressions={'created_at': 'NOW()'}
+    )
+
+def write_badge_outputs(parts, output_sql=BADGES_SQL, output_summary=BADGES_SUMMARY,
+                        batch_size=DEFAULT_BATCH_SIZE, copy_format=None, out=None):
+    """Stream badges from badge_parts into the SQL file and summary JSON,
+    reporting to out (stdout by default)"""
+    summary = new_badge_summary()
     
-    # Analyze badges
-    point_values = []
-    for badge in all_badges:
-        # Count by category
-        cat = badge['category']
-        summary['by_category'][cat] = summary['by_category'].get(cat, 0) + 1
-        
-        # Count by earned type
-        etype = badge['earned_by_type']
-        summary['by_earned_type'][etype] = summary['by_earned_type'].get(etype, 0) + 1
-        
-        # Count by points type
-        if badge['points_type_required']:
-            ptype = badge['points_type_required']
-            summary['by_points_type'][ptype] = summary['by_points_type'].get(ptype, 0) + 1
-        
-        # Track point requirements
-        if badge['points_required']:
-            point_values.append(badge['points_required'])
-        
-        # Count special flags
-        if badge['hidden']:
-            summary['hidden_badges'] += 1
-        if badge['sequential']:
-            summary['sequential_badges'] += 1
+    def badges():
+        for part_badges, partial in parts:
+            merge_badge_summary(summary, partial)
+            yield from part_badges
     
-    # Calculate point statistics
-    if point_values:
-        summary['point_requirements']['min'] = min(point_values)
-        summary['point_requirements']['max'] = max(point_values)
-        summary['point_requirements']['average'] = sum(point_values) / len(point_values)
+    statements = itertools.chain([BADGES_TABLE_SQL], create_badge_sql(badges(), batch_size, copy_format))
+    write_sql_file(output_sql, statements, lambda: (
+        '-- POWLAX Badges and Achievements Import\n'
+        f'-- Generated: {datetime.now().isoformat()}\n'
+        f"-- Total Badges: {summary['total_badges']}\n\n"
+    ))
+    finish_badge_summary(summary)
     
     # Write summary
     with open(output_summary, 'w', encoding='utf-8') as f:
         json.dump(summary, f, indent=2)
     
-    print(f"\n✅ Processed {len(all_badges)} total badges")
-    print(f"📄 SQL file: {output_sql}")
-    print(f"📊 Summary file: {output_summary}")
+    print(f"\n✅ Processed {summary['total_badges']} total badges", file=out)
+    print(f"📄 SQL file: {output_sql}", file=out)
+    print(f"📊 Summary file: {output_summary}", file=out)
     
     # Print summary stats
-    print("\n📈 Badge Statistics:")
-    print("  By Category:")
+    print("\n📈 Badge Statistics:", file=out)
+    print("  By Category:", file=out)
     for cat, count in summary['by_category'].items():
-        print(f"    - {cat}: {count}")
-    print("\n  By Earn Type:")
+        print(f"    - {cat}: {count}", file=out)
+    print("\n  By Earn Type:", file=out)
     for etype, count in summary['by_earned_type'].items():
-        print(f"    - {etype}: {count}")
-    print(f"\n  Special Badges:")
-    print(f"    - Hidden: {summary['hidden_badges']}")
-    print(f"    - Sequential: {summary['sequential_badges']}")
+        print(f"    - {etype}: {count}", file=out)
+    print(f"\n  Special Badges:", file=out)
+    print(f"    - Hidden: {summary['hidden_badges']}", file=out)
+    print(f"    - Sequential: {summary['sequential_badges']}", file=out)
+    
+    return summary
+
+def build_badge_files(batch_size=DEFAULT_BATCH_SIZE, copy_format=None, workers=1,
+                      base_dir=GAMIPRESS_DIR, force=False, out=None):
+    """Write the badges SQL and summary unless the build cache has them.
+
+    Keyed by every category export, this script's sources, batch_size and
+    copy_format. A rebuild ends with the per-category ingestion report.
+    Returns True when the files were rebuilt.
+    """
+    def build():
+        started = time.perf_counter()
+        stats = {}
+        write_badge_outputs(badge_parts(base_dir, workers, stats=stats, out=out),
+                            batch_size=batch_size, copy_format=copy_format, out=out)
+        print_category_stats(stats, out)
+        print(f"    Total: {time.perf_counter() - started:.2f}s with {workers or os.cpu_count()} worker(s)", file=out)
+    
+    return run_cached(
+        'badges', __file__,
+        [os.path.join(base_dir, filename) for filename in BADGE_CATEGORIES.values()],
+        [BADGES_SQL, BADGES_SUMMARY], build,
+        options={'batch_size': batch_size, 'copy_format': copy_format}, force=force, out=out
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate badges SQL from GamiPress exports')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per multi-row INSERT or COPY block')
+    parser.add_argument('--copy', choices=COPY_FORMATS, dest='copy_format',
+                        help='Emit COPY ... FROM STDIN data in this format instead of INSERTs (run with psql)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes parsing the category exports concurrently, in record-aligned chunks (0 = one per CPU); output is identical for any count')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild even if the build cache has outputs for these inputs')
+    parser.add_argument('--ids', nargs='+', metavar='ID',
+                        help='Print upsert SQL for just these badges instead of rebuilding every file')
+    args = parser.parse_args()
+    
+    if args.ids:
+        for statement in create_badge_sql(badges_by_id(args.ids), args.batch_size, args.copy_format):
+            print(statement)
+        return
+    
+    build_badge_files(args.batch_size, args.copy_format, args.workers, force=args.force)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
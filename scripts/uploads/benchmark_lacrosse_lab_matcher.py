@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Lacrosse Lab Matcher Benchmark
+Generates synthetic Video Sheet / Lacrosse Lab corpora and measures how
+match_lacrosse_lab_ids scales: (lab, video) pairs actually scored per
+second, end-to-end wall time, peak memory and agreement with the
+exhaustive baseline scan
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import sys
+import time
+from datetime import datetime
+
+import match_lacrosse_lab_ids as matcher
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Budget of exhaustive (lab, video) pairs used for the baseline comparison
+DEFAULT_BASELINE_PAIRS = 1000000
+
+# Word counts drawn for generated text, shaped like the Strategies export
+# (most entries are short, with a long WordPress tail)
+VIDEO_CONTENT_WORDS = [0, 15, 20, 25, 40, 110, 300]
+LAB_DESCRIPTION_WORDS = [0, 20, 30, 60, 250]
+
+FORMATIONS = ['1-4-1', '2-3-1', '2-2-2', '3-3', '1-3-2', '2-1-3', '3-1-2']
+CONCEPTS = [
+    'motion offense', 'man up', 'man down', 'zone defense', 'clear', 'ride',
+    'fast break', 'face off', 'set play', 'wheel', 'rotation', 'swing',
+    'transition', 'dodge', 'pick', 'pairs', 'gears', 'weave', 'mumbo'
+]
+PROGRAMS = ['Cuse', 'Duke', 'Virginia', 'Penn State', 'Hopkins', 'Rutgers', 'Salisbury', 'Denver', 'UNC']
+FILLER = [
+    'the', 'ball', 'carrier', 'attack', 'midfield', 'crease', 'slide', 'adjacent',
+    'cutter', 'shooter', 'goalie', 'stick', 'space', 'alley', 'topside', 'underneath',
+    'communication', 'recover', 'ground', 'balls', 'hitch', 'pass', 'catch', 'feed',
+    'inside', 'roll', 'sweep', 'split', 'screen', 'backside', 'on', 'to', 'and', 'with'
+]
+FOLDERS = {
+    'offense': ['Offense/', 'Motion Offense/', 'Set Plays/'],
+    'defense': ['Defense/', 'Man-to-Man/', 'Zone Defense/'],
+    'man-up': ['Man Up/', 'Man Up & Man Down/'],
+    'man-down': ['Man Down/', 'Man Up & Man Down/'],
+    'clearing': ['Clearing/'],
+    'transition-o-d': ['Transition/', 'Fast Break/'],
+    'riding': ['Riding/'],
+    'face-offs': ['Face Offs/'],
+    'set-plays': ['Set Plays/'],
+    '2-man-game': ['2 Man Game/']
+}
+
+def _paragraph(rng, words):
+    """Random lacrosse-flavoured prose of roughly the given word count"""
+    out = []
+    while len(out) < words:
+        roll = rng.random()
+        if roll < 0.08:
+            out.append(rng.choice(FORMATIONS))
+        elif roll < 0.2:
+            out.extend(rng.choice(CONCEPTS).split())
+        else:
+            out.append(rng.choice(FILLER))
+    return ' '.join(out).capitalize() + '.'
+
+def _perturb(rng, name):
+    """Lab-side variant of a video name: dropped, swapped or added words"""
+    words = name.split()
+    roll = rng.random()
+    if roll < 0.3 or len(words) < 3:
+        return name
+    if roll < 0.6:
+        del words[rng.randrange(len(words))]
+    elif roll < 0.8:
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    else:
+        words.insert(rng.randrange(len(words)), rng.choice(FILLER).title())
+    return ' '.join(words)
+
+def generate_corpus(size, seed=0):
+    """Generate (video_data, lab_data) with `size` rows each.
+
+    About 70% of lab rows are perturbed copies of a video row in a matching
+    folder; the rest are unrelated noise, so both accepted and unmatched
+    paths are exercised.
+    """
+    rng = random.Random(seed)
+    types = list(FOLDERS)
+    video_data = []
+    for i in range(size):
+        video_types = rng.sample(types, rng.choice([1, 1, 2, 3]))
+        name = ' '.join([
+            rng.choice(PROGRAMS) if rng.random() < 0.3 else '',
+            rng.choice(FORMATIONS) if rng.random() < 0.5 else '',
+            rng.choice(CONCEPTS).title(),
+            rng.choice(FILLER).title(),
+            str(i)
+        ]).split()
+        video_data.append({
+            'Id': str(10000 + i),
+            'name': ' '.join(name),
+            'type': ';'.join(video_types),
+            'Content': _paragraph(rng, rng.choice(VIDEO_CONTENT_WORDS))
+        })
+
+    lab_data = []
+    for i in range(size):
+        if rng.random() < 0.7:
+            video_row = video_data[rng.randrange(size)]
+            vtype = video_row['type'].split(';')[0]
+            lab_data.append({
+                'name': _perturb(rng, video_row['name']),
+                'folderPath': rng.choice(FOLDERS[vtype]),
+                'description': _paragraph(rng, rng.choice(LAB_DESCRIPTION_WORDS))
+            })
+        else:
+            lab_data.append({
+                'name': f"{rng.choice(FILLER).title()} {rng.choice(FILLER).title()} Diagram {i}",
+                'folderPath': rng.choice(FOLDERS[rng.choice(types)]),
+                'description': _paragraph(rng, rng.choice(LAB_DESCRIPTION_WORDS))
+            })
+
+    return video_data, lab_data
+
+def exhaustive_best(videos, lab):
+    """Reference scan: full score_features against every video row"""
+    best_position = None
+    best_score = 0
+    for position, video in enumerate(videos):
+        score = matcher.score_features(video, lab)
+        if score > best_score:
+            best_score = score
+            best_position = position
+    return best_position, best_score
+
+def peak_memory_mb(who=resource.RUSAGE_SELF):
+    """Peak resident set size in MB of this process, or with RUSAGE_CHILDREN
+    of the largest child it has waited for (the matcher's pool workers)"""
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_benchmark(size, scoring, workers, seed, baseline_pairs):
+    """Benchmark one corpus size; meant to run in a fresh process"""
+    video_data, lab_data = generate_corpus(size, seed)
+    scoring = matcher.resolve_scoring(scoring)
+
+    # Same path as match_lab_rows, keeping per-row results in lab order
+    started = time.perf_counter()
+    context = matcher.build_match_context(video_data, scoring)
+    if workers > 1:
+        results = matcher.match_lab_rows_parallel(context, lab_data, workers)
+    else:
+        results = [matcher.match_lab_row(context, lab_row) for lab_row in lab_data]
+    wall_seconds = time.perf_counter() - started
+    matched = sum(1 for accepted, _, _ in results if accepted)
+
+    # Pairs the timed run handed to the scorer: every blocked candidate of
+    # every lab row. Counted afterwards, in this process, so the count adds
+    # no wall time and covers the pool workers too.
+    scored_pairs = sum(
+        len(matcher.candidate_indices(context['index'], matcher.lab_features(lab_row, scoring)))
+        for lab_row in lab_data
+    )
+
+    # Exhaustive baseline on a sample of lab rows
+    rng = random.Random(seed + 1)
+    sample_size = max(1, min(len(lab_data), baseline_pairs // max(1, len(video_data))))
+    agree = 0
+    started = time.perf_counter()
+    for i in rng.sample(range(len(lab_data)), sample_size):
+        position, score = exhaustive_best(context['videos'], matcher.lab_features(lab_data[i], scoring))
+        expected = video_data[position]['Id'] if score >= matcher.MATCH_THRESHOLD else None
+        accepted, entry, _ = results[i]
+        if (entry['Id'] if accepted else None) == expected:
+            agree += 1
+    baseline_seconds = time.perf_counter() - started
+    baseline_pair_count = sample_size * len(video_data)
+
+    return {
+        'rows': size,
+        'videos': len(video_data),
+        'labs': len(lab_data),
+        'matched': matched,
+        'unmatched': len(lab_data) - matched,
+        'wall_seconds': round(wall_seconds, 4),
+        'scored_pairs': scored_pairs,
+        'effective_pairs_per_second': round(scored_pairs / wall_seconds, 1),
+        'cross_product_pairs_per_second': round(len(video_data) * len(lab_data) / wall_seconds, 1),
+        'peak_memory_mb': round(peak_memory_mb(), 1),
+        'peak_worker_memory_mb': round(peak_memory_mb(resource.RUSAGE_CHILDREN), 1),
+        'baseline': {
+            'sample_rows': sample_size,
+            'pairs': baseline_pair_count,
+            'pairs_per_second': round(baseline_pair_count / baseline_seconds, 1),
+            'agreement': round(agree / sample_size, 4)
+        }
+    }
+
+def _benchmark_child(queue, args):
+    queue.put(run_benchmark(*args))
+
+def _run_isolated(size, scoring, workers, seed, baseline_pairs):
+    """Run one benchmark in a fresh interpreter so peak memory is per size.
+
+    A plain Process is used rather than a Pool because pool workers are
+    daemonic and could not start the matcher's own worker pool.
+    """
+    mp_context = multiprocessing.get_context('spawn')
+    queue = mp_context.Queue()
+    process = mp_context.Process(
+        target=_benchmark_child, args=(queue, (size, scoring, workers, seed, baseline_pairs))
+    )
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Lacrosse Lab matcher on synthetic corpora')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Rows per side to generate')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--baseline-pairs', type=int, default=DEFAULT_BASELINE_PAIRS,
+                        help='Exhaustive pairs scored per size for the agreement check')
+    parser.add_argument('--name-similarity', choices=matcher.NAME_SCORERS, default=matcher.DEFAULT_SCORING['name'])
+    parser.add_argument('--content-similarity', choices=matcher.CONTENT_SCORERS,
+                        default=matcher.DEFAULT_SCORING['content'])
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    scoring = {'name': args.name_similarity, 'content': args.content_similarity}
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scoring': matcher.resolve_scoring(scoring),
+        'workers': args.workers,
+        'seed': args.seed,
+        'results': []
+    }
+
+    for size in args.sizes:
+        print(f"⏱️  Benchmarking {size} x {size} rows...", file=sys.stderr)
+        result = _run_isolated(size, scoring, args.workers, args.seed, args.baseline_pairs)
+        report['results'].append(result)
+        print(f"   {result['wall_seconds']}s wall, {result['effective_pairs_per_second']:.0f} pairs/s scored, "
+              f"{result['peak_memory_mb']} MB peak ({result['peak_worker_memory_mb']} MB per worker), "
+              f"agreement {result['baseline']['agreement']:.1%}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"📊 Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
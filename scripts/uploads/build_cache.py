@@ -0,0 +1,229 @@
+"""
+Content-addressed build cache for the upload scripts
+A stage is keyed by the hashes of its input files, of the script sources
+that generate it and of its output-affecting options. When the key matches
+the last build, the stage is skipped and its recorded outputs are reused,
+restored from the object store if they were changed or deleted.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import shutil
+
+PROJECT_DIR = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app'
+BUILD_CACHE_DIR = os.path.join(PROJECT_DIR, '.upload_build_cache')
+
+# Bump to invalidate every cached stage after a change to the cache format
+CACHE_VERSION = 1
+
+# Bytes read at a time while hashing
+HASH_BLOCK_BYTES = 1024 * 1024
+
+def file_digest(path):
+    """sha256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def file_state(path, known=None):
+    """{'stat': [size, mtime_ns], 'sha256': digest} for a file, or None if missing.
+
+    If known is the state recorded for the same path and the size and
+    modification time still match, its digest is reused without reading
+    the file.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    stat_key = [stat.st_size, stat.st_mtime_ns]
+    if known and known.get('stat') == stat_key:
+        return {'stat': stat_key, 'sha256': known['sha256']}
+    return {'stat': stat_key, 'sha256': file_digest(path)}
+
+def local_sources(script_path):
+    """The script and every sibling module it imports, directly or not, sorted"""
+    script_dir = os.path.dirname(os.path.abspath(script_path))
+    pending = [os.path.abspath(script_path)]
+    found = set()
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        found.add(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                module_path = os.path.join(script_dir, name.split('.')[0] + '.py')
+                if os.path.exists(module_path):
+                    pending.append(module_path)
+    return sorted(found)
+
+def _states(paths, known):
+    """file_state for every path, reusing digests from a previous manifest section"""
+    return {path: file_state(path, known.get(path)) for path in paths}
+
+def _digests(states):
+    """{path: digest} for states, None for missing files"""
+    return {path: state and state['sha256'] for path, state in states.items()}
+
+def _object_path(digest):
+    return os.path.join(BUILD_CACHE_DIR, 'objects', digest[:2], digest)
+
+def _manifest_path(stage):
+    return os.path.join(BUILD_CACHE_DIR, 'stages', f'{stage}.json')
+
+def _copy_file(source, destination):
+    """Copy into a temporary file and move it into place, so readers never see half a file"""
+    os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+    partial = destination + '.part'
+    shutil.copyfile(source, partial)
+    os.replace(partial, destination)
+
+def load_manifest(stage):
+    """The manifest recorded by a stage's last build, or {}"""
+    try:
+        with open(_manifest_path(stage), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_manifest(stage, manifest):
+    path = _manifest_path(stage)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.part', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + '.part', path)
+
+def _referenced_digests():
+    """Digests of every output recorded by any stage manifest"""
+    stages_dir = os.path.join(BUILD_CACHE_DIR, 'stages')
+    if not os.path.isdir(stages_dir):
+        return set()
+    digests = set()
+    for filename in os.listdir(stages_dir):
+        if filename.endswith('.json'):
+            manifest = load_manifest(filename[:-len('.json')])
+            digests.update(state['sha256'] for state in manifest.get('outputs', {}).values())
+    return digests
+
+def stage_key(stage, input_states, source_states, options, outputs):
+    """Cache key for a stage: a hash of everything its outputs depend on"""
+    data = json.dumps({
+        'version': CACHE_VERSION,
+        'stage': stage,
+        'inputs': _digests(input_states),
+        'sources': {os.path.basename(path): digest for path, digest in _digests(source_states).items()},
+        'options': options or {},
+        'outputs': sorted(outputs),
+    }, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+def restore_outputs(manifest):
+    """Bring every recorded output back to its cached contents.
+
+    Outputs whose stat or digest still matches are left alone; others are
+    copied back from the object store. Returns the refreshed output states,
+    or None when an object is missing and the stage must be rebuilt.
+    """
+    states = {}
+    for path, recorded in manifest.get('outputs', {}).items():
+        state = file_state(path, recorded)
+        if state is None or state['sha256'] != recorded['sha256']:
+            cached = _object_path(recorded['sha256'])
+            if not os.path.exists(cached):
+                return None
+            _copy_file(cached, path)
+            state = file_state(path, recorded)
+        states[path] = state
+    return states
+
+def store_outputs(outputs):
+    """Copy outputs into the object store under their digests; returns their states"""
+    states = {}
+    for path in outputs:
+        state = file_state(path)
+        if state is None:
+            raise FileNotFoundError(f"build did not write {path}")
+        cached = _object_path(state['sha256'])
+        if not os.path.exists(cached):
+            _copy_file(path, cached)
+        states[path] = state
+    return states
+
+def prune_objects(digests):
+    """Remove cached objects among digests that no stage manifest refers to"""
+    referenced = _referenced_digests()
+    for digest in set(digests) - referenced:
+        try:
+            os.remove(_object_path(digest))
+        except FileNotFoundError:
+            pass
+
+def _stage_state(stage, script_path, inputs, outputs, options):
+    """(manifest, input states, source states, key) for a stage as it stands now"""
+    manifest = load_manifest(stage)
+    input_states = _states(inputs, manifest.get('inputs', {}))
+    source_states = _states(local_sources(script_path), manifest.get('sources', {}))
+    key = stage_key(stage, input_states, source_states, options, outputs)
+    return manifest, input_states, source_states, key
+
+def is_cached(stage, script_path, inputs, outputs, options=None):
+    """True if run_cached would reuse the stage's outputs for these arguments.
+
+    Nothing is built or restored, so callers can skip work a cached stage
+    will not need.
+    """
+    manifest, _, _, key = _stage_state(stage, script_path, inputs, outputs, options)
+    if manifest.get('key') != key:
+        return False
+    for path, recorded in manifest['outputs'].items():
+        state = file_state(path, recorded)
+        if (state is None or state['sha256'] != recorded['sha256']) \
+                and not os.path.exists(_object_path(recorded['sha256'])):
+            return False
+    return True
+
+def run_cached(stage, script_path, inputs, outputs, build, options=None, force=False, out=None):
+    """Run build() to write outputs from inputs, unless the cache already has them.
+
+    script_path and every sibling module it imports make up the stage's
+    version, and options holds whatever arguments change the outputs. On a
+    hit the outputs are restored if needed and build is not called. With
+    force the stage is always rebuilt. The cache hit message goes to out,
+    stdout by default. Returns True when build ran.
+    """
+    manifest, input_states, source_states, key = _stage_state(stage, script_path, inputs, outputs, options)
+
+    if not force and manifest.get('key') == key:
+        output_states = restore_outputs(manifest)
+        if output_states is not None:
+            if output_states != manifest['outputs'] or input_states != manifest['inputs'] \
+                    or source_states != manifest['sources']:
+                # Keep refreshed stats so the next run skips the hashing
+                manifest.update(inputs=input_states, sources=source_states, outputs=output_states)
+                save_manifest(stage, manifest)
+            print(f"♻️  {stage}: inputs unchanged, reusing cached outputs", file=out)
+            return False
+
+    build()
+    previous_outputs = [state['sha256'] for state in manifest.get('outputs', {}).values()]
+    save_manifest(stage, {
+        'key': key,
+        'inputs': input_states,
+        'sources': source_states,
+        'outputs': store_outputs(outputs),
+    })
+    prune_objects(previous_outputs)
+    return True
@@ -0,0 +1,215 @@
+"""
+Record-aligned CSV chunking for parallel parsing
+Splits an export into byte ranges at record boundaries found by seeking and
+resyncing locally, parses them in a process pool and returns results in
+file order, checking every boundary so the rows match a serial read even
+inside quoted multi-line fields
+"""
+
+import csv
+import io
+import multiprocessing
+import os
+import time
+
+from csv_index import iter_record_spans
+
+# Target bytes per chunk handed to a worker
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Bytes read at each seek point to find a record start
+RESYNC_WINDOW_BYTES = 64 * 1024
+
+# Records that must parse with the header's field count to accept a start
+RESYNC_RECORDS = 4
+
+# Appended to a chunk to tell whether its parse ended between records: it
+# only comes back as a record of its own if no quoted field was left open
+END_MARK = '\uffff'
+
+def read_header(path):
+    """(field names, byte offset where the first record starts), the field
+    names as csv.DictReader reads them"""
+    for fields, _, end in iter_record_spans(path, start=0):
+        return fields, end
+    return [], 0
+
+def _looks_like_records(data, at_eof, field_count):
+    """True if data, read from a candidate record start, begins with
+    records of field_count fields.
+
+    Up to RESYNC_RECORDS complete records are checked; a record running to
+    the end of data is left unjudged unless data ends the file. Starting
+    inside a quoted field soon gives records of the wrong width.
+    """
+    checked = 0
+    consumed = 0
+
+    def lines():
+        nonlocal consumed
+        for line in io.BytesIO(data):
+            consumed += len(line)
+            yield line.decode('utf-8', errors='replace')
+
+    try:
+        for fields in csv.reader(lines()):
+            if consumed == len(data) and not at_eof:
+                break
+            if len(fields) != field_count:
+                return False
+            checked += 1
+            if checked == RESYNC_RECORDS:
+                break
+    except csv.Error:
+        return False
+    return checked > 0
+
+def resync_offset(f, offset, size, field_count):
+    """Byte offset of the first plausible record start at or after offset.
+
+    One RESYNC_WINDOW_BYTES window is read, and line starts in its first
+    half are tried. The result is a guess, confirmed when the chunk before
+    it is parsed; if nothing looks like a record, the first line start is
+    returned.
+    """
+    f.seek(offset - 1)
+    f.readline()
+    first = f.tell()
+    if first >= size:
+        return size
+    data = f.read(RESYNC_WINDOW_BYTES)
+    at_eof = first + len(data) >= size
+    position = 0
+    while position < max(1, len(data) // 2):
+        if _looks_like_records(data[position:], at_eof, field_count):
+            return first + position
+        newline = data.find(b'\n', position)
+        if newline == -1:
+            break
+        position = newline + 1
+    return first
+
+def chunk_boundaries(path, chunk_bytes=DEFAULT_CHUNK_BYTES, fieldnames=None, header_end=None):
+    """Byte offsets splitting the records of a CSV file into chunks of at
+    least chunk_bytes: the end of the header, a guessed record start about
+    chunk_bytes after each boundary, and the file size.
+
+    Only the header and a small window at each seek point are read, so
+    finding the boundaries does not grow with the file. A guess may land
+    inside a quoted multi-line field; map_csv_chunks detects that and reads
+    across it exactly.
+    """
+    if fieldnames is None:
+        fieldnames, header_end = read_header(path)
+    size = os.path.getsize(path)
+    offsets = [header_end]
+    with open(path, 'rb') as f:
+        while offsets[-1] + chunk_bytes < size:
+            offset = resync_offset(f, offsets[-1] + chunk_bytes, size, len(fieldnames))
+            if offset >= size:
+                break
+            offsets.append(offset)
+    if offsets[-1] != size:
+        offsets.append(size)
+    return offsets
+
+def read_chunk_rows(path, fieldnames, start, end, check_end=False):
+    """DictReader rows for the records in [start, end).
+
+    Decoded with universal newlines, as open() does for the serial readers,
+    so multi-line fields come out identical. With check_end, None is
+    returned instead when the range does not end between two records.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    if check_end:
+        data += (END_MARK + '\n').encode('utf-8')
+    text = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8')
+    rows = list(csv.DictReader(text, fieldnames=fieldnames))
+    if check_end:
+        last = rows.pop() if rows else {}
+        if list(last.items()) != [(fieldnames[0], END_MARK)] + [(name, None) for name in fieldnames[1:]]:
+            return None
+    return rows
+
+def read_rows_exactly(path, fieldnames, start, until):
+    """(rows, end) for the records from start, a known record start, up to
+    the first record start at or after until, found with an exact scan"""
+    end = start
+    if start < until:
+        for _, _, end in iter_record_spans(path, start):
+            if end >= until:
+                break
+    return read_chunk_rows(path, fieldnames, start, end), end
+
+def csv_chunk_tasks(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """(path, fieldnames, start, end) for every chunk of a CSV file"""
+    fieldnames, header_end = read_header(path)
+    offsets = chunk_boundaries(path, chunk_bytes, fieldnames, header_end)
+    return [(path, fieldnames, start, end) for start, end in zip(offsets, offsets[1:])]
+
+def _parse_chunk(task):
+    """Read one chunk's rows inside a worker and hand them to its parser;
+    None if the chunk did not end on a record boundary"""
+    parse, path, fieldnames, start, end, *args = task
+    rows = read_chunk_rows(path, fieldnames, start, end, check_end=True)
+    return None if rows is None else parse(rows, *args)
+
+def _parse_chunk_timed(task):
+    """_parse_chunk, also returning the rows read and the seconds spent"""
+    started = time.perf_counter()
+    parse, path, fieldnames, start, end, *args = task
+    rows = read_chunk_rows(path, fieldnames, start, end, check_end=True)
+    if rows is None:
+        return None
+    return parse(rows, *args), len(rows), time.perf_counter() - started
+
+def _checked_results(parse, tasks, results, timed):
+    """Yield results in task order, re-reading exactly where a boundary guess was wrong.
+
+    A chunk known to start on a record whose parse also ended between
+    records proves the next chunk's start. When a chunk fails that check,
+    it is read again here from its true start up to the first record start
+    at or after its guessed end, and the following chunk starts from there
+    until a chunk ends on its guessed boundary again.
+    """
+    resume = None
+    for task, result in zip(tasks, results):
+        path, fieldnames, start, end, *args = task
+        if resume is None and result is not None:
+            yield result
+            continue
+        started = time.perf_counter()
+        rows, reached = read_rows_exactly(path, fieldnames, start if resume is None else resume, end)
+        resume = None if reached == end else reached
+        parsed = parse(rows, *args)
+        yield (parsed, len(rows), time.perf_counter() - started) if timed else parsed
+
+def map_csv_chunks(parse, tasks, workers, timed=False):
+    """Yield parse(rows, *args) for each (path, fieldnames, start, end, *args)
+    chunk task, in task order.
+
+    parse must be a module-level function so it can be sent to workers.
+    imap returns results in submission order, so merging them in the
+    order received reproduces a sequential read; chunks whose boundary
+    guess was wrong are read again exactly. One worker parses in this
+    process without a pool. With timed, each result comes as (result,
+    rows read, seconds spent reading and parsing).
+    """
+    tasks = list(tasks)
+    run_chunk = _parse_chunk_timed if timed else _parse_chunk
+    if workers == 1:
+        results = (run_chunk((parse,) + tuple(task)) for task in tasks)
+        yield from _checked_results(parse, tasks, results, timed)
+        return
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context('fork')
+    else:
+        mp_context = multiprocessing.get_context()
+
+    workers = workers or os.cpu_count() or 1
+    with mp_context.Pool(workers) as pool:
+        results = pool.imap(run_chunk, [(parse,) + tuple(task) for task in tasks])
+        yield from _checked_results(parse, tasks, results, timed)
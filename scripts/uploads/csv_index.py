@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Row lookup by ID in large CSV exports
+Builds a sidecar index of record byte offsets by ID once per export file,
+then bisects it and decodes just the requested records, both through
+memory maps
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+
+# Sidecar written next to each indexed export
+INDEX_SUFFIX = '.idx'
+
+# Bump when the sidecar layout changes, so older indexes are rebuilt
+INDEX_VERSION = 2
+
+# Sidecar layout: magic, header length, JSON header padded to 8 bytes, then
+# one fixed-width (key hash, record start, record end) entry per record,
+# sorted by hash and then by position in the export
+INDEX_MAGIC = b'PWLXIDX\0'
+HEADER_SIZE = struct.Struct('<I')
+ENTRY = struct.Struct('<QQQ')
+
+def index_path(path):
+    return path + INDEX_SUFFIX
+
+def key_hash(value):
+    """Stable 64-bit hash of a key value, the sort key of the sidecar table"""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def iter_record_spans(path, start=None):
+    """Yield (fields, start, end) for every record after the header.
+
+    csv.reader pulls the file a line at a time, so the byte offset after
+    the last line it took ends each record. Boundaries therefore follow the
+    csv module exactly, stray quotes in unquoted fields included, which a
+    quote-parity scan would misread. With start, the byte offset of a
+    record, reading begins there and no header is skipped.
+    """
+    consumed = start or 0
+
+    def lines(f):
+        nonlocal consumed
+        for line in f:
+            encoding = 'utf-8-sig' if consumed == 0 else 'utf-8'
+            consumed += len(line)
+            yield line.decode(encoding)
+
+    with open(path, 'rb') as f:
+        f.seek(consumed)
+        reader = csv.reader(lines(f))
+        if start is None:
+            next(reader, None)
+        position = consumed
+        for fields in reader:
+            yield fields, position, consumed
+            position = consumed
+
+def build_row_index(path, key='ID'):
+    """Scan an export once and write its sidecar of record offsets by key;
+    returns the sidecar header.
+
+    Records with an empty key are left out. Entries with the same hash
+    stay in export order, so for a repeated key the first record wins, as
+    csv.DictReader lookups by ID would find it.
+    """
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        fieldnames = next(csv.reader(f), [])
+    if key not in fieldnames:
+        raise KeyError(f"{os.path.basename(path)} has no {key} column")
+    position = fieldnames.index(key)
+
+    entries = []
+    for fields, start, end in iter_record_spans(path):
+        value = fields[position] if position < len(fields) else ''
+        if value:
+            entries.append((key_hash(value), start, end))
+    entries.sort()
+
+    header = {
+        'version': INDEX_VERSION,
+        'stamp': _file_stamp(path),
+        'key': key,
+        'fieldnames': fieldnames,
+        'count': len(entries),
+    }
+    encoded = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    encoded += b' ' * (-(len(INDEX_MAGIC) + HEADER_SIZE.size + len(encoded)) % 8)
+    with open(index_path(path) + '.part', 'wb') as f:
+        f.write(INDEX_MAGIC + HEADER_SIZE.pack(len(encoded)) + encoded)
+        for entry in entries:
+            f.write(ENTRY.pack(*entry))
+    os.replace(index_path(path) + '.part', index_path(path))
+    return header
+
+def _read_header(table):
+    """(header, offset of the first entry) of a mapped sidecar, or None if
+    it is not a sidecar this version wrote"""
+    prefix = len(INDEX_MAGIC) + HEADER_SIZE.size
+    if len(table) < prefix or table[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+        return None
+    size, = HEADER_SIZE.unpack(table[len(INDEX_MAGIC):prefix])
+    try:
+        header = json.loads(table[prefix:prefix + size])
+    except ValueError:
+        return None
+    if header.get('version') != INDEX_VERSION or len(table) != prefix + size + header['count'] * ENTRY.size:
+        return None
+    return header, prefix + size
+
+def _open_sidecar(path):
+    """(header, entries offset, memory map) of an export's sidecar, or None"""
+    try:
+        with open(index_path(path), 'rb') as f:
+            table = _mapped(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    found = _read_header(table)
+    if found is None:
+        table.close()
+        return None
+    return found + (table,)
+
+def load_row_index(path, key='ID', rebuild=False):
+    """(header, entries offset, memory map) of the sidecar index for an
+    export, rebuilt when the export's size or modification time no longer
+    matches or it was built for another key.
+
+    Only the header is read; entries are bisected through the map by
+    find_spans, so loading costs the same whatever the size of the export.
+    The caller closes the map.
+    """
+    sidecar = None if rebuild else _open_sidecar(path)
+    if sidecar is not None and (sidecar[0]['stamp'] != _file_stamp(path) or sidecar[0]['key'] != key):
+        sidecar[2].close()
+        sidecar = None
+    if sidecar is None:
+        build_row_index(path, key)
+        sidecar = _open_sidecar(path)
+    return sidecar
+
+def find_spans(header, offset, table, value):
+    """Yield [start, end] of every record whose key hashes like value, in
+    export order; a hash can be shared, so callers check the key"""
+    target = key_hash(value)
+    low, high = 0, header['count']
+    while low < high:
+        middle = (low + high) // 2
+        if ENTRY.unpack_from(table, offset + middle * ENTRY.size)[0] < target:
+            low = middle + 1
+        else:
+            high = middle
+    for i in range(low, header['count']):
+        entry_hash, start, end = ENTRY.unpack_from(table, offset + i * ENTRY.size)
+        if entry_hash != target:
+            break
+        yield start, end
+
+def _mapped(f):
+    """Read-only memory map of an open file; exports and sidecars both have
+    a header, so neither is empty"""
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def read_rows_by_id(path, ids, key='ID'):
+    """{ID: DictReader row} for the requested IDs found in an export.
+
+    Only the requested records are read, through a memory map, so the cost
+    does not grow with the export. Rows decode as csv.DictReader reads them
+    from the whole file. IDs may be ints or strings; missing IDs are left
+    out, and the result follows the order of ids.
+    """
+    header, offset, table = load_row_index(path, key)
+    rows = {}
+    with table, open(path, 'rb') as f, _mapped(f) as data:
+        for record_id in ids:
+            for start, end in find_spans(header, offset, table, str(record_id)):
+                text = io.TextIOWrapper(io.BytesIO(data[start:end]), encoding='utf-8')
+                row = next(csv.DictReader(text, fieldnames=header['fieldnames']))
+                if row[key] == str(record_id):
+                    rows[str(record_id)] = row
+                    break
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description='Look up rows of a CSV export by ID through its offset index')
+    parser.add_argument('csv', help='Export file')
+    parser.add_argument('ids', nargs='+', metavar='ID', help='Row IDs to print')
+    parser.add_argument('--key', default='ID', help='Column the index is keyed by')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the sidecar index first')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        build_row_index(args.csv, args.key)
+    rows = read_rows_by_id(args.csv, args.ids, args.key)
+    for record_id in args.ids:
+        if str(record_id) not in rows:
+            print(f"⚠️  {args.key} {record_id} not found in {os.path.basename(args.csv)}")
+    print(json.dumps(rows, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,18 @@ Complete POWLAX Gamification Upload Script
 Combines all gamification components (badges, ranks, points) into a comprehensive SQL file
 """
 
-import os
+import argparse
 from datetime import datetime
 
+from build_cache import run_cached
+
+GAMIFICATION_SQL = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/gamification_complete_import.sql'
+GAMIFICATION_TASK = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/tasks/2025-08-05-gamification-system-implementation.md'
+
 def create_complete_gamification_sql():
     """Create comprehensive gamification SQL"""
     
-    base_dir = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app'
-    output_file = os.path.join(base_dir, 'gamification_complete_import.sql')
+    output_file = GAMIFICATION_SQL
     
     # Header
     header = f"""-- POWLAX Complete Gamification System Import
@@ -500,22 +504,30 @@ def create_task_document():
 4. Create gamification dashboard UI
 """
     
-    task_path = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/tasks/2025-08-05-gamification-system-implementation.md'
+    task_path = GAMIFICATION_TASK
     with open(task_path, 'w', encoding='utf-8') as f:
         f.write(task_content)
     
     return task_path
 
-def main():
-    print("🎮 Creating Complete Gamification System...")
+def build_gamification_files(force=False, out=None):
+    """Write the gamification SQL and task document unless the build cache
+    has them; they only depend on this script. Returns True when rebuilt"""
+    def build():
+        print(f"✅ Created gamification SQL: {create_complete_gamification_sql()}", file=out)
+        print(f"📋 Created task document: {create_task_document()}", file=out)
     
-    # Create complete SQL
-    sql_file = create_complete_gamification_sql()
-    print(f"✅ Created gamification SQL: {sql_file}")
+    return run_cached('gamification_complete', __file__, [], [GAMIFICATION_SQL, GAMIFICATION_TASK],
+                      build, force=force, out=out)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the complete gamification SQL bundle')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild even if the build cache has the outputs')
+    args = parser.parse_args()
     
-    # Create task document
-    task_file = create_task_document()
-    print(f"📋 Created task document: {task_file}")
+    print("🎮 Creating Complete Gamification System...")
+    build_gamification_files(args.force)
     
     print("\n🏆 Gamification System Summary:")
     print("  Badges: 58 across 7 categories")
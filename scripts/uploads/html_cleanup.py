@@ -0,0 +1,71 @@
+"""
+HTML and WordPress shortcode cleanup shared by the export parsers
+Strips comments, tags and shortcodes, decodes entities and collapses
+whitespace in one left-to-right scan over each content field
+"""
+
+import html
+import re
+from functools import lru_cache
+
+# Distinct content blocks remembered; GamiPress exports repeat the same
+# requirement and description text across many rows
+CLEAN_CACHE_SIZE = 4096
+
+# Alternatives tried at each position, in this order: a comment wins over a
+# tag, so '<!-- a > b -->' goes as a whole. Shortcodes stay on one line, as
+# the '\[.*?\]' pass they replace did.
+MARKUP_PATTERNS = [
+    ('comment', r'<!--.*?-->'),
+    ('tag', r'<[^>]+>'),
+    ('shortcode', r'\[[^\]\n]*\]'),
+    ('entity', r'&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);?'),
+    ('space', r'\s+'),
+]
+
+def _markup_re(names):
+    return re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in MARKUP_PATTERNS if name in names),
+                      re.DOTALL)
+
+MARKUP_RE = _markup_re({'comment', 'tag', 'shortcode', 'entity', 'space'})
+MARKUP_KEEP_SHORTCODES_RE = _markup_re({'comment', 'tag', 'entity', 'space'})
+
+@lru_cache(maxsize=CLEAN_CACHE_SIZE)
+def clean_html(text, shortcodes=True, collapse_whitespace=True):
+    """Plain text from an HTML content field.
+
+    Comments and tags are always removed and entities decoded; decoded
+    characters are text, so '&lt;b&gt;' comes out as '<b>'. WordPress
+    shortcodes are removed when shortcodes is set. With
+    collapse_whitespace every run of whitespace, decoded &nbsp; included,
+    becomes one space; otherwise whitespace is kept as written. The result
+    is stripped either way.
+    """
+    if not text:
+        return ""
+    pieces = []
+    pending_space = False
+    position = 0
+
+    def emit(piece):
+        nonlocal pending_space
+        if collapse_whitespace and piece.isspace():
+            pending_space = True
+            return
+        if pending_space and pieces:
+            pieces.append(' ')
+        pending_space = False
+        pieces.append(piece)
+
+    for match in (MARKUP_RE if shortcodes else MARKUP_KEEP_SHORTCODES_RE).finditer(text):
+        if match.start() > position:
+            emit(text[position:match.start()])
+        position = match.end()
+        kind = match.lastgroup
+        if kind == 'entity':
+            emit(html.unescape(match.group()))
+        elif kind == 'space':
+            emit(match.group())
+    if position < len(text):
+        emit(text[position:])
+    return ''.join(pieces).strip()
@@ -0,0 +1,163 @@
+"""
+One-to-one assignment of Lacrosse Lab rows to Video Sheet rows
+Maximum-weight matching on the sparse graph of scored (lab, video) pairs
+"""
+
+import heapq
+
+def greedy_choices(edges_by_row):
+    """Each row's independent best video: highest score, earliest position on ties"""
+    choices = []
+    for edges in edges_by_row:
+        best_position = None
+        best_score = 0
+        for position, score in edges:
+            if best_position is None or (score, -position) > (best_score, -best_position):
+                best_score = score
+                best_position = position
+        choices.append(best_position)
+    return choices
+
+def connected_components(edges_by_row):
+    """Group rows that compete, directly or transitively, for the same videos"""
+    parent = list(range(len(edges_by_row)))
+
+    def find(row):
+        while parent[row] != row:
+            parent[row] = parent[parent[row]]
+            row = parent[row]
+        return row
+
+    first_row_for_video = {}
+    for row, edges in enumerate(edges_by_row):
+        for position, _ in edges:
+            other = first_row_for_video.setdefault(position, row)
+            if other != row:
+                parent[find(row)] = find(other)
+
+    components = {}
+    for row, edges in enumerate(edges_by_row):
+        if edges:
+            components.setdefault(find(row), []).append(row)
+    return list(components.values())
+
+def solve_component(rows, edges_by_row, greedy):
+    """Exact maximum-weight matching for one component.
+
+    Successive shortest augmenting paths (Jonker-Volgenant style). Each
+    video starts held by the highest-scoring row that greedily chose it;
+    every other row is then added one at a time with a Dijkstra over
+    reduced costs that stops as soon as the sink is reached. Every row also
+    has a zero-cost edge to the sink, meaning "leave unassigned", so a row
+    only keeps a video when that raises the total score. Returns
+    {row: video position or None}.
+    """
+    # Local node ids: rows 0..R-1, videos R..R+V-1, sink last
+    videos = sorted({position for row in rows for position, _ in edges_by_row[row]})
+    video_node = {position: len(rows) + i for i, position in enumerate(videos)}
+    sink = len(rows) + len(videos)
+    arcs_by_row = [
+        [(video_node[position], -score) for position, score in edges_by_row[row]]
+        for row in rows
+    ]
+    weights = [{node: -cost for node, cost in arcs} for arcs in arcs_by_row]
+
+    # Potentials keeping every residual reduced cost non-negative. Starting
+    # rows at their best score makes that edge and free video -> sink tight,
+    # so the greedy holders below are already an optimal partial matching.
+    potential = [max(row_weights.values()) for row_weights in weights]
+    potential.extend([0.0] * (len(videos) + 1))
+
+    assigned_to = [None] * len(rows)  # None = not placed yet, sink = unassigned
+    owner = {}                        # video node -> row node
+    pending = []
+    for i, row in enumerate(rows):
+        node = video_node[greedy[row]]
+        holder = owner.get(node)
+        if holder is None or weights[i][node] > weights[holder][node]:
+            owner[node] = i
+            assigned_to[i] = node
+            if holder is not None:
+                assigned_to[holder] = None
+                pending.append(holder)
+        else:
+            pending.append(i)
+
+    for source in sorted(pending):
+        distance = {source: 0.0}
+        previous = {}
+        done = set()
+        heap = [(0.0, source)]
+        while heap:
+            dist, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            if node == sink:
+                break
+
+            held = None
+            if node < len(rows):
+                # Row: forward to any video it is not holding, or give up to the sink
+                arcs = arcs_by_row[node]
+                held = assigned_to[node]
+                if held != sink:
+                    arcs = arcs + [(sink, 0.0)]
+            elif node in owner:
+                # Held video: back to its current row
+                holder = owner[node]
+                arcs = [(holder, weights[holder][node])]
+            else:
+                arcs = [(sink, 0.0)]
+
+            base = dist + potential[node]
+            for target, cost in arcs:
+                if target == held or target in done:
+                    continue
+                candidate = base + cost - potential[target]
+                if candidate < dist:
+                    # Float noise on a tight edge
+                    candidate = dist
+                if candidate < distance.get(target, float('inf')):
+                    distance[target] = candidate
+                    previous[target] = node
+                    heapq.heappush(heap, (candidate, target))
+
+        # Shift potentials of settled nodes so reduced costs stay non-negative
+        limit = distance[sink]
+        for node in done:
+            if distance[node] < limit:
+                potential[node] += distance[node] - limit
+
+        # Flip the augmenting path
+        node = sink
+        while node != source:
+            before = previous[node]
+            if before < len(rows):
+                assigned_to[before] = node
+                if node != sink:
+                    owner[node] = before
+            node = before
+
+    return {
+        row: videos[assigned_to[i] - len(rows)] if assigned_to[i] != sink else None
+        for i, row in enumerate(rows)
+    }
+
+def assign_one_to_one(edges_by_row):
+    """Maximum-weight one-to-one assignment over per-row (position, score) edges.
+
+    Components whose rows already have distinct greedy choices are solved
+    by those choices, since every row gets its own best score. Only
+    contested components go through the augmenting-path solver. Returns
+    (assignment, greedy), each a list of video positions or None per row.
+    """
+    greedy = greedy_choices(edges_by_row)
+    assignment = list(greedy)
+    for rows in connected_components(edges_by_row):
+        chosen = [greedy[row] for row in rows]
+        if len(set(chosen)) == len(chosen):
+            continue
+        for row, position in solve_component(rows, edges_by_row, greedy).items():
+            assignment[row] = position
+    return assignment, greedy
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Lacrosse Lab Match Server
+Keeps the Video Sheet features and candidate index in memory and answers
+Lacrosse Lab match queries over a local HTTP endpoint
+
+Endpoints (JSON in, JSON out):
+  GET  /health   video row count and scoring settings
+  POST /match    {"rows": [{"name", "folderPath", "description"}, ...]}
+                 (a single row object is accepted too)
+  POST /reload   {"upsert": [video rows], "delete": [Ids]} applies row deltas;
+                 {"video_csv": path} rebuilds from a Video Sheet export
+Malformed requests get a 400 with an "error" message
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import match_lacrosse_lab_ids as matcher
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Text fields read from each row, which must be strings when present
+LAB_FIELDS = ('name', 'folderPath', 'description')
+VIDEO_FIELDS = ('name', 'type', 'Content')
+
+def check_rows(rows, fields, what):
+    """Return rows, or raise ValueError unless it is a list of row objects
+    whose text fields are strings"""
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError(f"{what} must be a list of row objects")
+    for row in rows:
+        for field in fields:
+            if not isinstance(row.get(field, ''), str):
+                raise ValueError(f"{what}: {field} must be a string")
+    return rows
+
+class MatchService:
+    """In-memory match context with row-level delta updates"""
+
+    def __init__(self, video_data, scoring=None, min_score=matcher.MATCH_THRESHOLD):
+        self.scoring = matcher.resolve_scoring(scoring)
+        self.min_score = min_score
+        self.lock = threading.Lock()
+        self.rebuild(video_data)
+
+    def rebuild(self, video_data):
+        """Replace the whole video side with a fresh context"""
+        context = matcher.build_match_context(list(video_data), self.scoring, self.min_score)
+        positions_by_id = {}
+        for position, video_row in enumerate(context['video_data']):
+            positions_by_id.setdefault(str(video_row['Id']), []).append(position)
+        with self.lock:
+            self.context = context
+            self.positions_by_id = positions_by_id
+
+    def video_count(self):
+        """Number of live video rows"""
+        with self.lock:
+            return sum(len(positions) for positions in self.positions_by_id.values())
+
+    def match(self, lab_rows):
+        """Match lab rows against the current index"""
+        results = []
+        with self.lock:
+            for lab_row in lab_rows:
+                accepted, entry, _ = matcher.match_lab_row(self.context, lab_row)
+                results.append(dict(entry, accepted=accepted))
+        return results
+
+    def apply_delta(self, upsert=(), delete=()):
+        """Apply video row deltas without rebuilding the index.
+
+        Deleted rows are unindexed and their slots left empty. Upserted rows
+        replace every row with the same Id and are appended, so they lose
+        to earlier rows on score ties until the next full rebuild.
+        """
+        with self.lock:
+            removed = 0
+            for video_id in list(delete) + [row['Id'] for row in upsert]:
+                for position in self.positions_by_id.pop(str(video_id), []):
+                    matcher.unindex_video(self.context['index'], position, self.context['videos'][position])
+                    self.context['videos'][position] = None
+                    self.context['video_data'][position] = None
+                    removed += 1
+
+            for video_row in upsert:
+                position = len(self.context['videos'])
+                video = matcher.video_features(video_row, self.scoring)
+                self.context['video_data'].append(video_row)
+                self.context['videos'].append(video)
+                matcher.index_video(self.context['index'], position, video)
+                self.positions_by_id.setdefault(str(video_row['Id']), []).append(position)
+
+        return {'removed': removed, 'added': len(upsert)}
+
+class MatchRequestHandler(BaseHTTPRequestHandler):
+    """JSON request handler bound to a MatchService"""
+
+    service = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _match(self, payload):
+        rows = payload.get('rows', [payload]) if isinstance(payload, dict) else payload
+        rows = check_rows(rows, LAB_FIELDS, 'rows')
+        return {'results': self.service.match([row for row in rows if row.get('name')])}
+
+    def _reload(self, payload):
+        if not isinstance(payload, dict):
+            raise ValueError('reload expects an object with upsert and delete lists or a video_csv path')
+        if payload.get('video_csv'):
+            if not isinstance(payload['video_csv'], str):
+                raise ValueError('video_csv must be a path')
+            try:
+                video_data = matcher.read_video_sheet(payload['video_csv'])
+            except OSError as e:
+                raise ValueError(f"Cannot read video_csv: {e}")
+            self.service.rebuild(video_data)
+            response = {'rebuilt': True}
+        else:
+            upsert = check_rows(payload.get('upsert', []), VIDEO_FIELDS, 'upsert')
+            delete = payload.get('delete', [])
+            if not isinstance(delete, list):
+                raise ValueError('delete must be a list of Ids')
+            response = self.service.apply_delta([row for row in upsert if row.get('Id')], delete)
+        response['videos'] = self.service.video_count()
+        return response
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {'error': f'Unknown endpoint: {self.path}'})
+            return
+        self._send_json(200, {
+            'videos': self.service.video_count(),
+            'scoring': self.service.scoring
+        })
+
+    def do_POST(self):
+        try:
+            payload = self._read_json()
+        except ValueError as e:
+            self._send_json(400, {'error': f'Invalid JSON: {e}'})
+            return
+
+        started = time.perf_counter()
+        try:
+            if self.path == '/match':
+                response = self._match(payload)
+            elif self.path == '/reload':
+                response = self._reload(payload)
+            else:
+                self._send_json(404, {'error': f'Unknown endpoint: {self.path}'})
+                return
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        response['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        self._send_json(200, response)
+
+    def log_message(self, format, *args):
+        # Keep per-request logging out of the way of the startup summary
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve Lacrosse Lab matches from an in-memory index')
+    parser.add_argument('--video-csv', default=matcher.VIDEO_SHEET_CSV, help='Video Sheet export with Id column')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--name-similarity', choices=matcher.NAME_SCORERS, default=matcher.DEFAULT_SCORING['name'])
+    parser.add_argument('--content-similarity', choices=matcher.CONTENT_SCORERS,
+                        default=matcher.DEFAULT_SCORING['content'])
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    service = MatchService(
+        matcher.read_video_sheet(args.video_csv),
+        {'name': args.name_similarity, 'content': args.content_similarity}
+    )
+    MatchRequestHandler.service = service
+
+    server = ThreadingHTTPServer((args.host, args.port), MatchRequestHandler)
+    print(f"✅ Indexed {service.video_count()} video rows in {time.perf_counter() - started:.2f}s")
+    print(f"🚀 Serving Lacrosse Lab matches on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
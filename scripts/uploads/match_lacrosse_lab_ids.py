@@ -3,155 +3,969 @@
 Match Lacrosse Lab URLs with Video Sheet IDs based on content and terminology
 """
 
+import argparse
 import csv
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import multiprocessing
+import os
 import re
 from difflib import SequenceMatcher
 
+from text_similarity import (
+    compile_levenshtein_pattern,
+    estimated_jaccard,
+    lsh_candidates,
+    lsh_keys,
+    minhash_signature,
+    pattern_ratio,
+)
+from lab_match_assignment import assign_one_to_one
+
+# Video Sheet type -> Lacrosse Lab folder path patterns
+TYPE_MAPPINGS = {
+    'offense': ['offense/', 'motion offense/', 'set plays/'],
+    'defense': ['defense/', 'man-to-man/', 'zone defense/'],
+    'man-up': ['man up/', 'man up & man down/', 'man up/'],
+    'man-down': ['man down/', 'man up & man down/', 'man down/'],
+    'clearing': ['clearing/', 'clear/'],
+    'transition-o-d': ['transition/', 'fast break/', 'slow break/'],
+    'riding': ['riding/', 'ride/'],
+    'face-offs': ['face off/', 'faceoff/', 'face-off/'],
+    'set-plays': ['set plays/', 'set play/'],
+    '2-man-game': ['2 man game/', 'two man game/']
+}
+
+# Minimum score for a match to be accepted
+MATCH_THRESHOLD = 50
+
+# How each score component is computed; 'levenshtein' and 'minhash' trade
+# SequenceMatcher ratios for bit-parallel edit distance and estimated Jaccard
+DEFAULT_SCORING = {
+    'name': 'sequence',
+    'content': 'sequence'
+}
+NAME_SCORERS = ('sequence', 'levenshtein')
+CONTENT_SCORERS = ('sequence', 'minhash')
+
+# Default input and output locations
+PROJECT_DIR = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app'
+VIDEO_SHEET_CSV = os.path.join(PROJECT_DIR, "docs/Wordpress CSV's/Strategies and Concepts to LL/Sheet 1-Video Sheet with Vimeo References for Supabase Upload 2.csv")
+LAB_URLS_CSV = os.path.join(PROJECT_DIR, "docs/Wordpress CSV's/Strategies and Concepts to LL/Sheet 1-1-1-POWLAX Lacrosse Lab URLS - Strategies and Concepts.csv")
+OUTPUT_CSV = os.path.join(PROJECT_DIR, 'lacrosse_lab_id_mapping.csv')
+
+# Key lacrosse terms and formation patterns used for term overlap scoring
+TERMS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lacrosse_terms.json')
+
+# Bump when the state file layout or feature format changes
+STATE_VERSION = 1
+
+# Lab row shards queued per worker in parallel mode, to balance uneven rows
+SHARDS_PER_WORKER = 4
+
+# Lab rows read ahead per batch in streaming top-k mode
+STREAM_BATCH_ROWS = 1000
+
+OUTPUT_FORMATS = ('csv', 'jsonl')
+TOP_K_CSV_HEADER = ['Lacrosse Lab Name', 'Folder', 'Rank', 'ID', 'Video Sheet Name', 'Confidence']
+
+# Slack for float rounding when comparing score upper bounds
+PRUNE_EPSILON = 1e-9
+
+# Name tokens too common to be useful as blocking keys
+NAME_STOPWORDS = {'a', 'an', 'and', 'the', 'of', 'to', 'in', 'on', 'for', 'with', 'vs'}
+
+WHITESPACE_RE = re.compile(r'\s+')
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
 def normalize_text(text):
     """Normalize text for better matching"""
     if not text:
         return ""
     # Convert to lowercase and remove extra spaces
-    text = re.sub(r'\s+', ' ', text.lower().strip())
+    text = WHITESPACE_RE.sub(' ', text.lower().strip())
     # Remove punctuation
-    text = re.sub(r'[^\w\s]', '', text)
+    text = PUNCTUATION_RE.sub('', text)
     return text
 
+def load_term_vocabulary(path=TERMS_FILE):
+    """Load the key term vocabulary (literal terms and regex patterns) from JSON"""
+    with open(path, 'r', encoding='utf-8') as f:
+        vocabulary = json.load(f)
+    return {
+        'patterns': list(vocabulary.get('patterns', [])),
+        'terms': [term.lower() for term in vocabulary.get('terms', [])]
+    }
+
+def overlapping_terms(terms):
+    """(term, other) pairs of literal terms whose matches could overlap in
+    some text: other lies inside term, or term ends with words other starts
+    with. Words are the \\w+ runs that \\b bounds."""
+    words = {term: tuple(re.findall(r'\w+', term)) for term in set(terms)}
+    pairs = []
+    for term, term_words in words.items():
+        for other, other_words in words.items():
+            if other == term:
+                continue
+            size = len(other_words)
+            inside = any(term_words[i:i + size] == other_words for i in range(len(term_words) - size + 1))
+            chained = any(term_words[-i:] == other_words[:i]
+                          for i in range(1, min(len(term_words), size)))
+            if inside or chained:
+                pairs.append((term, other))
+    return sorted(pairs)
+
+def compile_term_matcher(vocabulary):
+    """Compile the whole vocabulary into one word-bounded alternation.
+
+    An alternation finds non-overlapping matches only, so it returns the
+    same term set as searching for every term on its own only while no two
+    terms can overlap ("man up" would hide "man"). Overlapping literal
+    terms raise ValueError; the regex patterns, which cannot be checked,
+    must not match any part of a literal term. Longer literals are tried
+    first, and every term is found in a single scan.
+    """
+    overlaps = overlapping_terms(vocabulary['terms'])
+    if overlaps:
+        raise ValueError(f"Overlapping key terms: {', '.join(f'{a!r}/{b!r}' for a, b in overlaps)}")
+    literals = sorted(set(vocabulary['terms']), key=lambda term: (-len(term), term))
+    alternatives = vocabulary['patterns'] + [re.escape(term) for term in literals]
+    return re.compile(r'\b(?:' + '|'.join(alternatives) + r')\b')
+
+KEY_TERM_RE = compile_term_matcher(load_term_vocabulary())
+
 def extract_key_terms(text):
     """Extract key lacrosse terms from text"""
-    key_terms = []
-    term_patterns = [
-        r'\b\d{1}-\d{1}-\d{1}\b',  # Formations like 1-4-1, 2-3-1
-        r'\bman up\b', r'\bman down\b', r'\bzone\b', r'\bdefense\b', r'\boffense\b',
-        r'\bclear\b', r'\bmotion\b', r'\bdodge\b', r'\bpick\b', r'\bwheel\b',
-        r'\brotation\b', r'\bswing\b', r'\btransition\b', r'\bfast break\b',
-        r'\bride\b', r'\bface off\b', r'\bfaceoff\b', r'\bset play\b',
-        r'\bpairs\b', r'\bgears\b', r'\bmumbo\b', r'\bweave\b', r'\bcuse\b',
-        r'\bduke\b', r'\bvirginia\b', r'\bpenn state\b', r'\bhopkins\b',
-        r'\brutgers\b', r'\bsalisbury\b', r'\bdenver\b', r'\bunc\b',
-        r'\bberkman\b', r'\bament\b', r'\bokeefe\b'
-    ]
-    
-    text_lower = text.lower()
-    for pattern in term_patterns:
-        matches = re.findall(pattern, text_lower)
-        key_terms.extend(matches)
-    
-    return set(key_terms)
-
-def calculate_similarity(video_row, lab_row):
-    """Calculate similarity score between video and lab entries"""
-    score = 0.0
-    
-    # Extract data
+    return {match.group(0) for match in KEY_TERM_RE.finditer(text.lower())}
+
+def video_type_buckets(video_type):
+    """Return the TYPE_MAPPINGS buckets listed in a video row's type field.
+
+    Repeats are kept because every listed type earns its own type bonus.
+    """
+    if not video_type:
+        return ()
+    return tuple(t.strip() for t in video_type.split(';') if t.strip() in TYPE_MAPPINGS)
+
+def folder_type_buckets(folder):
+    """Return the TYPE_MAPPINGS buckets whose folder patterns appear in a lab folder path"""
+    if not folder:
+        return frozenset()
+    folder_lower = folder.lower()
+    return frozenset(
+        vtype for vtype, patterns in TYPE_MAPPINGS.items()
+        if any(pattern in folder_lower for pattern in patterns)
+    )
+
+def resolve_scoring(scoring=None):
+    """Merge scoring overrides into DEFAULT_SCORING and validate them"""
+    resolved = dict(DEFAULT_SCORING, **(scoring or {}))
+    if resolved['name'] not in NAME_SCORERS:
+        raise ValueError(f"Unknown name scorer: {resolved['name']}")
+    if resolved['content'] not in CONTENT_SCORERS:
+        raise ValueError(f"Unknown content scorer: {resolved['content']}")
+    return resolved
+
+def _content_features(features, content, scoring):
+    """Attach the content representation the chosen scorer needs"""
+    features['content'] = normalize_text(content)
+    features['has_content'] = bool(content)
+    if scoring['content'] == 'minhash':
+        features['signature'] = minhash_signature(features['content'])
+    return features
+
+def video_features(video_row, scoring=None):
+    """Precompute everything score_features needs from a video row"""
+    scoring = resolve_scoring(scoring)
     video_name = video_row.get('name', '')
     video_type = video_row.get('type', '')
     video_content = video_row.get('Content', '')
     
+    features = {
+        'name': normalize_text(video_name),
+        'terms': extract_key_terms(f"{video_name} {video_type} {video_content}"),
+        'types': video_type_buckets(video_type)
+    }
+    return _content_features(features, video_content, scoring)
+
+def lab_features(lab_row, scoring=None):
+    """Precompute everything score_features needs from a lab row"""
+    scoring = resolve_scoring(scoring)
     lab_name = lab_row.get('name', '')
     lab_folder = lab_row.get('folderPath', '')
     lab_desc = lab_row.get('description', '')
     
+    features = {
+        'name': normalize_text(lab_name),
+        'terms': extract_key_terms(f"{lab_name} {lab_folder} {lab_desc}"),
+        'types': folder_type_buckets(lab_folder)
+    }
+    if scoring['name'] == 'levenshtein':
+        # Compiled once per lab row, reused against every candidate name
+        features['name_pattern'] = compile_levenshtein_pattern(features['name'])
+    return _content_features(features, lab_desc, scoring)
+
+def name_similarity(video, lab):
+    """Similarity of normalized video and lab names, in [0, 1]"""
+    if 'name_pattern' in lab:
+        return pattern_ratio(lab['name_pattern'], video['name'])
+    return SequenceMatcher(None, video['name'], lab['name']).ratio()
+
+def content_similarity(video, lab):
+    """Similarity of video Content and lab description, in [0, 1].
+
+    Uses estimated Jaccard when both sides carry MinHash signatures and the
+    exact SequenceMatcher ratio otherwise.
+    """
+    if 'signature' in video and 'signature' in lab:
+        return estimated_jaccard(video['signature'], lab['signature'])
+    return SequenceMatcher(None, video['content'], lab['content']).ratio()
+
+def score_features(video, lab):
+    """Score a video/lab pair from precomputed features"""
+    score = 0.0
+    
     # Exact name match (highest priority)
-    if normalize_text(video_name) == normalize_text(lab_name):
+    if video['name'] == lab['name']:
         return 100.0
     
-    # Extract key terms
-    video_terms = extract_key_terms(f"{video_name} {video_type} {video_content}")
-    lab_terms = extract_key_terms(f"{lab_name} {lab_folder} {lab_desc}")
-    
     # Term overlap score
+    video_terms = video['terms']
+    lab_terms = lab['terms']
     if video_terms and lab_terms:
-        overlap = len(video_terms.intersection(lab_terms))
-        total = len(video_terms.union(lab_terms))
+        overlap = len(video_terms & lab_terms)
+        total = len(video_terms | lab_terms)
         if total > 0:
             score += (overlap / total) * 40
     
     # Name similarity
-    name_sim = SequenceMatcher(None, normalize_text(video_name), normalize_text(lab_name)).ratio()
-    score += name_sim * 30
+    score += name_similarity(video, lab) * 30
     
     # Type matching from folder path
-    type_mappings = {
-        'offense': ['offense/', 'motion offense/', 'set plays/'],
-        'defense': ['defense/', 'man-to-man/', 'zone defense/'],
-        'man-up': ['man up/', 'man up & man down/', 'man up/'],
-        'man-down': ['man down/', 'man up & man down/', 'man down/'],
-        'clearing': ['clearing/', 'clear/'],
-        'transition-o-d': ['transition/', 'fast break/', 'slow break/'],
-        'riding': ['riding/', 'ride/'],
-        'face-offs': ['face off/', 'faceoff/', 'face-off/'],
-        'set-plays': ['set plays/', 'set play/'],
-        '2-man-game': ['2 man game/', 'two man game/']
-    }
-    
-    # Check type matches
-    if video_type:
-        video_types = [t.strip() for t in video_type.split(';')]
-        lab_folder_lower = lab_folder.lower()
-        for vtype in video_types:
-            if vtype in type_mappings:
-                for folder_pattern in type_mappings[vtype]:
-                    if folder_pattern in lab_folder_lower:
-                        score += 15
-                        break
+    for vtype in video['types']:
+        if vtype in lab['types']:
+            score += 15
     
     # Content/description similarity
-    if video_content and lab_desc:
-        content_sim = SequenceMatcher(None, normalize_text(video_content), normalize_text(lab_desc)).ratio()
-        score += content_sim * 15
+    if video['has_content'] and lab['has_content']:
+        score += content_similarity(video, lab) * 15
     
     return score
 
-def main():
-    # Read video sheet
+def calculate_similarity(video_row, lab_row, scoring=None):
+    """Calculate similarity score between video and lab entries"""
+    return score_features(video_features(video_row, scoring), lab_features(lab_row, scoring))
+
+def name_tokens(normalized_name):
+    """Split a normalized name into blocking tokens"""
+    return {token for token in normalized_name.split() if token not in NAME_STOPWORDS}
+
+def build_candidate_index(videos):
+    """Index video features by normalized name, name tokens, key terms and type buckets.
+
+    Each bucket maps a key to the ascending list of video row positions that
+    carry it, so candidate lists come back in Video Sheet order. When the
+    features carry MinHash signatures an LSH index over content is added.
+    """
+    index = {'exact': {}, 'tokens': {}, 'terms': {}, 'types': {}}
+    for position, video in enumerate(videos):
+        index_video(index, position, video)
+    return index
+
+def video_index_keys(video):
+    """Yield the (bucket, key) pairs a video row is indexed under"""
+    yield 'exact', video['name']
+    for token in name_tokens(video['name']):
+        yield 'tokens', token
+    for term in video['terms']:
+        yield 'terms', term
+    for vtype in set(video['types']):
+        yield 'types', vtype
+    if video.get('signature') and video['has_content']:
+        for key in lsh_keys(video['signature']):
+            yield 'content', key
+
+def index_video(index, position, video):
+    """Add a video row to the candidate index.
+
+    Positions must be added in ascending order to keep buckets sorted.
+    """
+    for bucket, key in video_index_keys(video):
+        index.setdefault(bucket, {}).setdefault(key, []).append(position)
+
+def unindex_video(index, position, video):
+    """Remove a video row from the candidate index"""
+    for bucket, key in video_index_keys(video):
+        positions = index[bucket][key]
+        positions.remove(position)
+        if not positions:
+            del index[bucket][key]
+
+def candidate_indices(index, lab, exact_shortcut=True):
+    """Return the video row positions worth fully scoring against lab features.
+
+    A video row that shares no key term and no type bucket with the lab row
+    can score at most 30 (name) + 15 (content) = 45, so it can never reach
+    MATCH_THRESHOLD. Blocking on terms and types therefore never drops an
+    accepted match; name tokens and LSH content neighbours widen the set for
+    near-miss reporting.
+
+    An exact normalized-name match scores 100 and is found by hash lookup.
+    Without a type bonus no other row can score above 85, so only exact hits
+    and type-bucket hits need to be considered in that case. Pass
+    exact_shortcut=False when every pair reaching the threshold is needed.
+    """
+    candidates = set()
+    for vtype in lab['types']:
+        candidates.update(index['types'].get(vtype, ()))
+    
+    exact_hits = index['exact'].get(lab['name'])
+    if exact_hits and exact_shortcut:
+        candidates.update(exact_hits)
+        return sorted(candidates)
+    
+    for term in lab['terms']:
+        candidates.update(index['terms'].get(term, ()))
+    for token in name_tokens(lab['name']):
+        candidates.update(index['tokens'].get(token, ()))
+    if 'content' in index and lab['has_content']:
+        candidates.update(lsh_candidates(index['content'], lab.get('signature', ())))
+    
+    return sorted(candidates)
+
+def can_still_win(upper_bound, best_score, min_score):
+    """True if a candidate whose score is at most upper_bound could still matter.
+
+    It must be able to beat the current best (ties keep the earlier row)
+    and reach min_score. PRUNE_EPSILON absorbs float rounding between the
+    bound and the final score, which are summed in different orders.
+    """
+    return upper_bound + PRUNE_EPSILON > best_score and upper_bound + PRUNE_EPSILON >= min_score
+
+def lab_matchers(lab):
+    """SequenceMatchers preloaded with the lab side as seq2.
+
+    SequenceMatcher caches its analysis of seq2, so building these once per
+    lab row and only swapping seq1 per candidate skips re-indexing the lab
+    name and description for every video row.
+    """
+    name_matcher = None
+    if 'name_pattern' not in lab:
+        name_matcher = SequenceMatcher(None)
+        name_matcher.set_seq2(lab['name'])
+    
+    content_matcher = None
+    if lab['has_content'] and 'signature' not in lab:
+        content_matcher = SequenceMatcher(None)
+        content_matcher.set_seq2(lab['content'])
+    
+    return name_matcher, content_matcher
+
+def bounded_ratio(matcher, text, fits):
+    """ratio() of text against the matcher's seq2, or None if it cannot fit.
+
+    real_quick_ratio() and quick_ratio() are cheap upper bounds on ratio(),
+    so the full ratio is only computed when both bounds still fit.
+    """
+    matcher.set_seq1(text)
+    if not fits(matcher.real_quick_ratio()) or not fits(matcher.quick_ratio()):
+        return None
+    return matcher.ratio()
+
+def bounded_score(video, lab, matchers, best_score=0, min_score=0):
+    """Score a pair like score_features, cheapest components first.
+
+    Returns None as soon as an upper bound on the remaining components shows
+    the pair cannot beat best_score or reach min_score. Scores that are
+    returned are identical to score_features, including float rounding.
+    """
+    # Exact name match (highest priority)
+    if video['name'] == lab['name']:
+        return 100.0
+    
+    # Term overlap and type matches are set lookups
+    terms_score = None
+    video_terms = video['terms']
+    lab_terms = lab['terms']
+    if video_terms and lab_terms:
+        overlap = len(video_terms & lab_terms)
+        total = len(video_terms | lab_terms)
+        if total > 0:
+            terms_score = (overlap / total) * 40
+    type_matches = sum(1 for vtype in video['types'] if vtype in lab['types'])
+    has_content = video['has_content'] and lab['has_content']
+    
+    partial = (terms_score or 0.0) + type_matches * 15
+    content_cap = 15 if has_content else 0
+    if not can_still_win(partial + 30 + content_cap, best_score, min_score):
+        return None
+    
+    # Name similarity, gated by cheap bounds
+    name_matcher, content_matcher = matchers
+    def name_fits(ratio):
+        return can_still_win(partial + ratio * 30 + content_cap, best_score, min_score)
+    
+    if name_matcher is None:
+        longest = max(len(video['name']), len(lab['name']))
+        if longest and not name_fits(1 - abs(len(video['name']) - len(lab['name'])) / longest):
+            return None
+        name_sim = pattern_ratio(lab['name_pattern'], video['name'])
+    else:
+        name_sim = bounded_ratio(name_matcher, video['name'], name_fits)
+        if name_sim is None:
+            return None
+    
+    # Content/description similarity, gated by cheap bounds
+    content_sim = None
+    if has_content:
+        partial += name_sim * 30
+        if not can_still_win(partial + 15, best_score, min_score):
+            return None
+        if content_matcher is None:
+            content_sim = content_similarity(video, lab)
+        else:
+            def content_fits(ratio):
+                return can_still_win(partial + ratio * 15, best_score, min_score)
+            
+            content_sim = bounded_ratio(content_matcher, video['content'], content_fits)
+            if content_sim is None:
+                return None
+    
+    # Sum in score_features order so ties resolve exactly as before
+    score = 0.0
+    if terms_score is not None:
+        score += terms_score
+    score += name_sim * 30
+    for _ in range(type_matches):
+        score += 15
+    if content_sim is not None:
+        score += content_sim * 15
+    return score
+
+def best_video_match(videos, index, lab, min_score=MATCH_THRESHOLD):
+    """Return (position, score) of the best candidate video for a lab row.
+
+    Candidates are visited in Video Sheet order and pruned with
+    bounded_score, so whenever the exhaustive best reaches min_score the
+    same row and score are returned. Below min_score, the score is only
+    the best among candidates that survived pruning.
+    """
+    best_position = None
+    best_score = 0
+    matchers = lab_matchers(lab)
+    
+    for position in candidate_indices(index, lab):
+        score = bounded_score(videos[position], lab, matchers, best_score, min_score)
+        if score is not None and score > best_score:
+            best_score = score
+            best_position = position
+    
+    return best_position, best_score
+
+def scored_candidates(videos, index, lab, floor=MATCH_THRESHOLD):
+    """Return every (position, score) pair scoring at least floor, in Video Sheet order"""
+    matchers = lab_matchers(lab)
+    edges = []
+    for position in candidate_indices(index, lab, exact_shortcut=False):
+        score = bounded_score(videos[position], lab, matchers, 0, floor)
+        if score is not None and score >= floor:
+            edges.append((position, score))
+    return edges
+
+def top_video_matches(videos, index, lab, k, min_score=MATCH_THRESHOLD):
+    """Return up to k (position, score) candidates reaching min_score, best first.
+
+    A k-sized min-heap holds the current top candidates; once it is full
+    its weakest score is the bar that bounded_score prunes against. Ties
+    keep the earlier Video Sheet row, so the first candidate is exactly
+    what best_video_match accepts.
+    """
+    heap = []
+    matchers = lab_matchers(lab)
+    for position in candidate_indices(index, lab, exact_shortcut=k == 1):
+        best_score = heap[0][0] if len(heap) == k else 0
+        score = bounded_score(videos[position], lab, matchers, best_score, min_score)
+        if score is None or score < min_score:
+            continue
+        if len(heap) < k:
+            heapq.heappush(heap, (score, -position))
+        elif (score, -position) > heap[0]:
+            heapq.heapreplace(heap, (score, -position))
+    return [(-neg_position, score) for score, neg_position in sorted(heap, reverse=True)]
+
+def build_match_context(video_data, scoring=None, min_score=MATCH_THRESHOLD):
+    """Build the video-side features and candidate index shared by every lab row"""
+    scoring = resolve_scoring(scoring)
+    videos = [video_features(video_row, scoring) for video_row in video_data]
+    return {
+        'video_data': video_data,
+        'videos': videos,
+        'index': build_candidate_index(videos),
+        'scoring': scoring,
+        'min_score': min_score
+    }
+
+def result_entry(context, lab_row, best_position, best_score):
+    """Build the (accepted, match or unmatched entry) pair for a lab row's best video"""
+    # Only accept matches with high confidence
+    if best_score >= MATCH_THRESHOLD:
+        best_video = context['video_data'][best_position]
+        return True, {
+            'name': lab_row['name'],
+            'Id': best_video.get('Id'),
+            'confidence': best_score,
+            'video_name': best_video.get('name', ''),
+            'folder': lab_row.get('folderPath', '')
+        }
+    
+    return False, {
+        'name': lab_row['name'],
+        'Id': '',
+        'folder': lab_row.get('folderPath', ''),
+        'best_score': best_score
+    }
+
+def match_lab_row(context, lab_row):
+    """Match one lab row; returns (accepted, match or unmatched entry, best video position)"""
+    lab = lab_features(lab_row, context['scoring'])
+    best_position, best_score = best_video_match(
+        context['videos'], context['index'], lab, context['min_score']
+    )
+    accepted, entry = result_entry(context, lab_row, best_position, best_score)
+    return accepted, entry, best_position
+
+def match_lab_top_k(context, lab_row, k):
+    """Ranked candidate entries for one lab row; the first is the accepted match"""
+    lab = lab_features(lab_row, context['scoring'])
+    candidates = []
+    for position, score in top_video_matches(context['videos'], context['index'], lab, k, context['min_score']):
+        video_row = context['video_data'][position]
+        candidates.append({'Id': video_row.get('Id'), 'video_name': video_row.get('name', ''), 'confidence': score})
+    return {
+        'name': lab_row['name'],
+        'folder': lab_row.get('folderPath', ''),
+        'candidates': candidates
+    }
+
+def match_lab_edges(context, lab_row):
+    """Every (video position, score) pair for one lab row at or above min_score"""
+    lab = lab_features(lab_row, context['scoring'])
+    return scored_candidates(context['videos'], context['index'], lab, context['min_score'])
+
+# Match context installed in each worker process by _init_worker
+_worker_context = None
+
+def _init_worker(context):
+    """Pool initializer: keep the shared match context in the worker"""
+    global _worker_context
+    _worker_context = context
+
+def _match_shard(lab_rows):
+    """Match one shard of lab rows inside a worker process"""
+    return [match_lab_row(_worker_context, lab_row) for lab_row in lab_rows]
+
+def _edge_shard(lab_rows):
+    """Collect candidate edges for one shard of lab rows inside a worker process"""
+    return [match_lab_edges(_worker_context, lab_row) for lab_row in lab_rows]
+
+def _top_k_shard(task):
+    """Rank candidates for one shard of lab rows inside a worker process"""
+    k, lab_rows = task
+    return [match_lab_top_k(_worker_context, lab_row, k) for lab_row in lab_rows]
+
+def match_lab_rows_parallel(context, lab_data, workers, task=_match_shard):
+    """Match lab rows across a process pool, returning results in lab row order.
+
+    The video-side context is handed to each worker once through the pool
+    initializer. With the fork start method it is inherited copy-on-write
+    and never pickled; elsewhere it is pickled once per worker rather than
+    once per task. Only lab row shards and their results cross process
+    boundaries, and imap returns shards in submission order, so the output
+    is identical to a sequential run for any worker count. task is the
+    per-shard function, _match_shard or _edge_shard.
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context('fork')
+    else:
+        mp_context = multiprocessing.get_context()
+    
+    shard_size = max(1, math.ceil(len(lab_data) / (workers * SHARDS_PER_WORKER)))
+    shards = [lab_data[i:i + shard_size] for i in range(0, len(lab_data), shard_size)]
+    
+    results = []
+    with mp_context.Pool(workers, initializer=_init_worker, initargs=(context,)) as pool:
+        for shard_results in pool.imap(task, shards):
+            results.extend(shard_results)
+    return results
+
+def match_lab_rows(video_data, lab_data, scoring=None, min_score=MATCH_THRESHOLD, workers=1):
+    """Find the best video row for every lab row.
+
+    Returns (matches, unmatched) in lab row order. Only blocked candidates
+    are scored and hopeless ones are pruned, so an unmatched row's
+    best_score is a lower bound; pass min_score=0 for exact near misses.
+    With workers > 1 the lab rows are sharded across a process pool.
+    """
+    context = build_match_context(video_data, scoring, min_score)
+    if workers > 1 and len(lab_data) > 1:
+        results = match_lab_rows_parallel(context, lab_data, workers)
+    else:
+        results = [match_lab_row(context, lab_row) for lab_row in lab_data]
+    
+    matches = [entry for accepted, entry, _ in results if accepted]
+    unmatched = [entry for accepted, entry, _ in results if not accepted]
+    return matches, unmatched
+
+def stream_top_k(video_data, lab_rows, k, scoring=None, min_score=MATCH_THRESHOLD, workers=1):
+    """Yield ranked candidate results for lab rows as each one is scored.
+
+    lab_rows may be any iterable, including a lazy CSV reader. Rows are
+    pulled STREAM_BATCH_ROWS at a time, so only one batch and the video side
+    are ever held in memory. Results come out in lab row order for any
+    worker count.
+    """
+    context = build_match_context(video_data, scoring, min_score)
+    lab_rows = iter(lab_rows)
+    if workers <= 1:
+        for lab_row in lab_rows:
+            yield match_lab_top_k(context, lab_row, k)
+        return
+    
+    if 'fork' in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context('fork')
+    else:
+        mp_context = multiprocessing.get_context()
+    shard_size = max(1, STREAM_BATCH_ROWS // (workers * SHARDS_PER_WORKER))
+    with mp_context.Pool(workers, initializer=_init_worker, initargs=(context,)) as pool:
+        while True:
+            batch = list(itertools.islice(lab_rows, STREAM_BATCH_ROWS))
+            if not batch:
+                break
+            shards = [(k, batch[i:i + shard_size]) for i in range(0, len(batch), shard_size)]
+            for shard_results in pool.imap(_top_k_shard, shards):
+                yield from shard_results
+
+def write_top_k(results, output_path, output_format='csv'):
+    """Write ranked results one lab row at a time; returns (matched, unmatched) counts.
+
+    CSV gets one properly quoted row per candidate (Rank 1 is the accepted
+    match) and a single blank-ranked row for lab rows without candidates.
+    JSONL gets one object per lab row.
+    """
+    matched = 0
+    unmatched = 0
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f) if output_format == 'csv' else None
+        if writer:
+            writer.writerow(TOP_K_CSV_HEADER)
+        for result in results:
+            if result['candidates']:
+                matched += 1
+            else:
+                unmatched += 1
+            
+            if writer is None:
+                f.write(json.dumps(result, ensure_ascii=False) + '\n')
+                continue
+            for rank, candidate in enumerate(result['candidates'], 1):
+                writer.writerow([
+                    result['name'], result['folder'], rank,
+                    candidate['Id'], candidate['video_name'], f"{candidate['confidence']:.1f}"
+                ])
+            if not result['candidates']:
+                writer.writerow([result['name'], result['folder'], '', '', '', ''])
+    return matched, unmatched
+
+def match_lab_rows_one_to_one(video_data, lab_data, scoring=None, min_score=MATCH_THRESHOLD, workers=1):
+    """Match lab rows so that no two of them claim the same video row.
+
+    Every pair scoring at least min_score becomes an edge of a sparse
+    bipartite graph, and the assignment maximizing the total confidence is
+    solved on that graph (see lab_match_assignment). Rows given a different
+    video than their independent best, or pushed out to unmatched, are
+    reported as displaced. Returns (matches, unmatched, displaced) in lab
+    row order.
+    """
+    context = build_match_context(video_data, scoring, min_score)
+    if workers > 1 and len(lab_data) > 1:
+        edges_by_row = match_lab_rows_parallel(context, lab_data, workers, _edge_shard)
+    else:
+        edges_by_row = [match_lab_edges(context, lab_row) for lab_row in lab_data]
+    assignment, greedy = assign_one_to_one(edges_by_row)
+    
+    matches = []
+    unmatched = []
+    displaced = []
+    for lab_row, edges, position, greedy_position in zip(lab_data, edges_by_row, assignment, greedy):
+        scores = dict(edges)
+        if position is None:
+            # Report the best score this row could have had on its own
+            accepted, entry = result_entry(context, lab_row, None, 0)
+            entry['best_score'] = scores.get(greedy_position, 0)
+        else:
+            accepted, entry = result_entry(context, lab_row, position, scores[position])
+        (matches if accepted else unmatched).append(entry)
+        
+        if position != greedy_position:
+            greedy_video = video_data[greedy_position]
+            displaced.append({
+                'name': lab_row['name'],
+                'greedy_Id': greedy_video.get('Id'),
+                'greedy_confidence': scores[greedy_position],
+                'Id': entry['Id'],
+                'confidence': entry.get('confidence', 0)
+            })
+    
+    return matches, unmatched, displaced
+
+def row_hash(row):
+    """Stable content hash of a CSV row, independent of column order"""
+    items = sorted((str(key), value) for key, value in row.items())
+    payload = json.dumps(items, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def features_to_json(features):
+    """Convert video features to JSON-safe values for the state file"""
+    data = dict(features)
+    data['terms'] = sorted(features['terms'])
+    data['types'] = list(features['types'])
+    if 'signature' in features:
+        data['signature'] = list(features['signature'])
+    return data
+
+def features_from_json(data):
+    """Inverse of features_to_json"""
+    features = dict(data)
+    features['terms'] = set(data['terms'])
+    features['types'] = tuple(data['types'])
+    if 'signature' in data:
+        features['signature'] = tuple(data['signature'])
+    return features
+
+def state_fingerprint(scoring, min_score):
+    """Hash of everything besides row content that affects match results"""
+    settings = {
+        'version': STATE_VERSION,
+        'scoring': scoring,
+        'min_score': min_score,
+        'threshold': MATCH_THRESHOLD,
+        'types': TYPE_MAPPINGS,
+        'stopwords': sorted(NAME_STOPWORDS),
+        'terms': KEY_TERM_RE.pattern
+    }
+    payload = json.dumps(settings, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def load_match_state(path, fingerprint):
+    """Load a previous match state, or an empty one if missing or stale"""
+    empty = {'fingerprint': fingerprint, 'video_order': [], 'videos': {}, 'labs': {}}
+    if not path or not os.path.exists(path):
+        return empty
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('fingerprint') != fingerprint:
+        return empty
+    return state
+
+def save_match_state(path, state):
+    """Write the match state atomically so an interrupted run keeps the old one"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def delta_could_win(context, added, delta_index, lab, stored):
+    """True if a new or changed video row could tie or beat a stored lab result"""
+    entry = stored['entry']
+    stored_score = entry['confidence'] if stored['accepted'] else entry['best_score']
+    # Ties count: a new row earlier in the sheet would win them
+    best_score = stored_score - 2 * PRUNE_EPSILON
+    matchers = lab_matchers(lab)
+    for delta_position in candidate_indices(delta_index, lab):
+        video = context['videos'][added[delta_position]]
+        score = bounded_score(video, lab, matchers, best_score, context['min_score'])
+        if score is not None and score > best_score:
+            return True
+    return False
+
+def match_lab_rows_incremental(video_data, lab_data, state_path, scoring=None,
+                               min_score=MATCH_THRESHOLD, workers=1):
+    """Match lab rows, rescoring only what changed since the saved state.
+
+    Video features and per-lab results are stored in the state file keyed
+    by row content hashes. A lab row is rescored when it is new or changed,
+    when its stored best video changed or disappeared, or when a new or
+    changed video row could now tie or beat its stored score (those are
+    the only rows whose scores against it changed). If the relative order of
+    surviving video rows changed, tie-breaking could differ, so everything
+    is rescored. Returns (matches, unmatched, stats).
+    """
+    scoring = resolve_scoring(scoring)
+    fingerprint = state_fingerprint(scoring, min_score)
+    state = load_match_state(state_path, fingerprint)
+    
+    # Reuse stored features for unchanged video rows
+    video_hashes = [row_hash(video_row) for video_row in video_data]
+    videos = []
+    for video_hash, video_row in zip(video_hashes, video_data):
+        stored = state['videos'].get(video_hash)
+        videos.append(features_from_json(stored) if stored else video_features(video_row, scoring))
+    context = {
+        'video_data': video_data,
+        'videos': videos,
+        'index': build_candidate_index(videos),
+        'scoring': scoring,
+        'min_score': min_score
+    }
+    
+    current = set(video_hashes)
+    previous = set(state['video_order'])
+    removed = previous - current
+    added = [position for position, video_hash in enumerate(video_hashes) if video_hash not in previous]
+    reordered = (
+        [h for h in video_hashes if h in previous] != [h for h in state['video_order'] if h in current]
+    )
+    delta_index = build_candidate_index([videos[position] for position in added])
+    
+    # Decide which lab rows need rescoring
+    lab_hashes = [row_hash(lab_row) for lab_row in lab_data]
+    results = [None] * len(lab_data)
+    pending = []
+    for i, (lab_hash, lab_row) in enumerate(zip(lab_hashes, lab_data)):
+        stored = state['labs'].get(lab_hash)
+        if stored is None or reordered or stored['video'] in removed:
+            pending.append(i)
+        elif added and delta_could_win(context, added, delta_index, lab_features(lab_row, scoring), stored):
+            pending.append(i)
+        else:
+            results[i] = (stored['accepted'], stored['entry'], stored['video'])
+    
+    # Rescore the affected rows
+    pending_rows = [lab_data[i] for i in pending]
+    if workers > 1 and len(pending_rows) > 1:
+        rescored = match_lab_rows_parallel(context, pending_rows, workers)
+    else:
+        rescored = [match_lab_row(context, lab_row) for lab_row in pending_rows]
+    for i, (accepted, entry, position) in zip(pending, rescored):
+        results[i] = (accepted, entry, video_hashes[position] if position is not None else None)
+    
+    # Persist features and results for the next run
+    state = {
+        'fingerprint': fingerprint,
+        'video_order': video_hashes,
+        'videos': {h: features_to_json(v) for h, v in zip(video_hashes, videos)},
+        'labs': {
+            lab_hash: {'accepted': accepted, 'entry': entry, 'video': video_hash}
+            for lab_hash, (accepted, entry, video_hash) in zip(lab_hashes, results)
+        }
+    }
+    save_match_state(state_path, state)
+    
+    matches = [entry for accepted, entry, _ in results if accepted]
+    unmatched = [entry for accepted, entry, _ in results if not accepted]
+    stats = {
+        'videos_added': len(added),
+        'videos_removed': len(removed),
+        'labs_rescored': len(pending),
+        'labs_reused': len(lab_data) - len(pending)
+    }
+    return matches, unmatched, stats
+
+def read_video_sheet(path):
+    """Read Video Sheet rows that have an Id"""
     video_data = []
-    with open('/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/docs/Wordpress CSV\'s/Strategies and Concepts to LL/Sheet 1-Video Sheet with Vimeo References for Supabase Upload 2.csv', 'r', encoding='utf-8') as f:
+    with open(path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
             if row.get('Id'):  # Only include rows with IDs
                 video_data.append(row)
-    
-    # Read Lacrosse Lab URLs
-    lab_data = []
-    with open('/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/docs/Wordpress CSV\'s/Strategies and Concepts to LL/Sheet 1-1-1-POWLAX Lacrosse Lab URLS - Strategies and Concepts.csv', 'r', encoding='utf-8') as f:
+    return video_data
+
+def iter_lab_urls(path):
+    """Lazily yield Lacrosse Lab URL rows that have a name"""
+    with open(path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
             if row.get('name'):  # Only include rows with names
-                lab_data.append(row)
+                yield row
+
+def read_lab_urls(path):
+    """Read Lacrosse Lab URL rows that have a name"""
+    return list(iter_lab_urls(path))
+
+def parse_args():
+    """Parse command line options; defaults reproduce the original batch run"""
+    parser = argparse.ArgumentParser(description='Match Lacrosse Lab URLs with Video Sheet IDs')
+    parser.add_argument('--video-csv', default=VIDEO_SHEET_CSV, help='Video Sheet export with Id column')
+    parser.add_argument('--lab-csv', default=LAB_URLS_CSV, help='Lacrosse Lab URL export')
+    parser.add_argument('--output', default=OUTPUT_CSV, help='Where to write the ID mapping CSV')
+    parser.add_argument('--name-similarity', choices=NAME_SCORERS, default=DEFAULT_SCORING['name'],
+                        help='Score names with SequenceMatcher or bit-parallel Levenshtein')
+    parser.add_argument('--content-similarity', choices=CONTENT_SCORERS, default=DEFAULT_SCORING['content'],
+                        help='Score Content vs description exactly (sequence) or by MinHash estimate')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for matching (0 = one per CPU); output is identical for any count')
+    parser.add_argument('--state', help='Match state file; when given, only changed rows are rescored')
+    parser.add_argument('--one-to-one', action='store_true',
+                        help='Give each video row to at most one lab row, maximizing total confidence')
+    parser.add_argument('--top-k', type=int,
+                        help='Stream the top K ranked candidates per lab row instead of a single match')
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default='csv',
+                        help='Output format for --top-k streaming')
+    args = parser.parse_args()
+    if args.one_to_one and args.state:
+        parser.error('--one-to-one cannot be combined with --state')
+    if args.top_k is not None:
+        if args.top_k < 1:
+            parser.error('--top-k must be at least 1')
+        if args.one_to_one or args.state:
+            parser.error('--top-k cannot be combined with --one-to-one or --state')
+    if args.workers == 0:
+        args.workers = os.cpu_count() or 1
+    return args
+
+def main():
+    args = parse_args()
+    scoring = {'name': args.name_similarity, 'content': args.content_similarity}
     
-    # Match entries
-    matches = []
-    unmatched = []
+    video_data = read_video_sheet(args.video_csv)
     
-    for lab_row in lab_data:
-        best_match = None
-        best_score = 0
-        best_video = None
-        
-        for video_row in video_data:
-            score = calculate_similarity(video_row, lab_row)
-            if score > best_score:
-                best_score = score
-                best_match = video_row.get('Id')
-                best_video = video_row
-        
-        # Only accept matches with high confidence
-        if best_score >= 50:
-            matches.append({
-                'name': lab_row['name'],
-                'Id': best_match,
-                'confidence': best_score,
-                'video_name': best_video.get('name', ''),
-                'folder': lab_row.get('folderPath', '')
-            })
-        else:
-            unmatched.append({
-                'name': lab_row['name'],
-                'Id': '',
-                'folder': lab_row.get('folderPath', ''),
-                'best_score': best_score
-            })
+    # Streaming top-k mode never holds the lab export in memory
+    if args.top_k:
+        results = stream_top_k(
+            video_data, iter_lab_urls(args.lab_csv), args.top_k, scoring, workers=args.workers
+        )
+        matched, unmatched = write_top_k(results, args.output, args.output_format)
+        print(f"Total video entries: {len(video_data)}")
+        print(f"Total lab entries: {matched + unmatched}")
+        print(f"Matched: {matched}")
+        print(f"Unmatched: {unmatched}")
+        print(f"\nTop {args.top_k} candidates per row written to {os.path.basename(args.output)}")
+        return
+    
+    lab_data = read_lab_urls(args.lab_csv)
+    
+    # Match entries
+    if args.state:
+        matches, unmatched, stats = match_lab_rows_incremental(
+            video_data, lab_data, args.state, scoring, workers=args.workers
+        )
+        print(f"Incremental run: {stats['labs_rescored']} lab rows rescored, "
+              f"{stats['labs_reused']} reused ({stats['videos_added']} video rows new or changed, "
+              f"{stats['videos_removed']} removed)")
+    elif args.one_to_one:
+        matches, unmatched, displaced = match_lab_rows_one_to_one(
+            video_data, lab_data, scoring, workers=args.workers
+        )
+        print(f"One-to-one assignment: {len(displaced)} lab rows displaced from their best video")
+        for row in displaced[:10]:
+            print(f"  {row['name']}: ID {row['greedy_Id']} ({row['greedy_confidence']:.1f}%) "
+                  f"-> {row['Id'] or 'unmatched'}")
+    else:
+        matches, unmatched = match_lab_rows(video_data, lab_data, scoring, workers=args.workers)
     
     # Sort by confidence
     matches.sort(key=lambda x: x['confidence'], reverse=True)
@@ -185,11 +999,11 @@ def main():
         output_rows.append(f'"{unmatch["name"]}",,')
     
     # Write to file
-    with open('/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/lacrosse_lab_id_mapping.csv', 'w', encoding='utf-8') as f:
+    with open(args.output, 'w', encoding='utf-8') as f:
         f.write("Lacrosse Lab Name,ID,Video Sheet Name\n")
         f.write("\n".join(output_rows))
     
-    print(f"\nOutput written to lacrosse_lab_id_mapping.csv")
+    print(f"\nOutput written to {os.path.basename(args.output)}")
     
     # Show some examples
     print("\nTop confident matches:")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+POWLAX Direct Postgres Loader
+Streams parsed drills, workouts, badges and ranks straight into Postgres
+with COPY FROM STDIN while the exports are being read, committing per chunk
+"""
+
+import argparse
+import io
+import os
+import time
+
+from badges_upload import BADGE_COLUMNS, BADGE_CONFLICT_UPDATES, GAMIPRESS_DIR, badge_parts, badge_record
+from ranks_upload import RANK_COLUMNS, RANK_CONFLICT_UPDATES, RANKS_CSV, rank_record, sorted_ranks
+from skills_academy_export import QUIZZES_WORKOUTS_CSV, iter_stream
+from skills_academy_upload import DRILL_COLUMNS, build_drill, drill_record
+from skills_academy_workouts_upload import WORKOUT_COLUMNS, build_workout, workout_record
+from sql_batches import DEFAULT_BATCH_SIZE, record_batches
+from sql_copy import copy_command, copy_lines, staging_sql
+
+def drill_records(path=QUIZZES_WORKOUTS_CSV):
+    """Yield drill records as the export is read"""
+    for row in iter_stream('drill', path):
+        yield drill_record(build_drill(row))
+
+def workout_records(path=QUIZZES_WORKOUTS_CSV):
+    """Yield workout records as the export is read"""
+    for row in iter_stream('workout', path):
+        yield workout_record(build_workout(row))
+
+def badge_records(base_dir=GAMIPRESS_DIR, workers=1):
+    """Yield badge records from the same concurrent, record-aligned chunk
+    reads as badges_upload, in BADGE_CATEGORIES and file order"""
+    for badges, _ in badge_parts(base_dir, workers):
+        for badge in badges:
+            yield badge_record(badge)
+
+def rank_records(path=RANKS_CSV):
+    """Yield rank records in rank order, as ranks_upload writes them"""
+    for rank in sorted_ranks(path):
+        yield rank_record(rank)
+
+# Loadable tables, in load order
+LOAD_TARGETS = {
+    'drills': {'table': 'skills_academy_drills', 'columns': DRILL_COLUMNS, 'records': drill_records},
+    'workouts': {'table': 'skills_academy_workouts', 'columns': WORKOUT_COLUMNS, 'records': workout_records},
+    'badges': {'table': 'badges', 'columns': BADGE_COLUMNS, 'records': badge_records, 'takes_workers': True,
+               'conflict_columns': ['original_id'], 'conflict_updates': BADGE_CONFLICT_UPDATES},
+    'ranks': {'table': 'player_ranks', 'columns': RANK_COLUMNS, 'records': rank_records,
+              'conflict_columns': ['original_id'], 'conflict_updates': RANK_CONFLICT_UPDATES},
+}
+
+def connect(dsn):
+    """Open a psycopg2 connection; psycopg2 is only needed for direct loading"""
+    try:
+        import psycopg2
+    except ImportError:
+        raise SystemExit("❌ Direct loading needs psycopg2: pip install psycopg2-binary")
+    return psycopg2.connect(dsn)
+
+def load_records(connection, table, columns, records, chunk_size=DEFAULT_BATCH_SIZE,
+                 conflict_columns=(), conflict_updates=()):
+    """COPY records into table, committing after every chunk.
+
+    Records are consumed lazily, so each chunk is sent while the source is
+    still being read. With conflict_columns a chunk is copied into a
+    staging table and upserted, as in sql_copy.copy_batches. A failed chunk
+    is rolled back; chunks already committed stay. Returns (rows, seconds).
+    """
+    key_positions = [columns.index(column) for column in conflict_columns]
+    cursor = connection.cursor()
+    started = time.perf_counter()
+    total = 0
+    for chunk in record_batches(records, chunk_size, key_positions):
+        buffer = io.StringIO()
+        for line in copy_lines(chunk):
+            buffer.write(line + '\n')
+        buffer.seek(0)
+        try:
+            if conflict_columns:
+                staging, create, upsert = staging_sql(table, columns, conflict_columns, conflict_updates)
+                cursor.execute(create)
+                cursor.copy_expert(copy_command(staging, columns), buffer)
+                cursor.execute(upsert)
+            else:
+                cursor.copy_expert(copy_command(table, columns), buffer)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        total += len(chunk)
+        elapsed = time.perf_counter() - started
+        print(f"   📦 {table}: {total} rows committed ({total / elapsed:.0f} rows/s)")
+    return total, time.perf_counter() - started
+
+def load_target(connection, name, chunk_size=DEFAULT_BATCH_SIZE, workers=1):
+    """Stream one LOAD_TARGETS entry into its table"""
+    target = LOAD_TARGETS[name]
+    records = target['records'](workers=workers) if target.get('takes_workers') else target['records']()
+    return load_records(
+        connection, target['table'], target['columns'], records, chunk_size,
+        conflict_columns=target.get('conflict_columns', ()),
+        conflict_updates=target.get('conflict_updates', ())
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream POWLAX exports straight into Postgres with COPY')
+    parser.add_argument('targets', nargs='*', metavar='target',
+                        help=f"Tables to load: {', '.join(LOAD_TARGETS)} (default: all)")
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL'),
+                        help='Postgres connection string (default: $DATABASE_URL)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per COPY and commit')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes parsing the badge category exports concurrently (0 = one per CPU)')
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error('--dsn or DATABASE_URL is required')
+    unknown = [name for name in args.targets if name not in LOAD_TARGETS]
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)}")
+
+    targets = args.targets or list(LOAD_TARGETS)
+    connection = connect(args.dsn)
+    total_rows = 0
+    total_seconds = 0.0
+    try:
+        for name in targets:
+            print(f"🚚 Loading {name}...")
+            rows, seconds = load_target(connection, name, args.chunk_size, args.workers)
+            rate = rows / seconds if seconds else 0
+            print(f"✅ Loaded {rows} {name} in {seconds:.2f}s ({rate:.0f} rows/s)")
+            total_rows += rows
+            total_seconds += seconds
+    finally:
+        connection.close()
+
+    rate = total_rows / total_seconds if total_seconds else 0
+    print(f"\n📊 Loaded {total_rows} rows in {total_seconds:.2f}s ({rate:.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -4,20 +4,35 @@ POWLAX Player Ranks Upload Script
 Processes player rank data and requirements from GamiPress exports
 """
 
+import argparse
 import csv
 import re
 import json
 import os
 from datetime import datetime
 
-def clean_text(text):
-    """Clean text from HTML and special characters"""
-    if not text:
-        return ""
-    text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
-    text = re.sub(r'<[^>]+>', '', text)
-    text = ' '.join(text.split())
-    return text.strip()
+from build_cache import run_cached
+from html_cleanup import clean_html
+from sql_batches import DEFAULT_BATCH_SIZE, insert_batches, write_sql_file
+from sql_copy import COPY_FORMATS, copy_batches
+
+GAMIPRESS_DIR = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/docs/Wordpress CSV\'s/Gamipress Gamification Exports'
+RANKS_CSV = os.path.join(GAMIPRESS_DIR, 'Lacrosse-Player-Ranks-Export-2025-July-31-1859.csv')
+RANK_REQUIREMENTS_CSV = os.path.join(GAMIPRESS_DIR, 'Rank-Requirements-Export-2025-July-31-1917.csv')
+RANKS_SQL = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/ranks_import.sql'
+RANKS_SUMMARY = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/ranks_summary.json'
+
+RANK_COLUMNS = [
+    'original_id', 'title', 'slug', 'description', 'excerpt', 'rank_order',
+    'image_url', 'metadata'
+]
+
+# Columns refreshed when a rank is imported again
+RANK_CONFLICT_UPDATES = [
+    'title = EXCLUDED.title',
+    'rank_order = EXCLUDED.rank_order',
+    'updated_at = NOW()'
+]
 
 def parse_rank_data(row):
     """Parse rank data from CSV row"""
@@ -25,7 +40,7 @@ def parse_rank_data(row):
         'id': int(row['ID']),
         'title': row['Title'].strip(),
         'slug': row.get('Slug', '').strip(),
-        'description': clean_text(row.get('Content', '')),
+        'description': clean_html(row.get('Content', ''), shortcodes=False),
         'excerpt': row.get('Excerpt', '').strip(),
         'order': 0,  # Will be set based on rank progression
         'image_url': None,
@@ -55,6 +70,22 @@ def parse_rank_data(row):
     
     return rank_data
 
+def iter_ranks(path=RANKS_CSV):
+    """Yield parsed ranks from the ranks export as it is read"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            if row.get('ID') and row.get('Title'):
+                yield parse_rank_data(row)
+
+def sorted_ranks(path=RANKS_CSV):
+    """Parsed ranks in rank order, each linked to the rank after it by
+    next_rank_id"""
+    ranks = sorted(iter_ranks(path), key=lambda x: x['order'])
+    for i in range(len(ranks) - 1):
+        ranks[i]['next_rank_id'] = ranks[i + 1]['id']
+    return ranks
+
 def parse_rank_requirements(req_row):
     """Parse rank requirement data"""
     requirement = {
@@ -67,7 +98,7 @@ def parse_rank_requirements(req_row):
     
     # Parse the requirement details from content or other fields
     if req_row.get('Content'):
-        content = clean_text(req_row['Content'])
+        content = clean_html(req_row['Content'], shortcodes=False)
         
         # Look for point requirements
         point_match = re.search(r'(\d+)\s*(Lax Credits?|Attack Tokens?|Defense Dollars?|Midfield Medals?|Rebound Rewards?)', content, re.IGNORECASE)
@@ -104,9 +135,21 @@ def parse_rank_requirements(req_row):
     
     return requirement
 
-def create_ranks_sql(ranks):
-    """Generate SQL for ranks"""
-    sql_statements = []
+def rank_record(rank):
+    """Column values for a rank, in RANK_COLUMNS order"""
+    return [
+        rank['id'],
+        rank['title'],
+        rank['slug'],
+        rank['description'] or None,
+        rank['excerpt'] or None,
+        rank['order'],
+        rank['image_url'] or None,
+        rank['metadata']
+    ]
+
+def create_ranks_sql(ranks, batch_size=DEFAULT_BATCH_SIZE, copy_format=None):
+    """Generate SQL statements for ranks"""
     
     # Table creation
     table_sql = """
@@ -154,89 +197,53 @@ CREATE INDEX idx_rank_order ON player_ranks(rank_order);
 CREATE INDEX idx_user_rank ON user_rank_progress(user_id, current_rank_id);
 """
     
-    sql_statements.append(table_sql)
+    yield table_sql
     
     # Insert ranks
-    for rank in ranks:
-        sql = f"""
-INSERT INTO player_ranks (
-    original_id,
-    title,
-    slug,
-    description,
-    excerpt,
-    rank_order,
-    image_url,
-    metadata,
-    created_at
-) VALUES (
-    {rank['id']},
-    '{rank['title'].replace("'", "''")}',
-    '{rank['slug']}',
-    {f"'{rank['description'].replace("'", "''")}'" if rank['description'] else 'NULL'},
-    {f"'{rank['excerpt'].replace("'", "''")}'" if rank['excerpt'] else 'NULL'},
-    {rank['order']},
-    {f"'{rank['image_url']}'" if rank['image_url'] else 'NULL'},
-    '{json.dumps(rank['metadata'])}'::jsonb,
-    NOW()
-) ON CONFLICT (original_id) DO UPDATE SET
-    title = EXCLUDED.title,
-    rank_order = EXCLUDED.rank_order,
-    updated_at = NOW();"""
-        sql_statements.append(sql)
-    
-    return sql_statements
+    records = (rank_record(rank) for rank in ranks)
+    if copy_format:
+        yield from copy_batches(
+            'player_ranks', RANK_COLUMNS, records, copy_format, batch_size,
+            conflict_columns=['original_id'], conflict_updates=RANK_CONFLICT_UPDATES
+        )
+    else:
+        yield from insert_batches(
+            'player_ranks', RANK_COLUMNS, records, batch_size,
+            conflict_columns=['original_id'], conflict_updates=RANK_CONFLICT_UPDATES,
+            expressions={'created_at': 'NOW()'}
+        )
 
-def main():
-    base_dir = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/docs/Wordpress CSV\'s/Gamipress Gamification Exports'
-    
-    # Input files
-    ranks_file = os.path.join(base_dir, 'Lacrosse-Player-Ranks-Export-2025-July-31-1859.csv')
-    requirements_file = os.path.join(base_dir, 'Rank-Requirements-Export-2025-July-31-1917.csv')
-    
-    # Output files
-    output_sql = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/ranks_import.sql'
-    output_summary = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/ranks_summary.json'
-    
+def write_rank_outputs(ranks_file=RANKS_CSV, requirements_file=RANK_REQUIREMENTS_CSV,
+                       output_sql=RANKS_SQL, output_summary=RANKS_SUMMARY,
+                       batch_size=DEFAULT_BATCH_SIZE, copy_format=None, out=None):
+    """Read the ranks and rank requirements exports and write the SQL file and
+    summary JSON, reporting to out (stdout by default)"""
+    # Ranks are kept in memory: they are ordered and linked before any SQL
+    # is written, and the summary lists every one of them
     ranks = []
-    requirements = []
+    total_requirements = 0
     
-    # Process ranks
+    # Process ranks, sorted by order and linked by next_rank_id
     if os.path.exists(ranks_file):
-        with open(ranks_file, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get('ID') and row.get('Title'):
-                    rank = parse_rank_data(row)
-                    ranks.append(rank)
-        print(f"✅ Processed {len(ranks)} player ranks")
+        ranks = sorted_ranks(ranks_file)
+        print(f"✅ Processed {len(ranks)} player ranks", file=out)
     
-    # Process rank requirements if available
+    # Count rank requirements if available
     if os.path.exists(requirements_file):
         with open(requirements_file, 'r', encoding='utf-8-sig') as f:
             reader = csv.DictReader(f)
             for row in reader:
                 if row.get('ID'):
-                    req = parse_rank_requirements(row)
-                    requirements.append(req)
-        print(f"✅ Processed {len(requirements)} rank requirements")
-    
-    # Sort ranks by order
-    ranks.sort(key=lambda x: x['order'])
-    
-    # Set next_rank_id based on order
-    for i in range(len(ranks) - 1):
-        ranks[i]['next_rank_id'] = ranks[i + 1]['id']
-    
-    # Generate SQL
-    sql_statements = create_ranks_sql(ranks)
+                    parse_rank_requirements(row)
+                    total_requirements += 1
+        print(f"✅ Processed {total_requirements} rank requirements", file=out)
     
-    # Write SQL file
-    with open(output_sql, 'w', encoding='utf-8') as f:
-        f.write('-- POWLAX Player Ranks Import\n')
-        f.write(f'-- Generated: {datetime.now().isoformat()}\n')
-        f.write(f'-- Total Ranks: {len(ranks)}\n\n')
-        f.write('\n'.join(sql_statements))
+    # Generate and write SQL
+    write_sql_file(output_sql, create_ranks_sql(ranks, batch_size, copy_format), lambda: (
+        '-- POWLAX Player Ranks Import\n'
+        f'-- Generated: {datetime.now().isoformat()}\n'
+        f'-- Total Ranks: {len(ranks)}\n\n'
+    ))
     
     # Generate summary
     summary = {
@@ -248,19 +255,44 @@ def main():
                 'id': rank['id']
             } for rank in ranks
         ],
-        'total_requirements': len(requirements)
+        'total_requirements': total_requirements
     }
     
     with open(output_summary, 'w', encoding='utf-8') as f:
         json.dump(summary, f, indent=2)
     
-    print(f"\n📄 SQL file: {output_sql}")
-    print(f"📊 Summary file: {output_summary}")
-    print(f"\n📈 Rank Progression:")
+    print(f"\n📄 SQL file: {output_sql}", file=out)
+    print(f"📊 Summary file: {output_summary}", file=out)
+    print(f"\n📈 Rank Progression:", file=out)
     for rank in ranks[:5]:  # Show first 5 ranks
-        print(f"  {rank['order']}. {rank['title']}")
+        print(f"  {rank['order']}. {rank['title']}", file=out)
     if len(ranks) > 5:
-        print(f"  ... and {len(ranks) - 5} more ranks")
+        print(f"  ... and {len(ranks) - 5} more ranks", file=out)
+    
+    return summary
+
+def build_rank_files(batch_size=DEFAULT_BATCH_SIZE, copy_format=None, force=False, out=None):
+    """Write the ranks SQL and summary unless the build cache has them.
+
+    Keyed by both rank exports, this script's sources, batch_size and
+    copy_format. Returns True when the files were rebuilt.
+    """
+    return run_cached(
+        'ranks', __file__, [RANKS_CSV, RANK_REQUIREMENTS_CSV], [RANKS_SQL, RANKS_SUMMARY],
+        lambda: write_rank_outputs(batch_size=batch_size, copy_format=copy_format, out=out),
+        options={'batch_size': batch_size, 'copy_format': copy_format}, force=force, out=out
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate player ranks SQL from GamiPress exports')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per multi-row INSERT or COPY block')
+    parser.add_argument('--copy', choices=COPY_FORMATS, dest='copy_format',
+                        help='Emit COPY ... FROM STDIN data in this format instead of INSERTs (run with psql)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild even if the build cache has outputs for these inputs')
+    args = parser.parse_args()
+    
+    build_rank_files(args.batch_size, args.copy_format, force=args.force)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""
+Skills Academy Category Parser
+Declarative tables of point types, word numbers, badge names and workout
+length markers, compiled into a single pattern that reads every marker and
+point value out of a Quiz / Workout Categories string in one pass
+"""
+
+import re
+
+# Spelled-out amounts used in category names ("One Midfield Medal")
+WORD_NUMBERS = {'one': 1}
+
+# Drill point types in priority order. Each '|' separated category part
+# counts toward the first type whose marker it contains. The amount is the
+# first match of `amount` within that part, read as:
+#   word            only WORD_NUMBERS count, anything else is 0
+#   word_or_number  WORD_NUMBERS or a plain integer, anything else is 0
+#   number          the captured integer
+# `default` applies when the marker is present but no amount matches;
+# None means the part is dropped. `tag` is added when an amount is found.
+DRILL_POINT_TYPES = [
+    {'marker': 'Lax Credit', 'point': 'lax_credit',
+     'amount': r'(?P<amount>\w+)\s+(?i:lax credits?)', 'value': 'word_or_number', 'default': 1},
+    {'marker': 'Midfield Medal', 'point': 'midfield_medal',
+     'amount': r'(?P<amount>\w+)\s+Midfield Medal', 'value': 'word', 'default': 0},
+    {'marker': 'Defense Dollar', 'point': 'defense_dollar',
+     'amount': r'(?P<amount>\w+)\s+Defense Dollar', 'value': 'word', 'default': 0},
+    {'marker': 'Attack Token', 'point': 'attack_token',
+     'amount': r'(?P<amount>\w+)\s+Attack Token', 'value': 'word', 'default': 0},
+    {'marker': 'Rebound Reward', 'point': 'rebound_reward',
+     'amount': r'(?P<amount>\w+)\s+Rebound Reward', 'value': 'word', 'default': 0},
+    {'marker': 'Wall Ball', 'point': 'rebound_reward',
+     'amount': r'Wall Ball\s*(?P<amount>\d+)', 'value': 'number', 'default': None, 'tag': 'wall-ball'},
+    {'marker': 'Flex Points', 'point': 'flex_points',
+     'amount': r'Flex Points[^|\n]*?(?P<amount>\d+)', 'value': 'number', 'default': 0},
+]
+
+# Workout point types, matched against the whole categories string. A type
+# applies when any of its markers is present; `default` is used when no
+# amount matches ('duration' means the workout duration, or 0), None skips
+# the type. Amounts are divided by `per` when given.
+WORKOUT_POINT_TYPES = [
+    {'markers': ['Flex Points'], 'point': 'flex_points',
+     'amount': r'Flex Points[>\s]*(?P<amount>\d+)', 'default': 0},
+    {'markers': ['Lax Credits', 'Lacrosse Player Points'], 'point': 'lax_credit',
+     'amount': r'(?P<amount>\d+)\s*Lax Credits?', 'default': 0},
+    {'markers': ['Wall Ball'], 'point': 'rebound_reward',
+     'amount': r'Wall Ball\s*(?P<amount>\d+)', 'default': 'duration'},
+    # Typically 5 drills = 1 token
+    {'markers': ['Attack'], 'point': 'attack_token',
+     'amount': r'Attack\s*(?P<amount>\d+)', 'default': None, 'per': 5},
+]
+
+# Workout badges/achievements named in categories, tagged in this order
+WORKOUT_BADGES = [
+    'Foundation Ace', 'Dominant Dodger', 'Stamina Star', 'Finishing Phenom',
+    'Bullet Snatcher', 'Long Pole Lizard', 'Wall Ball Hawk', 'The Wall Wizard',
+    'Independent Improver'
+]
+
+# Workout length markers; only the first one present is tagged
+WORKOUT_LENGTHS = [
+    ('Long Workout', 'long-workout'),
+    ('10 Drill Workout', '10-drill-workout'),
+    ('5 Drill Workout', '5-drill-workout'),
+]
+
+# Workout types in priority order: title keywords (matched lowercased) or
+# category markers
+WORKOUT_TYPES = [
+    ('wall_ball', ['wall ball'], []),
+    ('attack', ['attack'], ['Attack Drills>Attack']),
+    ('defense', ['defense'], []),
+    ('midfield', ['midfield', 'midfielder'], []),
+    ('flex', ['self-guided'], []),
+]
+
+SKILLS_ACADEMY_TAG = 'Skills-Academy'
+
+def _category_tokens():
+    """(group name, pattern) for every marker and amount, and {group name: marker}"""
+    markers = [point_type['marker'] for point_type in DRILL_POINT_TYPES]
+    for point_type in WORKOUT_POINT_TYPES:
+        markers.extend(point_type['markers'])
+    markers.extend(WORKOUT_BADGES)
+    markers.extend(marker for marker, _ in WORKOUT_LENGTHS)
+    for _, _, category_markers in WORKOUT_TYPES:
+        markers.extend(category_markers)
+
+    tokens = [('sep', r'\|')]
+    marker_names = {}
+    for i, marker in enumerate(dict.fromkeys(markers)):
+        marker_names[f'm{i}'] = marker
+        tokens.append((f'm{i}', re.escape(marker)))
+    for i, point_type in enumerate(DRILL_POINT_TYPES):
+        tokens.append((f'd{i}', point_type['amount'].replace('(?P<amount>', f'(?P<d{i}_amount>')))
+    for i, point_type in enumerate(WORKOUT_POINT_TYPES):
+        tokens.append((f'w{i}', point_type['amount'].replace('(?P<amount>', f'(?P<w{i}_amount>')))
+    return tokens, marker_names
+
+def compile_category_scanner():
+    """Compile every token into one pattern matching where any token starts.
+
+    Each token sits in its own optional lookahead, so a single zero-width
+    match reports all tokens starting at that position, overlapping ones
+    included. The leading guard keeps finditer from stopping anywhere else.
+    Returns (pattern, {group name: marker text}).
+    """
+    tokens, marker_names = _category_tokens()
+    guard = '|'.join(re.sub(r'\(\?P<\w+>', '(?:', pattern) for _, pattern in tokens)
+    lookaheads = ''.join(f'(?:(?=(?P<{name}>{pattern})))?' for name, pattern in tokens)
+    return re.compile(f'(?={guard}){lookaheads}'), marker_names
+
+CATEGORY_RE, _MARKER_NAMES = compile_category_scanner()
+
+def scan_categories(categories_str):
+    """Read every marker and first amount from a categories string in one pass.
+
+    Returns {'markers', 'amounts', 'parts'}: markers present anywhere, the
+    first amount per workout point type, and per '|' part its stripped
+    text, markers and first amount per drill point type.
+    """
+    markers = set()
+    amounts = {}
+    parts = []
+    part = {'start': 0, 'markers': set(), 'amounts': {}}
+
+    for match in CATEGORY_RE.finditer(categories_str):
+        for name, value in match.groupdict().items():
+            if value is None or name.endswith('_amount'):
+                continue
+            if name == 'sep':
+                part['end'] = match.start()
+                parts.append(part)
+                part = {'start': match.start() + 1, 'markers': set(), 'amounts': {}}
+            elif name[0] == 'm':
+                markers.add(_MARKER_NAMES[name])
+                part['markers'].add(_MARKER_NAMES[name])
+            elif name[0] == 'd':
+                part['amounts'].setdefault(name, match.group(f'{name}_amount'))
+            else:
+                amounts.setdefault(name, match.group(f'{name}_amount'))
+
+    part['end'] = len(categories_str)
+    parts.append(part)
+    for part in parts:
+        part['text'] = categories_str[part.pop('start'):part.pop('end')].strip()
+    return {'markers': markers, 'amounts': amounts, 'parts': parts}
+
+def _drill_amount(point_type, amount):
+    """Read a captured drill amount according to its value kind"""
+    word = amount.lower()
+    if word in WORD_NUMBERS:
+        return WORD_NUMBERS[word]
+    if point_type['value'] == 'number' or (point_type['value'] == 'word_or_number' and amount.isdigit()):
+        return int(amount)
+    return 0
+
+def drill_points_and_tags(categories_str, tags_str):
+    """Point values and tags for a drill row"""
+    points = {}
+    tags = []
+
+    if categories_str:
+        for part in scan_categories(categories_str)['parts']:
+            for i, point_type in enumerate(DRILL_POINT_TYPES):
+                if point_type['marker'] not in part['markers']:
+                    continue
+                amount = part['amounts'].get(f'd{i}')
+                if amount is not None:
+                    points[point_type['point']] = _drill_amount(point_type, amount)
+                    if 'tag' in point_type:
+                        tags.append(point_type['tag'])
+                elif point_type['default'] is not None:
+                    points[point_type['point']] = point_type['default']
+                break
+            else:
+                # Other categories become tags
+                tags.append(part['text'])
+
+    if tags_str:
+        tags.extend(t.strip() for t in tags_str.split('|'))
+
+    if SKILLS_ACADEMY_TAG not in tags:
+        tags.append(SKILLS_ACADEMY_TAG)
+
+    return points, tags
+
+def workout_type(title, scan):
+    """Workout type from the title and scanned categories"""
+    title_lower = title.lower()
+    for name, keywords, category_markers in WORKOUT_TYPES:
+        if any(keyword in title_lower for keyword in keywords):
+            return name
+        if any(marker in scan['markers'] for marker in category_markers):
+            return name
+    return 'general'
+
+def workout_points(scan, workout_type, duration):
+    """Point values for a workout from scanned categories"""
+    points = {}
+    for i, point_type in enumerate(WORKOUT_POINT_TYPES):
+        if not any(marker in scan['markers'] for marker in point_type['markers']):
+            continue
+        amount = scan['amounts'].get(f'w{i}')
+        if amount is not None:
+            points[point_type['point']] = int(amount) // point_type.get('per', 1)
+        elif point_type['default'] == 'duration':
+            points[point_type['point']] = duration or 0
+        elif point_type['default'] is not None:
+            points[point_type['point']] = point_type['default']
+
+    # Apply defaults based on workout type and duration
+    if workout_type == 'wall_ball' and 'rebound_reward' not in points:
+        points['rebound_reward'] = duration or 5
+
+    return points
+
+def workout_tags(tags_str, scan):
+    """Tags for a workout from its tags field and scanned categories"""
+    tags = []
+    if tags_str:
+        tags.extend(t.strip() for t in tags_str.split('|'))
+
+    for badge in WORKOUT_BADGES:
+        if badge in scan['markers']:
+            tags.append(badge.lower().replace(' ', '-'))
+    for marker, tag in WORKOUT_LENGTHS:
+        if marker in scan['markers']:
+            tags.append(tag)
+            break
+
+    if SKILLS_ACADEMY_TAG not in tags:
+        tags.append(SKILLS_ACADEMY_TAG)
+
+    return list(set(tags))  # Remove duplicates
@@ -4,21 +4,52 @@ Complete Skills Academy Upload Script
 Combines all Skills Academy components into a single SQL file for Supabase upload
 """
 
+import argparse
+import io
 import os
 from datetime import datetime
 
-def combine_sql_files():
-    """Combine individual SQL files into one comprehensive upload file"""
+from build_cache import run_cached
+from skills_academy_export import PROJECT_DIR, STREAMS, shared_export_streams
+from skills_academy_upload import DRILLS_SQL, build_drill_files
+from skills_academy_workouts_upload import WORKOUTS_SQL, build_workout_files
+
+COMPLETE_SQL = os.path.join(PROJECT_DIR, 'skills_academy_complete_import.sql')
+UPLOAD_GUIDE = os.path.join(PROJECT_DIR, 'SKILLS_ACADEMY_UPLOAD_GUIDE.md')
+
+def build_source_files(force=False):
+    """Rebuild the drills and workouts SQL and summaries that are out of date
+    from one shared read of the export; returns the number of export rows in
+    each stream, or None when both came from the build cache"""
+    counts = {stream: 0 for stream in STREAMS}
+    export = shared_export_streams(counts=counts)
+    drills_built = build_drill_files(rows=lambda: export()['drill'], force=force)
+    workouts_built = build_workout_files(rows=lambda: export()['workout'], force=force)
+    if not (drills_built or workouts_built):
+        return None
+    return counts
+
+def build_complete_files(force=False, out=None, sql=None):
+    """Combine the SQL files and write the upload guide, unless the build
+    cache already has them for the current drills and workouts SQL.
+    sql maps SQL paths to text an upstream stage has just written, used
+    instead of reading those files back. Returns True when rebuilt"""
+    def build():
+        print(f"✅ Created combined SQL file: {combine_sql_files(out, sql)}", file=out)
+        print(f"📚 Created upload documentation: {create_upload_documentation()}", file=out)
     
-    base_dir = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app'
+    return run_cached('skills_academy_complete', __file__, [DRILLS_SQL, WORKOUTS_SQL],
+                      [COMPLETE_SQL, UPLOAD_GUIDE], build, force=force, out=out)
+
+def combine_sql_files(out=None, sql=None):
+    """Combine individual SQL files into one comprehensive upload file,
+    taking the text of any file in sql from there instead of from disk"""
+    sql = sql or {}
     
     # Files to combine
-    sql_files = [
-        'skills_academy_drills_import.sql',
-        'skills_academy_workouts_import.sql'
-    ]
+    sql_files = [DRILLS_SQL, WORKOUTS_SQL]
     
-    output_file = os.path.join(base_dir, 'skills_academy_complete_import.sql')
+    output_file = COMPLETE_SQL
     
     # Header
     header = f"""-- POWLAX Skills Academy Complete Import
@@ -149,22 +180,28 @@ CREATE INDEX IF NOT EXISTS idx_workout_title_search ON skills_academy_workouts U
         outfile.write(header)
         
         # Write each SQL file
-        for i, sql_file in enumerate(sql_files, 1):
-            file_path = os.path.join(base_dir, sql_file)
-            if os.path.exists(file_path):
+        for i, file_path in enumerate(sql_files, 1):
+            sql_file = os.path.basename(file_path)
+            if file_path in sql or os.path.exists(file_path):
                 outfile.write(f"\n-- ============================================\n")
                 outfile.write(f"-- SECTION {i+1}: {sql_file.replace('_', ' ').replace('.sql', '').upper()}\n")
                 outfile.write(f"-- ============================================\n\n")
                 
-                with open(file_path, 'r', encoding='utf-8') as infile:
-                    # Skip the file headers
-                    content = infile.read()
-                    # Remove individual file headers
-                    content = '\n'.join(line for line in content.split('\n') 
-                                      if not line.startswith('--') or 'CREATE' in line or 'INSERT' in line)
-                    outfile.write(content)
+                if file_path in sql:
+                    # Read back as open() would, with universal newlines
+                    infile = io.StringIO(sql[file_path], newline=None)
+                else:
+                    infile = open(file_path, 'r', encoding='utf-8')
+                with infile:
+                    # Copy line by line, removing individual file headers
+                    for line in infile:
+                        if not line.startswith('--') or 'CREATE' in line or 'INSERT' in line:
+                            outfile.write(line)
                     outfile.write('\n\n')
-        
+            else:
+                print(f"⚠️  {sql_file} not found, left out of the combined file - "
+                      f"generate it first or run upload_pipeline.py", file=out)
+
         # Write additional SQL
         outfile.write(additional_sql)
         
@@ -300,22 +337,26 @@ WHERE id = [drill_id];
 ```
 """
     
-    doc_path = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/SKILLS_ACADEMY_UPLOAD_GUIDE.md'
+    doc_path = UPLOAD_GUIDE
     with open(doc_path, 'w', encoding='utf-8') as f:
         f.write(doc_content)
     
     return doc_path
 
 def main():
-    print("🔄 Combining Skills Academy SQL files...")
+    parser = argparse.ArgumentParser(description='Build the complete Skills Academy SQL bundle')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild every stage even if the build cache has its outputs')
+    args = parser.parse_args()
     
-    # Combine SQL files
-    combined_file = combine_sql_files()
-    print(f"✅ Created combined SQL file: {combined_file}")
+    print("🔄 Reading Quizzes-Workouts-Export...")
+    counts = build_source_files(args.force)
+    if counts is not None:
+        print(f"✅ Sorted export rows: {counts['drill']} drills, "
+              f"{counts['workout']} workouts, {counts['rejected']} rejected\n")
     
-    # Create documentation
-    doc_file = create_upload_documentation()
-    print(f"📚 Created upload documentation: {doc_file}")
+    print("🔄 Combining Skills Academy SQL files...")
+    build_complete_files(args.force)
     
     # Summary
     print("\n📊 Skills Academy Upload Summary:")
@@ -0,0 +1,91 @@
+"""
+Skills Academy Export Reader
+Reads the Quizzes-Workouts-Export CSV once and sorts every row into the
+drill, workout or rejected stream
+"""
+
+import csv
+import os
+import re
+import threading
+
+PROJECT_DIR = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app'
+QUIZZES_WORKOUTS_CSV = os.path.join(PROJECT_DIR, "docs/Wordpress CSV's/Quizzes-Workouts-Export-2025-July-31-0920.csv")
+
+# Title keywords and category fragments that mark a row as a workout collection
+WORKOUT_TITLE_KEYWORDS = ['workout', 'practice', 'maintenance']
+WORKOUT_CATEGORY_INDICATORS = ['Workout Length>', 'Wall Ball', 'Attack Drills>Attack']
+
+STREAMS = ('drill', 'workout', 'rejected')
+
+VIMEO_ID_RE = re.compile(r'vimeo\.com/(\d+)')
+
+def extract_vimeo_id(content):
+    """Extract Vimeo ID from embedded content"""
+    match = VIMEO_ID_RE.search(content)
+    return match.group(1) if match else None
+
+def is_workout_row(row):
+    """True if the title or categories mark the row as a workout collection"""
+    title = row.get('Title', '').strip().lower()
+    if any(keyword in title for keyword in WORKOUT_TITLE_KEYWORDS):
+        return True
+    categories = row.get('Quiz / Workout Categories', '')
+    return any(indicator in categories for indicator in WORKOUT_CATEGORY_INDICATORS)
+
+def classify_row(row):
+    """Return the stream a row belongs to: 'drill', 'workout' or 'rejected'.
+
+    Rows with a Vimeo embed are individual drills, and are rejected if no
+    video ID can be read from it. Rows without one are workouts when their
+    title or categories say so.
+    """
+    content = row.get('Content') or ''
+    if 'vimeo.com' in content:
+        return 'drill' if extract_vimeo_id(content) else 'rejected'
+    return 'workout' if is_workout_row(row) else 'rejected'
+
+def iter_export_rows(path=QUIZZES_WORKOUTS_CSV):
+    """Yield (stream, row) for each export row as the file is read"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield classify_row(row), row
+
+def iter_stream(stream, path=QUIZZES_WORKOUTS_CSV, counts=None):
+    """Yield the rows of one stream as the export is read. If given, counts
+    is updated with the number of rows seen in every stream."""
+    for row_stream, row in iter_export_rows(path):
+        if counts is not None:
+            counts[row_stream] = counts.get(row_stream, 0) + 1
+        if row_stream == stream:
+            yield row
+
+def read_export_streams(path=QUIZZES_WORKOUTS_CSV, streams=('drill', 'workout'), counts=None):
+    """Read the export once; returns {stream: rows} for the given streams.
+
+    Only those rows are kept in memory, for builders that share this one
+    read; rows of other streams, like rejected, are only counted. If given,
+    counts is updated with the number of rows seen in every stream.
+    """
+    rows = {stream: [] for stream in streams}
+    for stream, row in iter_export_rows(path):
+        if counts is not None:
+            counts[stream] = counts.get(stream, 0) + 1
+        if stream in rows:
+            rows[stream].append(row)
+    return rows
+
+def shared_export_streams(path=QUIZZES_WORKOUTS_CSV, counts=None):
+    """A loader for read_export_streams(path, counts=counts) that reads the
+    export on its first call only, so callers that skip a rebuild never
+    read it and the ones that rebuild share one read"""
+    lock = threading.Lock()
+    streams = {}
+
+    def load():
+        with lock:
+            if not streams:
+                streams.update(read_export_streams(path, counts=counts))
+        return streams
+    return load
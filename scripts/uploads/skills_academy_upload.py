@@ -5,15 +5,59 @@ Processes Skills Academy individual drills from Quizzes-Workouts-Export CSV
 and generates SQL for Supabase upload
 """
 
-import csv
+import argparse
+import itertools
+import os
 import re
 import json
 from datetime import datetime
 
-def extract_vimeo_id(content):
-    """Extract Vimeo ID from embedded content"""
-    match = re.search(r'vimeo\.com/(\d+)', content)
-    return match.group(1) if match else None
+from build_cache import is_cached, run_cached
+from csv_chunks import DEFAULT_CHUNK_BYTES, csv_chunk_tasks, map_csv_chunks
+from csv_index import read_rows_by_id
+from skills_academy_categories import drill_points_and_tags
+from skills_academy_export import PROJECT_DIR, QUIZZES_WORKOUTS_CSV, classify_row, extract_vimeo_id, iter_stream
+from sql_batches import DEFAULT_BATCH_SIZE, insert_batches, write_sql_file
+from sql_copy import COPY_FORMATS, copy_batches
+from sql_delta import delta_statements, describe_changes, diff_records, snapshot_hashes
+
+DRILLS_SQL = os.path.join(PROJECT_DIR, 'skills_academy_drills_import.sql')
+DRILLS_SUMMARY = os.path.join(PROJECT_DIR, 'skills_academy_drills_summary.json')
+DRILLS_DELTA_SQL = os.path.join(PROJECT_DIR, 'skills_academy_drills_delta.sql')
+
+DRILL_COLUMNS = [
+    'original_id', 'title', 'vimeo_id', 'drill_category', 'equipment_needed',
+    'age_progressions', 'space_needed', 'complexity', 'sets_and_reps',
+    'duration_minutes', 'point_values', 'tags'
+]
+
+# Create table definition
+DRILLS_TABLE_SQL = """
+-- Skills Academy Drills Table
+CREATE TABLE IF NOT EXISTS skills_academy_drills (
+    id SERIAL PRIMARY KEY,
+    original_id INTEGER UNIQUE,
+    title VARCHAR(255) NOT NULL,
+    vimeo_id VARCHAR(50),
+    drill_category TEXT[],
+    equipment_needed TEXT[],
+    age_progressions JSONB,
+    space_needed VARCHAR(255),
+    complexity VARCHAR(50) CHECK (complexity IN ('building', 'foundation', 'advanced')),
+    sets_and_reps TEXT,
+    duration_minutes INTEGER,
+    point_values JSONB,
+    tags TEXT[],
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Create indexes
+CREATE INDEX idx_vimeo_id ON skills_academy_drills(vimeo_id);
+CREATE INDEX idx_complexity ON skills_academy_drills(complexity);
+CREATE INDEX idx_tags ON skills_academy_drills USING GIN(tags);
+CREATE INDEX idx_drill_category ON skills_academy_drills USING GIN(drill_category);
+"""
 
 def parse_age_range(age_str):
     """Convert age range string to structured format"""
@@ -63,63 +107,8 @@ def parse_duration(duration_str):
     match = re.search(r'(\d+)\s*[Mm]inute', duration_str)
     return int(match.group(1)) if match else None
 
-def parse_points_and_tags(categories_str, tags_str):
-    """Parse quiz/workout categories and tags"""
-    points = {}
-    tags = []
-    
-    # Parse categories for point values
-    if categories_str:
-        parts = categories_str.split('|')
-        for part in parts:
-            part = part.strip()
-            # Extract point values
-            if 'Lax Credit' in part:
-                match = re.search(r'(\w+)\s+Lax Credits?', part, re.IGNORECASE)
-                if match:
-                    points['lax_credit'] = 1 if match.group(1).lower() == 'one' else int(match.group(1)) if match.group(1).isdigit() else 0
-                else:
-                    # Handle numeric prefix
-                    match = re.search(r'(\d+)\s+Lax Credits?', part, re.IGNORECASE)
-                    points['lax_credit'] = int(match.group(1)) if match else 1
-            elif 'Midfield Medal' in part:
-                match = re.search(r'(\w+)\s+Midfield Medal', part)
-                points['midfield_medal'] = 1 if match and match.group(1).lower() == 'one' else 0
-            elif 'Defense Dollar' in part:
-                match = re.search(r'(\w+)\s+Defense Dollar', part)
-                points['defense_dollar'] = 1 if match and match.group(1).lower() == 'one' else 0
-            elif 'Attack Token' in part:
-                match = re.search(r'(\w+)\s+Attack Token', part)
-                points['attack_token'] = 1 if match and match.group(1).lower() == 'one' else 0
-            elif 'Rebound Reward' in part:
-                match = re.search(r'(\w+)\s+Rebound Reward', part)
-                points['rebound_reward'] = 1 if match and match.group(1).lower() == 'one' else 0
-            elif 'Wall Ball' in part:
-                # Handle Wall Ball point values (e.g., "Wall Ball 5", "Wall Ball 10")
-                match = re.search(r'Wall Ball\s*(\d+)', part)
-                if match:
-                    points['rebound_reward'] = int(match.group(1))
-                    tags.append('wall-ball')
-            elif 'Flex Points' in part:
-                match = re.search(r'Flex Points.*?(\d+)', part)
-                points['flex_points'] = int(match.group(1)) if match else 0
-            else:
-                # Other categories become tags
-                tags.append(part)
-    
-    # Parse tags
-    if tags_str:
-        tag_parts = [t.strip() for t in tags_str.split('|')]
-        tags.extend(tag_parts)
-    
-    # Ensure Skills-Academy tag is present
-    if 'Skills-Academy' not in tags:
-        tags.append('Skills-Academy')
-    
-    return points, tags
-
-def create_sql_insert(drill_data):
-    """Create SQL insert statement for a drill"""
+def drill_record(drill_data):
+    """Column values for a drill, in DRILL_COLUMNS order"""
     # Prepare JSON fields
     age_progressions = {
         'do_it': drill_data['age_do_it'],
@@ -127,140 +116,67 @@ def create_sql_insert(drill_data):
         'own_it': drill_data['age_own_it']
     }
     
-    # Build the SQL
-    sql = f"""
-INSERT INTO skills_academy_drills (
-    original_id,
-    title,
-    vimeo_id,
-    drill_category,
-    equipment_needed,
-    age_progressions,
-    space_needed,
-    complexity,
-    sets_and_reps,
-    duration_minutes,
-    point_values,
-    tags,
-    created_at
-) VALUES (
-    {drill_data['id']},
-    '{drill_data['title'].replace("'", "''")}',
-    '{drill_data['vimeo_id']}',
-    ARRAY{drill_data['drill_category']}::text[],
-    ARRAY{drill_data['equipment']}::text[],
-    '{json.dumps(age_progressions)}'::jsonb,
-    '{drill_data['space_needed'].replace("'", "''")}',
-    '{drill_data['complexity']}',
-    '{drill_data['sets_and_reps'].replace("'", "''")}',
-    {drill_data['duration_minutes'] or 'NULL'},
-    '{json.dumps(drill_data['point_values'])}'::jsonb,
-    ARRAY{drill_data['tags']}::text[],
-    NOW()
-);"""
-    return sql
+    return [
+        drill_data['id'],
+        drill_data['title'],
+        drill_data['vimeo_id'],
+        drill_data['drill_category'],
+        drill_data['equipment'],
+        age_progressions,
+        drill_data['space_needed'],
+        drill_data['complexity'],
+        drill_data['sets_and_reps'],
+        drill_data['duration_minutes'] or None,
+        drill_data['point_values'],
+        drill_data['tags']
+    ]
 
-def main():
-    input_file = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/docs/Wordpress CSV\'s/Quizzes-Workouts-Export-2025-July-31-0920.csv'
-    output_sql = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/skills_academy_drills_import.sql'
-    output_summary = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/skills_academy_drills_summary.json'
+def build_drill(row):
+    """Parse one drill-stream export row into drill data"""
+    vimeo_id = extract_vimeo_id(row['Content'])
     
-    drills = []
-    sql_statements = []
+    # Parse all fields
+    drill_category = parse_drill_category(row.get('Academy Single Drills', ''))
+    equipment = parse_equipment(row.get('Academy Drill Equipment', ''))
     
-    # Create table definition
-    table_sql = """
--- Skills Academy Drills Table
-CREATE TABLE IF NOT EXISTS skills_academy_drills (
-    id SERIAL PRIMARY KEY,
-    original_id INTEGER UNIQUE,
-    title VARCHAR(255) NOT NULL,
-    vimeo_id VARCHAR(50),
-    drill_category TEXT[],
-    equipment_needed TEXT[],
-    age_progressions JSONB,
-    space_needed VARCHAR(255),
-    complexity VARCHAR(50) CHECK (complexity IN ('building', 'foundation', 'advanced')),
-    sets_and_reps TEXT,
-    duration_minutes INTEGER,
-    point_values JSONB,
-    tags TEXT[],
-    created_at TIMESTAMP DEFAULT NOW(),
-    updated_at TIMESTAMP DEFAULT NOW()
-);
-
--- Create indexes
-CREATE INDEX idx_vimeo_id ON skills_academy_drills(vimeo_id);
-CREATE INDEX idx_complexity ON skills_academy_drills(complexity);
-CREATE INDEX idx_tags ON skills_academy_drills USING GIN(tags);
-CREATE INDEX idx_drill_category ON skills_academy_drills USING GIN(drill_category);
-"""
-    
-    sql_statements.append(table_sql)
+    # Age progressions
+    age_do_it = parse_age_range(row.get('Players See & Do The Skills', ''))
+    age_coach_it = parse_age_range(row.get('Coach the Skills', ''))
+    age_own_it = parse_age_range(row.get('Players Own the Skills', ''))
     
-    with open(input_file, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        
-        for row in reader:
-            # Skip rows without Vimeo content
-            if not row.get('Content') or 'vimeo.com' not in row['Content']:
-                continue
-            
-            vimeo_id = extract_vimeo_id(row['Content'])
-            if not vimeo_id:
-                continue
-            
-            # Parse all fields
-            drill_category = parse_drill_category(row.get('Academy Single Drills', ''))
-            equipment = parse_equipment(row.get('Academy Drill Equipment', ''))
-            
-            # Age progressions
-            age_do_it = parse_age_range(row.get('Players See & Do The Skills', ''))
-            age_coach_it = parse_age_range(row.get('Coach the Skills', ''))
-            age_own_it = parse_age_range(row.get('Players Own the Skills', ''))
-            
-            # Other fields
-            space_needed = row.get('Space Needed', '').strip()
-            complexity = parse_complexity(row.get('Complexity', ''))
-            sets_and_reps = row.get('Sets and Reps', '').strip()
-            duration = parse_duration(row.get('Drill Length in Minutes', ''))
-            
-            # Points and tags
-            point_values, tags = parse_points_and_tags(
-                row.get('Quiz / Workout Categories', ''),
-                row.get('Quiz / Workout Tags', '')
-            )
-            
-            drill_data = {
-                'id': int(row['ID']),
-                'title': row['Title'].strip(),
-                'vimeo_id': vimeo_id,
-                'drill_category': drill_category,
-                'equipment': equipment,
-                'age_do_it': age_do_it,
-                'age_coach_it': age_coach_it,
-                'age_own_it': age_own_it,
-                'space_needed': space_needed,
-                'complexity': complexity,
-                'sets_and_reps': sets_and_reps,
-                'duration_minutes': duration,
-                'point_values': point_values,
-                'tags': tags
-            }
-            
-            drills.append(drill_data)
-            sql_statements.append(create_sql_insert(drill_data))
+    # Other fields
+    space_needed = row.get('Space Needed', '').strip()
+    complexity = parse_complexity(row.get('Complexity', ''))
+    sets_and_reps = row.get('Sets and Reps', '').strip()
+    duration = parse_duration(row.get('Drill Length in Minutes', ''))
     
-    # Write SQL file
-    with open(output_sql, 'w', encoding='utf-8') as f:
-        f.write('-- Skills Academy Drills Import\n')
-        f.write(f'-- Generated: {datetime.now().isoformat()}\n')
-        f.write(f'-- Total Drills: {len(drills)}\n\n')
-        f.write('\n'.join(sql_statements))
+    # Points and tags
+    point_values, tags = drill_points_and_tags(
+        row.get('Quiz / Workout Categories', ''),
+        row.get('Quiz / Workout Tags', '')
+    )
     
-    # Write summary JSON
-    summary = {
-        'total_drills': len(drills),
+    return {
+        'id': int(row['ID']),
+        'title': row['Title'].strip(),
+        'vimeo_id': vimeo_id,
+        'drill_category': drill_category,
+        'equipment': equipment,
+        'age_do_it': age_do_it,
+        'age_coach_it': age_coach_it,
+        'age_own_it': age_own_it,
+        'space_needed': space_needed,
+        'complexity': complexity,
+        'sets_and_reps': sets_and_reps,
+        'duration_minutes': duration,
+        'point_values': point_values,
+        'tags': tags
+    }
+
+def new_drill_summary():
+    """Empty running statistics for the drills summary JSON"""
+    return {
+        'total_drills': 0,
         'complexities': {},
         'equipment_types': set(),
         'space_types': set(),
@@ -274,27 +190,121 @@ CREATE INDEX idx_drill_category ON skills_academy_drills USING GIN(drill_categor
             'flex_points': 0
         }
     }
+
+def add_drill_to_summary(summary, drill):
+    """Update running summary statistics with one drill"""
+    summary['total_drills'] += 1
     
-    for drill in drills:
-        # Count complexities
-        complexity = drill['complexity']
-        summary['complexities'][complexity] = summary['complexities'].get(complexity, 0) + 1
-        
-        # Collect equipment types
-        summary['equipment_types'].update(drill['equipment'])
-        
-        # Collect space types
-        if drill['space_needed']:
-            summary['space_types'].add(drill['space_needed'])
-        
-        # Count tags
-        for tag in drill['tags']:
-            summary['tag_counts'][tag] = summary['tag_counts'].get(tag, 0) + 1
+    # Count complexities
+    complexity = drill['complexity']
+    summary['complexities'][complexity] = summary['complexities'].get(complexity, 0) + 1
+    
+    # Collect equipment types
+    summary['equipment_types'].update(drill['equipment'])
+    
+    # Collect space types
+    if drill['space_needed']:
+        summary['space_types'].add(drill['space_needed'])
+    
+    # Count tags
+    for tag in drill['tags']:
+        summary['tag_counts'][tag] = summary['tag_counts'].get(tag, 0) + 1
+    
+    # Count point types
+    for point_type, value in drill['point_values'].items():
+        if value > 0:
+            summary['point_types'][point_type] += 1
+
+def merge_drill_summary(summary, partial):
+    """Fold the summary of a later run of drills into summary"""
+    summary['total_drills'] += partial['total_drills']
+    for complexity, count in partial['complexities'].items():
+        summary['complexities'][complexity] = summary['complexities'].get(complexity, 0) + count
+    summary['equipment_types'].update(partial['equipment_types'])
+    summary['space_types'].update(partial['space_types'])
+    for tag, count in partial['tag_counts'].items():
+        summary['tag_counts'][tag] = summary['tag_counts'].get(tag, 0) + count
+    for point_type, count in partial['point_types'].items():
+        summary['point_types'][point_type] += count
+
+def parse_drill_rows(rows):
+    """Build drills from drill-stream rows; returns (records, summary)"""
+    summary = new_drill_summary()
+    records = []
+    for row in rows:
+        drill_data = build_drill(row)
+        add_drill_to_summary(summary, drill_data)
+        records.append(drill_record(drill_data))
+    return records, summary
+
+def _parse_drill_chunk(rows):
+    """Classify a chunk of export rows and parse its drills, in a worker"""
+    return parse_drill_rows([row for row in rows if classify_row(row) == 'drill'])
+
+def drill_parts(drill_rows, part_size=DEFAULT_BATCH_SIZE):
+    """Parse drill rows in this process, part_size rows at a time"""
+    drill_rows = iter(drill_rows)
+    while True:
+        part = list(itertools.islice(drill_rows, part_size))
+        if not part:
+            return
+        yield parse_drill_rows(part)
+
+def parallel_drill_parts(path=QUIZZES_WORKOUTS_CSV, workers=0, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Parse the export's drills across a process pool, in file order"""
+    return map_csv_chunks(_parse_drill_chunk, csv_chunk_tasks(path, chunk_bytes), workers)
+
+def write_drill_outputs(parts, output_sql=DRILLS_SQL, output_summary=DRILLS_SUMMARY,
+                        batch_size=DEFAULT_BATCH_SIZE, copy_format=None, previous_parts=None, out=None,
+                        sql=None):
+    """Stream parsed drills into the SQL file and summary JSON.
+
+    parts yields (records, summary) in export order, from drill_parts or
+    parallel_drill_parts. Parts are rendered one batch at a time, so
+    only the parts in flight and the running summary are held in memory.
+    
+    With previous_parts, parts of the previous export snapshot, the SQL
+    file is a delta instead: only the INSERTs, UPDATEs and DELETEs that
+    turn the previous snapshot into this one, matched by ID and content hash.
+    Progress is printed to out, stdout by default. With sql, a dict, the
+    SQL text written is also kept there by path, see write_sql_file.
+    """
+    summary = new_drill_summary()
+    
+    def records():
+        for part_records, partial in parts:
+            merge_drill_summary(summary, partial)
+            yield from part_records
+    
+    if previous_parts is not None:
+        previous = snapshot_hashes(record for part_records, _ in previous_parts for record in part_records)
+        changes = {}
+        statements = delta_statements(
+            'skills_academy_drills', DRILL_COLUMNS, diff_records(previous, records(), counts=changes), batch_size,
+            insert_expressions={'created_at': 'NOW()'}, update_expressions={'updated_at': 'NOW()'}
+        )
+        write_sql_file(output_sql, statements, lambda: (
+            '-- Skills Academy Drills Delta\n'
+            f'-- Generated: {datetime.now().isoformat()}\n'
+            f"-- Total Drills: {summary['total_drills']}\n"
+            f'-- Changes: {describe_changes(changes)}\n\n'
+        ), keep=sql)
+        print(f"🔁 Delta against previous export: {describe_changes(changes)}", file=out)
+    else:
+        if copy_format:
+            batches = copy_batches('skills_academy_drills', DRILL_COLUMNS, records(), copy_format, batch_size)
+        else:
+            batches = insert_batches(
+                'skills_academy_drills', DRILL_COLUMNS, records(), batch_size,
+                expressions={'created_at': 'NOW()'}
+            )
         
-        # Count point types
-        for point_type, value in drill['point_values'].items():
-            if value > 0:
-                summary['point_types'][point_type] += 1
+        # Write SQL file; the header count is known once every batch is written
+        write_sql_file(output_sql, itertools.chain([DRILLS_TABLE_SQL], batches), lambda: (
+            '-- Skills Academy Drills Import\n'
+            f'-- Generated: {datetime.now().isoformat()}\n'
+            f"-- Total Drills: {summary['total_drills']}\n\n"
+        ), keep=sql)
     
     # Convert sets to lists for JSON serialization
     summary['equipment_types'] = sorted(list(summary['equipment_types']))
@@ -303,22 +313,105 @@ CREATE INDEX idx_drill_category ON skills_academy_drills USING GIN(drill_categor
     with open(output_summary, 'w', encoding='utf-8') as f:
         json.dump(summary, f, indent=2)
     
-    print(f"✅ Processed {len(drills)} Skills Academy drills")
-    print(f"📄 SQL file: {output_sql}")
-    print(f"📊 Summary file: {output_summary}")
+    print(f"✅ Processed {summary['total_drills']} Skills Academy drills", file=out)
+    print(f"📄 SQL file: {output_sql}", file=out)
+    print(f"📊 Summary file: {output_summary}", file=out)
     
     # Print summary stats
-    print("\n📈 Summary Statistics:")
-    print(f"  Complexity breakdown:")
+    print("\n📈 Summary Statistics:", file=out)
+    print(f"  Complexity breakdown:", file=out)
     for complexity, count in summary['complexities'].items():
-        print(f"    - {complexity}: {count}")
-    print(f"  Equipment types: {len(summary['equipment_types'])}")
-    print(f"  Space types: {len(summary['space_types'])}")
-    print(f"  Unique tags: {len(summary['tag_counts'])}")
-    print(f"  Point attribution:")
+        print(f"    - {complexity}: {count}", file=out)
+    print(f"  Equipment types: {len(summary['equipment_types'])}", file=out)
+    print(f"  Space types: {len(summary['space_types'])}", file=out)
+    print(f"  Unique tags: {len(summary['tag_counts'])}", file=out)
+    print(f"  Point attribution:", file=out)
     for point_type, count in summary['point_types'].items():
         if count > 0:
-            print(f"    - {point_type}: {count} drills")
+            print(f"    - {point_type}: {count} drills", file=out)
+    
+    return summary
+
+def drill_stage(batch_size=DEFAULT_BATCH_SIZE, copy_format=None, previous=None):
+    """(stage, inputs, outputs, options) the build cache keys the drills files by"""
+    output_sql = DRILLS_DELTA_SQL if previous else DRILLS_SQL
+    return (
+        'skills_academy_drills_delta' if previous else 'skills_academy_drills',
+        [QUIZZES_WORKOUTS_CSV] + ([previous] if previous else []), [output_sql, DRILLS_SUMMARY],
+        {'batch_size': batch_size, 'copy_format': copy_format}
+    )
+
+def drill_files_cached(batch_size=DEFAULT_BATCH_SIZE, copy_format=None, previous=None):
+    """True if build_drill_files would reuse cached files without reading the export"""
+    stage, inputs, outputs, options = drill_stage(batch_size, copy_format, previous)
+    return is_cached(stage, __file__, inputs, outputs, options)
+
+def build_drill_files(batch_size=DEFAULT_BATCH_SIZE, copy_format=None, workers=1,
+                      previous=None, counts=None, rows=None, force=False, out=None, sql=None):
+    """Write the drills SQL and summary unless the build cache has them.
+
+    The stage is keyed by the export (and previous export), this script's
+    sources, batch_size and copy_format; workers never changes the output.
+    counts is passed to iter_stream when the export is read serially.
+    rows, if given, is called for the drill-stream rows another stage has
+    already read, instead of reading the export again. With previous the
+    delta SQL is written instead. sql, a dict, receives the text of a rebuilt
+    SQL file by path. Returns True when the files were rebuilt.
+    """
+    stage, inputs, outputs, options = drill_stage(batch_size, copy_format, previous)
+    
+    def build():
+        if rows is not None:
+            parts = drill_parts(rows())
+            previous_parts = drill_parts(iter_stream('drill', previous)) if previous else None
+        elif workers == 1:
+            parts = drill_parts(iter_stream('drill', counts=counts))
+            previous_parts = drill_parts(iter_stream('drill', previous)) if previous else None
+        else:
+            parts = parallel_drill_parts(workers=workers)
+            previous_parts = parallel_drill_parts(previous, workers) if previous else None
+        write_drill_outputs(parts, output_sql=outputs[0], batch_size=batch_size,
+                             copy_format=copy_format, previous_parts=previous_parts, out=out, sql=sql)
+    
+    return run_cached(stage, __file__, inputs, outputs, build, options=options, force=force, out=out)
+
+def show_drills(ids, path=QUIZZES_WORKOUTS_CSV):
+    """Print the parsed drill for each export ID, reading only those rows"""
+    rows = read_rows_by_id(path, ids)
+    for drill_id in ids:
+        row = rows.get(str(drill_id))
+        if row is None:
+            print(f"⚠️  {drill_id}: not in the export")
+        elif classify_row(row) != 'drill':
+            print(f"⚠️  {drill_id}: {row['Title'].strip()} is a {classify_row(row)} row, not a drill")
+        else:
+            drill_data = build_drill(row)
+            print(f"🔎 {drill_id}:")
+            print(json.dumps(dict(zip(DRILL_COLUMNS, drill_record(drill_data))), indent=2, ensure_ascii=False))
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate Skills Academy drills SQL')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per multi-row INSERT or COPY block')
+    parser.add_argument('--copy', choices=COPY_FORMATS, dest='copy_format',
+                        help='Emit COPY ... FROM STDIN data in this format instead of INSERTs (run with psql)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes parsing record-aligned chunks of the export (0 = one per CPU); output is identical for any count')
+    parser.add_argument('--previous', metavar='CSV',
+                        help='Previous Quizzes-Workouts export; write only the changes since it to skills_academy_drills_delta.sql')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild even if the build cache has outputs for these inputs')
+    parser.add_argument('--show', nargs='+', metavar='ID',
+                        help='Print the parsed drills for these export IDs instead of writing any files')
+    args = parser.parse_args()
+    
+    if args.show:
+        show_drills(args.show)
+        return
+    
+    if args.previous and args.copy_format:
+        parser.error('--previous writes INSERT/UPDATE/DELETE statements and cannot be combined with --copy')
+    
+    build_drill_files(args.batch_size, args.copy_format, args.workers, args.previous, force=args.force)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
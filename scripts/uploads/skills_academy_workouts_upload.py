@@ -5,143 +5,33 @@ Processes Skills Academy workout collections (Wall Ball, Attack, Midfield, Defen
 and generates SQL for Supabase upload
 """
 
-import csv
+import argparse
+import itertools
+import os
 import re
 import json
 from datetime import datetime
 
-def extract_workout_type(title, categories):
-    """Determine workout type from title and categories"""
-    title_lower = title.lower()
-    
-    # Wall Ball workouts
-    if 'wall ball' in title_lower:
-        return 'wall_ball'
-    # Attack workouts
-    elif 'attack' in title_lower or 'Attack Drills>Attack' in categories:
-        return 'attack'
-    # Defense workouts
-    elif 'defense' in title_lower:
-        return 'defense'
-    # Midfield workouts
-    elif 'midfield' in title_lower or 'midfielder' in title_lower:
-        return 'midfield'
-    # Self-guided/Flex workouts
-    elif 'self-guided' in title_lower:
-        return 'flex'
-    else:
-        return 'general'
+from build_cache import is_cached, run_cached
+from csv_chunks import DEFAULT_CHUNK_BYTES, csv_chunk_tasks, map_csv_chunks
+from html_cleanup import clean_html
+from skills_academy_categories import scan_categories, workout_points, workout_tags, workout_type
+from skills_academy_export import PROJECT_DIR, QUIZZES_WORKOUTS_CSV, classify_row, iter_stream
+from sql_batches import DEFAULT_BATCH_SIZE, insert_batches, write_sql_file
+from sql_copy import COPY_FORMATS, copy_batches
+from sql_delta import delta_statements, describe_changes, diff_records, snapshot_hashes
 
-def parse_workout_duration(title):
-    """Extract duration from workout title"""
-    # Look for patterns like "10 Minutes", "5 Minute", "17 Minutes"
-    match = re.search(r'(\d+)\s*[Mm]inute', title)
-    if match:
-        return int(match.group(1))
-    return None
+WORKOUTS_SQL = os.path.join(PROJECT_DIR, 'skills_academy_workouts_import.sql')
+WORKOUTS_SUMMARY = os.path.join(PROJECT_DIR, 'skills_academy_workouts_summary.json')
+WORKOUTS_DELTA_SQL = os.path.join(PROJECT_DIR, 'skills_academy_workouts_delta.sql')
 
-def parse_workout_points(categories_str, workout_type, duration):
-    """Parse workout point values"""
-    points = {}
-    
-    if categories_str:
-        # Parse Flex Points
-        if 'Flex Points' in categories_str:
-            match = re.search(r'Flex Points[>\s]*(\d+)', categories_str)
-            points['flex_points'] = int(match.group(1)) if match else 0
-        
-        # Parse Lax Credits
-        if 'Lax Credits' in categories_str or 'Lacrosse Player Points' in categories_str:
-            match = re.search(r'(\d+)\s*Lax Credits?', categories_str)
-            points['lax_credit'] = int(match.group(1)) if match else 0
-        
-        # Parse Wall Ball points (Rebound Rewards)
-        if 'Wall Ball' in categories_str:
-            match = re.search(r'Wall Ball\s*(\d+)', categories_str)
-            points['rebound_reward'] = int(match.group(1)) if match else (duration or 0)
-        
-        # Parse Attack points
-        if 'Attack' in categories_str:
-            match = re.search(r'Attack\s*(\d+)', categories_str)
-            if match:
-                points['attack_token'] = int(match.group(1)) // 5  # Typically 5 drills = 1 token
-    
-    # Apply defaults based on workout type and duration
-    if workout_type == 'wall_ball' and 'rebound_reward' not in points:
-        points['rebound_reward'] = duration or 5
-    
-    return points
+WORKOUT_COLUMNS = [
+    'original_id', 'title', 'workout_type', 'duration_minutes', 'point_values',
+    'tags', 'description', 'drill_count'
+]
 
-def parse_workout_tags(tags_str, categories_str, title):
-    """Extract tags from workout"""
-    tags = []
-    
-    # From tags field
-    if tags_str:
-        tags.extend([t.strip() for t in tags_str.split('|')])
-    
-    # From categories
-    if categories_str:
-        # Extract workout badges/achievements
-        badge_patterns = [
-            'Foundation Ace', 'Dominant Dodger', 'Stamina Star', 'Finishing Phenom',
-            'Bullet Snatcher', 'Long Pole Lizard', 'Wall Ball Hawk', 'The Wall Wizard',
-            'Independent Improver'
-        ]
-        for badge in badge_patterns:
-            if badge in categories_str:
-                tags.append(badge.lower().replace(' ', '-'))
-        
-        # Extract workout length tags
-        if 'Long Workout' in categories_str:
-            tags.append('long-workout')
-        elif '10 Drill Workout' in categories_str:
-            tags.append('10-drill-workout')
-        elif '5 Drill Workout' in categories_str:
-            tags.append('5-drill-workout')
-    
-    # Ensure Skills-Academy tag
-    if 'Skills-Academy' not in tags:
-        tags.append('Skills-Academy')
-    
-    return list(set(tags))  # Remove duplicates
-
-def create_workout_sql(workout_data):
-    """Create SQL insert for a workout"""
-    sql = f"""
-INSERT INTO skills_academy_workouts (
-    original_id,
-    title,
-    workout_type,
-    duration_minutes,
-    point_values,
-    tags,
-    description,
-    drill_count,
-    created_at
-) VALUES (
-    {workout_data['id']},
-    '{workout_data['title'].replace("'", "''")}',
-    '{workout_data['workout_type']}',
-    {workout_data['duration'] or 'NULL'},
-    '{json.dumps(workout_data['point_values'])}'::jsonb,
-    ARRAY{workout_data['tags']}::text[],
-    {f"'{workout_data['description'].replace("'", "''")}'" if workout_data['description'] else 'NULL'},
-    {workout_data['drill_count'] or 'NULL'},
-    NOW()
-);"""
-    return sql
-
-def main():
-    input_file = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/docs/Wordpress CSV\'s/Quizzes-Workouts-Export-2025-July-31-0920.csv'
-    output_sql = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/skills_academy_workouts_import.sql'
-    output_summary = '/Users/patrickchapla/Development/POWLAX React App/React Code/powlax-react-app/skills_academy_workouts_summary.json'
-    
-    workouts = []
-    sql_statements = []
-    
-    # Create table definition
-    table_sql = """
+# Create table definition
+WORKOUTS_TABLE_SQL = """
 -- Skills Academy Workouts Table
 CREATE TABLE IF NOT EXISTS skills_academy_workouts (
     id SERIAL PRIMARY KEY,
@@ -170,76 +60,64 @@ CREATE TABLE IF NOT EXISTS workout_drill_relationships (
     created_at TIMESTAMP DEFAULT NOW()
 );
 """
+
+def parse_workout_duration(title):
+    """Extract duration from workout title"""
+    # Look for patterns like "10 Minutes", "5 Minute", "17 Minutes"
+    match = re.search(r'(\d+)\s*[Mm]inute', title)
+    if match:
+        return int(match.group(1))
+    return None
+
+def workout_record(workout_data):
+    """Column values for a workout, in WORKOUT_COLUMNS order"""
+    return [
+        workout_data['id'],
+        workout_data['title'],
+        workout_data['workout_type'],
+        workout_data['duration'] or None,
+        workout_data['point_values'],
+        workout_data['tags'],
+        workout_data['description'] or None,
+        workout_data['drill_count'] or None
+    ]
+
+def build_workout(row):
+    """Parse one workout-stream export row into workout data"""
+    title = row.get('Title', '').strip()
+    categories = row.get('Quiz / Workout Categories', '')
     
-    sql_statements.append(table_sql)
+    # Parse workout data from a single scan of the categories
+    scan = scan_categories(categories)
+    wtype = workout_type(title, scan)
+    duration = parse_workout_duration(title)
+    point_values = workout_points(scan, wtype, duration)
+    tags = workout_tags(row.get('Quiz / Workout Tags', ''), scan)
     
-    with open(input_file, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        
-        for row in reader:
-            title = row.get('Title', '').strip()
-            
-            # Skip individual drills (those with Vimeo embeds)
-            if row.get('Content') and 'vimeo.com' in row.get('Content', ''):
-                continue
-            
-            # Identify workouts
-            is_workout = False
-            if any(keyword in title.lower() for keyword in ['workout', 'practice', 'maintenance']):
-                is_workout = True
-            
-            # Check categories for workout indicators
-            categories = row.get('Quiz / Workout Categories', '')
-            if any(indicator in categories for indicator in ['Workout Length>', 'Wall Ball', 'Attack Drills>Attack']):
-                is_workout = True
-            
-            if not is_workout:
-                continue
-            
-            # Parse workout data
-            workout_type = extract_workout_type(title, categories)
-            duration = parse_workout_duration(title)
-            point_values = parse_workout_points(categories, workout_type, duration)
-            tags = parse_workout_tags(row.get('Quiz / Workout Tags', ''), categories, title)
-            
-            # Extract drill count from title if available
-            drill_count = None
-            count_match = re.search(r'(\d+)\s*Drill', title)
-            if count_match:
-                drill_count = int(count_match.group(1))
-            
-            # Clean content for description
-            content = row.get('Content', '')
-            if content:
-                # Remove WordPress shortcodes and HTML
-                content = re.sub(r'<!--.*?-->', '', content, flags=re.DOTALL)
-                content = re.sub(r'<[^>]+>', '', content)
-                content = content.strip()
-            
-            workout_data = {
-                'id': int(row['ID']),
-                'title': title,
-                'workout_type': workout_type,
-                'duration': duration,
-                'point_values': point_values,
-                'tags': tags,
-                'description': content,
-                'drill_count': drill_count
-            }
-            
-            workouts.append(workout_data)
-            sql_statements.append(create_workout_sql(workout_data))
+    # Extract drill count from title if available
+    drill_count = None
+    count_match = re.search(r'(\d+)\s*Drill', title)
+    if count_match:
+        drill_count = int(count_match.group(1))
     
-    # Write SQL file
-    with open(output_sql, 'w', encoding='utf-8') as f:
-        f.write('-- Skills Academy Workouts Import\n')
-        f.write(f'-- Generated: {datetime.now().isoformat()}\n')
-        f.write(f'-- Total Workouts: {len(workouts)}\n\n')
-        f.write('\n'.join(sql_statements))
+    # Clean content for description, keeping its line breaks
+    content = clean_html(row.get('Content', ''), shortcodes=False, collapse_whitespace=False)
     
-    # Generate summary
-    summary = {
-        'total_workouts': len(workouts),
+    return {
+        'id': int(row['ID']),
+        'title': title,
+        'workout_type': wtype,
+        'duration': duration,
+        'point_values': point_values,
+        'tags': tags,
+        'description': content,
+        'drill_count': drill_count
+    }
+
+def new_workout_summary():
+    """Empty running statistics for the workouts summary JSON"""
+    return {
+        'total_workouts': 0,
         'workout_types': {},
         'duration_ranges': {
             '5_min': 0,
@@ -255,32 +133,126 @@ CREATE TABLE IF NOT EXISTS workout_drill_relationships (
         },
         'tag_frequency': {}
     }
+
+def add_workout_to_summary(summary, workout):
+    """Update running summary statistics with one workout"""
+    summary['total_workouts'] += 1
     
-    for workout in workouts:
-        # Count workout types
-        wtype = workout['workout_type']
-        summary['workout_types'][wtype] = summary['workout_types'].get(wtype, 0) + 1
-        
-        # Count duration ranges
-        duration = workout['duration']
-        if duration:
-            if duration <= 5:
-                summary['duration_ranges']['5_min'] += 1
-            elif duration <= 10:
-                summary['duration_ranges']['10_min'] += 1
-            else:
-                summary['duration_ranges']['15_plus'] += 1
+    # Count workout types
+    wtype = workout['workout_type']
+    summary['workout_types'][wtype] = summary['workout_types'].get(wtype, 0) + 1
+    
+    # Count duration ranges
+    duration = workout['duration']
+    if duration:
+        if duration <= 5:
+            summary['duration_ranges']['5_min'] += 1
+        elif duration <= 10:
+            summary['duration_ranges']['10_min'] += 1
         else:
-            summary['duration_ranges']['unspecified'] += 1
-        
-        # Count point distributions
-        for point_type, value in workout['point_values'].items():
-            if value > 0:
-                summary['point_distribution'][point_type] += 1
+            summary['duration_ranges']['15_plus'] += 1
+    else:
+        summary['duration_ranges']['unspecified'] += 1
+    
+    # Count point distributions
+    for point_type, value in workout['point_values'].items():
+        if value > 0:
+            summary['point_distribution'][point_type] += 1
+    
+    # Count tags
+    for tag in workout['tags']:
+        summary['tag_frequency'][tag] = summary['tag_frequency'].get(tag, 0) + 1
+
+def merge_workout_summary(summary, partial):
+    """Fold the summary of a later run of workouts into summary"""
+    summary['total_workouts'] += partial['total_workouts']
+    for wtype, count in partial['workout_types'].items():
+        summary['workout_types'][wtype] = summary['workout_types'].get(wtype, 0) + count
+    for duration_range, count in partial['duration_ranges'].items():
+        summary['duration_ranges'][duration_range] += count
+    for point_type, count in partial['point_distribution'].items():
+        summary['point_distribution'][point_type] += count
+    for tag, count in partial['tag_frequency'].items():
+        summary['tag_frequency'][tag] = summary['tag_frequency'].get(tag, 0) + count
+
+def parse_workout_rows(rows):
+    """Build workouts from workout-stream rows; returns (records, summary)"""
+    summary = new_workout_summary()
+    records = []
+    for row in rows:
+        workout_data = build_workout(row)
+        add_workout_to_summary(summary, workout_data)
+        records.append(workout_record(workout_data))
+    return records, summary
+
+def _parse_workout_chunk(rows):
+    """Classify a chunk of export rows and parse its workouts, in a worker"""
+    return parse_workout_rows([row for row in rows if classify_row(row) == 'workout'])
+
+def workout_parts(workout_rows, part_size=DEFAULT_BATCH_SIZE):
+    """Parse workout rows in this process, part_size rows at a time"""
+    workout_rows = iter(workout_rows)
+    while True:
+        part = list(itertools.islice(workout_rows, part_size))
+        if not part:
+            return
+        yield parse_workout_rows(part)
+
+def parallel_workout_parts(path=QUIZZES_WORKOUTS_CSV, workers=0, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Parse the export's workouts across a process pool, in file order"""
+    return map_csv_chunks(_parse_workout_chunk, csv_chunk_tasks(path, chunk_bytes), workers)
+
+def write_workout_outputs(parts, output_sql=WORKOUTS_SQL, output_summary=WORKOUTS_SUMMARY,
+                          batch_size=DEFAULT_BATCH_SIZE, copy_format=None, previous_parts=None, out=None,
+                          sql=None):
+    """Stream parsed workouts into the SQL file and summary JSON.
+
+    parts yields (records, summary) in export order, from workout_parts or
+    parallel_workout_parts. Parts are rendered one batch at a time, so only
+    the parts in flight and the running summary are held in memory.
+    
+    With previous_parts, parts of the previous export snapshot, the SQL
+    file is a delta instead: only the INSERTs, UPDATEs and DELETEs that
+    turn the previous snapshot into this one, matched by ID and content hash.
+    Progress is printed to out, stdout by default. With sql, a dict, the
+    SQL text written is also kept there by path, see write_sql_file.
+    """
+    summary = new_workout_summary()
+    
+    def records():
+        for part_records, partial in parts:
+            merge_workout_summary(summary, partial)
+            yield from part_records
+    
+    if previous_parts is not None:
+        previous = snapshot_hashes(record for part_records, _ in previous_parts for record in part_records)
+        changes = {}
+        statements = delta_statements(
+            'skills_academy_workouts', WORKOUT_COLUMNS, diff_records(previous, records(), counts=changes), batch_size,
+            insert_expressions={'created_at': 'NOW()'}, update_expressions={'updated_at': 'NOW()'}
+        )
+        write_sql_file(output_sql, statements, lambda: (
+            '-- Skills Academy Workouts Delta\n'
+            f'-- Generated: {datetime.now().isoformat()}\n'
+            f"-- Total Workouts: {summary['total_workouts']}\n"
+            f'-- Changes: {describe_changes(changes)}\n\n'
+        ), keep=sql)
+        print(f"🔁 Delta against previous export: {describe_changes(changes)}", file=out)
+    else:
+        if copy_format:
+            batches = copy_batches('skills_academy_workouts', WORKOUT_COLUMNS, records(), copy_format, batch_size)
+        else:
+            batches = insert_batches(
+                'skills_academy_workouts', WORKOUT_COLUMNS, records(), batch_size,
+                expressions={'created_at': 'NOW()'}
+            )
         
-        # Count tags
-        for tag in workout['tags']:
-            summary['tag_frequency'][tag] = summary['tag_frequency'].get(tag, 0) + 1
+        # Write SQL file; the header count is known once every batch is written
+        write_sql_file(output_sql, itertools.chain([WORKOUTS_TABLE_SQL], batches), lambda: (
+            '-- Skills Academy Workouts Import\n'
+            f'-- Generated: {datetime.now().isoformat()}\n'
+            f"-- Total Workouts: {summary['total_workouts']}\n\n"
+        ), keep=sql)
     
     # Sort tags by frequency
     summary['tag_frequency'] = dict(sorted(summary['tag_frequency'].items(), 
@@ -289,24 +261,87 @@ CREATE TABLE IF NOT EXISTS workout_drill_relationships (
     with open(output_summary, 'w', encoding='utf-8') as f:
         json.dump(summary, f, indent=2)
     
-    print(f"✅ Processed {len(workouts)} Skills Academy workouts")
-    print(f"📄 SQL file: {output_sql}")
-    print(f"📊 Summary file: {output_summary}")
+    print(f"✅ Processed {summary['total_workouts']} Skills Academy workouts", file=out)
+    print(f"📄 SQL file: {output_sql}", file=out)
+    print(f"📊 Summary file: {output_summary}", file=out)
     
     # Print summary stats
-    print("\n📈 Summary Statistics:")
-    print("  Workout types:")
+    print("\n📈 Summary Statistics:", file=out)
+    print("  Workout types:", file=out)
     for wtype, count in summary['workout_types'].items():
-        print(f"    - {wtype}: {count}")
-    print(f"\n  Duration distribution:")
-    print(f"    - 5 minutes: {summary['duration_ranges']['5_min']}")
-    print(f"    - 10 minutes: {summary['duration_ranges']['10_min']}")
-    print(f"    - 15+ minutes: {summary['duration_ranges']['15_plus']}")
-    print(f"    - Unspecified: {summary['duration_ranges']['unspecified']}")
-    print(f"\n  Point types awarded:")
+        print(f"    - {wtype}: {count}", file=out)
+    print(f"\n  Duration distribution:", file=out)
+    print(f"    - 5 minutes: {summary['duration_ranges']['5_min']}", file=out)
+    print(f"    - 10 minutes: {summary['duration_ranges']['10_min']}", file=out)
+    print(f"    - 15+ minutes: {summary['duration_ranges']['15_plus']}", file=out)
+    print(f"    - Unspecified: {summary['duration_ranges']['unspecified']}", file=out)
+    print(f"\n  Point types awarded:", file=out)
     for ptype, count in summary['point_distribution'].items():
         if count > 0:
-            print(f"    - {ptype}: {count} workouts")
+            print(f"    - {ptype}: {count} workouts", file=out)
+    
+    return summary
+
+def workout_stage(batch_size=DEFAULT_BATCH_SIZE, copy_format=None, previous=None):
+    """(stage, inputs, outputs, options) the build cache keys the workouts files by"""
+    output_sql = WORKOUTS_DELTA_SQL if previous else WORKOUTS_SQL
+    return (
+        'skills_academy_workouts_delta' if previous else 'skills_academy_workouts',
+        [QUIZZES_WORKOUTS_CSV] + ([previous] if previous else []), [output_sql, WORKOUTS_SUMMARY],
+        {'batch_size': batch_size, 'copy_format': copy_format}
+    )
+
+def workout_files_cached(batch_size=DEFAULT_BATCH_SIZE, copy_format=None, previous=None):
+    """True if build_workout_files would reuse cached files without reading the export"""
+    stage, inputs, outputs, options = workout_stage(batch_size, copy_format, previous)
+    return is_cached(stage, __file__, inputs, outputs, options)
+
+def build_workout_files(batch_size=DEFAULT_BATCH_SIZE, copy_format=None, workers=1,
+                        previous=None, counts=None, rows=None, force=False, out=None, sql=None):
+    """Write the workouts SQL and summary unless the build cache has them.
+
+    The stage is keyed by the export (and previous export), this script's
+    sources, batch_size and copy_format; workers never changes the output.
+    counts is passed to iter_stream when the export is read serially.
+    rows, if given, is called for the workout-stream rows another stage has
+    already read, instead of reading the export again. With previous the
+    delta SQL is written instead. sql, a dict, receives the text of a rebuilt
+    SQL file by path. Returns True when the files were rebuilt.
+    """
+    stage, inputs, outputs, options = workout_stage(batch_size, copy_format, previous)
+    
+    def build():
+        if rows is not None:
+            parts = workout_parts(rows())
+            previous_parts = workout_parts(iter_stream('workout', previous)) if previous else None
+        elif workers == 1:
+            parts = workout_parts(iter_stream('workout', counts=counts))
+            previous_parts = workout_parts(iter_stream('workout', previous)) if previous else None
+        else:
+            parts = parallel_workout_parts(workers=workers)
+            previous_parts = parallel_workout_parts(previous, workers) if previous else None
+        write_workout_outputs(parts, output_sql=outputs[0], batch_size=batch_size,
+                               copy_format=copy_format, previous_parts=previous_parts, out=out, sql=sql)
+    
+    return run_cached(stage, __file__, inputs, outputs, build, options=options, force=force, out=out)
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate Skills Academy workouts SQL')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per multi-row INSERT or COPY block')
+    parser.add_argument('--copy', choices=COPY_FORMATS, dest='copy_format',
+                        help='Emit COPY ... FROM STDIN data in this format instead of INSERTs (run with psql)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes parsing record-aligned chunks of the export (0 = one per CPU); output is identical for any count')
+    parser.add_argument('--previous', metavar='CSV',
+                        help='Previous Quizzes-Workouts export; write only the changes since it to skills_academy_workouts_delta.sql')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild even if the build cache has outputs for these inputs')
+    args = parser.parse_args()
+    
+    if args.previous and args.copy_format:
+        parser.error('--previous writes INSERT/UPDATE/DELETE statements and cannot be combined with --copy')
+    
+    build_workout_files(args.batch_size, args.copy_format, args.workers, args.previous, force=args.force)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Batched SQL emission for the upload scripts
+Centralized literal escaping and multi-row INSERT statements, one
+transaction per batch
+"""
+
+import json
+import os
+import shutil
+
+# Rows per multi-row INSERT statement
+DEFAULT_BATCH_SIZE = 500
+
+def sql_literal(value):
+    """Render a Python scalar as a Postgres literal; None becomes NULL"""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+def sql_text_array(items):
+    """Render a list of strings as a TEXT[] literal"""
+    return 'ARRAY[' + ', '.join(sql_literal(item) for item in items) + ']::text[]'
+
+def sql_jsonb(value):
+    """Render a JSON-serializable value as a JSONB literal"""
+    return sql_literal(json.dumps(value)) + '::jsonb'
+
+def sql_value(value):
+    """Render a record value: lists as TEXT[], dicts as JSONB, scalars as literals"""
+    if isinstance(value, list):
+        return sql_text_array(value)
+    if isinstance(value, dict):
+        return sql_jsonb(value)
+    return sql_literal(value)
+
+def record_batches(records, batch_size, key_positions=()):
+    """Split records into lists of at most batch_size, starting a new list
+    whenever the key at key_positions repeats within the current one"""
+    batch = []
+    batch_keys = set()
+    for record in records:
+        key = tuple(sql_value(record[position]) for position in key_positions)
+        if batch and (len(batch) >= batch_size or (key_positions and key in batch_keys)):
+            yield batch
+            batch = []
+            batch_keys = set()
+        batch.append(record)
+        batch_keys.add(key)
+    if batch:
+        yield batch
+
+def _insert_statement(table, columns, rows, conflict_columns, conflict_updates):
+    """One multi-row INSERT wrapped in its own transaction"""
+    column_list = ',\n'.join(f'    {column}' for column in columns)
+    values = ',\n'.join('(' + ', '.join(row) + ')' for row in rows)
+    sql = f"""
+BEGIN;
+INSERT INTO {table} (
+{column_list}
+) VALUES
+{values}"""
+    if conflict_columns:
+        updates = ',\n'.join(f'    {update}' for update in conflict_updates)
+        sql += f"\nON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET\n{updates}"
+    return sql + ';\nCOMMIT;'
+
+def insert_batches(table, columns, records, batch_size=DEFAULT_BATCH_SIZE,
+                   conflict_columns=(), conflict_updates=(), expressions=None):
+    """Yield multi-row INSERT statements for records of Python values.
+
+    Records are rendered with sql_value in column order. expressions maps
+    extra columns to SQL appended to every row, e.g. {'created_at': 'NOW()'}.
+    Each statement carries up to batch_size rows inside BEGIN/COMMIT. With
+    ON CONFLICT ... DO UPDATE, Postgres rejects a statement that touches
+    the same key twice, so a repeated conflict key starts a new batch and
+    later rows still update earlier ones as separate statements did.
+    """
+    expressions = expressions or {}
+    key_positions = [columns.index(column) for column in conflict_columns]
+    columns = list(columns) + list(expressions)
+    for batch in record_batches(records, batch_size, key_positions):
+        rows = [[sql_value(value) for value in record] + list(expressions.values()) for record in batch]
+        yield _insert_statement(table, columns, rows, conflict_columns, conflict_updates)
+
+def write_sql_file(path, statements, header, keep=None):
+    """Write statements to path as they are generated, joined by newlines.
+
+    The body is streamed to a .part file first, so header() is only called
+    once every statement, and whatever counts they update, has been
+    produced; it is then written ahead of the body and the part removed.
+    With keep, a dict, the file's text is also stored under keep[path] for
+    a later stage to use without reading the file again.
+    """
+    part_path = path + '.part'
+    with open(part_path, 'w', encoding='utf-8') as body:
+        for i, statement in enumerate(statements):
+            if i:
+                body.write('\n')
+            body.write(statement)
+    with open(path, 'w', encoding='utf-8') as f, open(part_path, 'r', encoding='utf-8') as body:
+        head = header()
+        f.write(head)
+        if keep is None:
+            shutil.copyfileobj(body, f)
+        else:
+            text = body.read()
+            f.write(text)
+            keep[path] = head + text
+    os.remove(part_path)
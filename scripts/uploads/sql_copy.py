@@ -0,0 +1,102 @@
+"""
+COPY-format SQL emission for the upload scripts
+Renders records as psql `COPY ... FROM STDIN` blocks in text or CSV format,
+an alternative to the multi-row INSERTs in sql_batches
+"""
+
+import json
+
+from sql_batches import DEFAULT_BATCH_SIZE, record_batches
+
+COPY_FORMATS = ('text', 'csv')
+
+# Characters with a backslash escape in COPY text format
+TEXT_ESCAPES = {'\\': '\\\\', '\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+def copy_array(items):
+    """Render a list of strings as a TEXT[] input literal; every element is
+    quoted, so only a None element is read back as NULL"""
+    elements = ('NULL' if item is None else '"' + str(item).replace('\\', '\\\\').replace('"', '\\"') + '"'
+                for item in items)
+    return '{' + ','.join(elements) + '}'
+
+def _copy_text(value):
+    """Postgres input text for a non-NULL record value"""
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, list):
+        return copy_array(value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return str(value)
+
+def copy_field(value, copy_format='text'):
+    """Render one record value as a COPY field.
+
+    Text format writes NULL as \\N and backslash-escapes backslashes, tabs
+    and line breaks. CSV format writes NULL as an empty unquoted field and
+    double-quotes everything else, so empty strings stay distinct from NULL.
+    """
+    if copy_format == 'csv':
+        if value is None:
+            return ''
+        return '"' + _copy_text(value).replace('"', '""') + '"'
+    if value is None:
+        return '\\N'
+    return ''.join(TEXT_ESCAPES.get(char, char) for char in _copy_text(value))
+
+def copy_command(table, columns, copy_format='text'):
+    """The COPY ... FROM STDIN command for a table and column list"""
+    options = ' WITH (FORMAT csv)' if copy_format == 'csv' else ''
+    return f"COPY {table} ({', '.join(columns)}) FROM STDIN{options}"
+
+def copy_lines(records, copy_format='text'):
+    """Yield one COPY data line per record, without line terminators"""
+    delimiter = ',' if copy_format == 'csv' else '\t'
+    for record in records:
+        yield delimiter.join(copy_field(value, copy_format) for value in record)
+
+def staging_sql(table, columns, conflict_columns, conflict_updates):
+    """(staging table, CREATE statement, upsert statement) for copying into
+    a temporary table and merging it into table with ON CONFLICT"""
+    staging = f'{table}_staging'
+    column_list = ', '.join(columns)
+    updates = ',\n'.join(f'    {update}' for update in conflict_updates)
+    create = f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {column_list} FROM {table} WITH NO DATA"
+    upsert = f"""INSERT INTO {table} ({column_list})
+SELECT {column_list} FROM {staging}
+ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET
+{updates}"""
+    return staging, create, upsert
+
+def copy_block(table, columns, records, copy_format='text'):
+    """One COPY ... FROM STDIN statement followed by its data and end marker"""
+    lines = [copy_command(table, columns, copy_format) + ';']
+    lines.extend(copy_lines(records, copy_format))
+    lines.append('\\.')
+    return '\n'.join(lines)
+
+def copy_batches(table, columns, records, copy_format='text', batch_size=DEFAULT_BATCH_SIZE,
+                 conflict_columns=(), conflict_updates=()):
+    """Yield COPY statements for records of Python values, one transaction per batch.
+
+    Columns left out, like created_at, take their table defaults. COPY has
+    no ON CONFLICT, so with conflict_columns each batch is copied into a
+    temporary staging table and upserted from there; as in insert_batches,
+    a repeated conflict key starts a new batch. The output needs psql,
+    which streams the inline data to the server.
+    """
+    if copy_format not in COPY_FORMATS:
+        raise ValueError(f"Unknown COPY format: {copy_format}")
+    key_positions = [columns.index(column) for column in conflict_columns]
+    for batch in record_batches(records, batch_size, key_positions):
+        if not conflict_columns:
+            yield '\nBEGIN;\n' + copy_block(table, columns, batch, copy_format) + '\nCOMMIT;'
+            continue
+        staging, create, upsert = staging_sql(table, columns, conflict_columns, conflict_updates)
+        yield f"""
+BEGIN;
+{create};
+{copy_block(staging, columns, batch, copy_format)}
+{upsert};
+COMMIT;"""
@@ -0,0 +1,121 @@
+"""
+Delta SQL against a previous export snapshot
+Hash-joins the records of a new export to those of the previous one by ID
+and content hash, and emits INSERTs, UPDATEs and DELETEs for changed rows only
+"""
+
+import hashlib
+import json
+
+from sql_batches import DEFAULT_BATCH_SIZE, insert_batches, sql_literal, sql_value
+
+CHANGE_KINDS = ('insert', 'update', 'delete', 'unchanged')
+
+def record_hash(record):
+    """Content hash of a record's column values"""
+    data = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).digest()
+
+def snapshot_hashes(records, key_position=0):
+    """{record ID: content hash} for a snapshot's records, in snapshot order"""
+    return {record[key_position]: record_hash(record) for record in records}
+
+def diff_records(previous_hashes, records, key_position=0, counts=None):
+    """Yield (kind, record) changes turning the previous snapshot into records.
+
+    kind is 'insert' for a new ID, 'update' when the content hash differs
+    and, once records is exhausted, 'delete' with the ID of every previous
+    row that no longer appears. If given, counts is updated per kind,
+    'unchanged' included.
+    """
+    if counts is None:
+        counts = {}
+    for kind in CHANGE_KINDS:
+        counts.setdefault(kind, 0)
+    current = dict(previous_hashes)
+    seen = set()
+    for record in records:
+        key = record[key_position]
+        digest = record_hash(record)
+        if key not in current:
+            kind = 'insert'
+        elif current[key] != digest:
+            kind = 'update'
+        else:
+            kind = 'unchanged'
+        current[key] = digest
+        seen.add(key)
+        counts[kind] += 1
+        if kind != 'unchanged':
+            yield kind, record
+    for key in current:
+        if key not in seen:
+            counts['delete'] += 1
+            yield 'delete', key
+
+def describe_changes(counts):
+    """One-line summary of diff_records counts"""
+    return (f"{counts['insert']} inserted, {counts['update']} updated, "
+            f"{counts['delete']} deleted, {counts['unchanged']} unchanged")
+
+def _update_statements(table, columns, records, key_column, expressions):
+    """Per-row UPDATEs for records, wrapped in one transaction"""
+    key_position = columns.index(key_column)
+    statements = []
+    for record in records:
+        assignments = [
+            f'    {column} = {sql_value(value)}'
+            for column, value in zip(columns, record) if column != key_column
+        ]
+        assignments.extend(f'    {column} = {expression}' for column, expression in expressions.items())
+        statements.append(
+            f"UPDATE {table} SET\n" + ',\n'.join(assignments) +
+            f"\nWHERE {key_column} = {sql_literal(record[key_position])};"
+        )
+    return '\nBEGIN;\n' + '\n'.join(statements) + '\nCOMMIT;'
+
+def _delete_statement(table, keys, key_column):
+    """One DELETE for a batch of IDs, wrapped in its own transaction"""
+    key_list = ', '.join(sql_literal(key) for key in keys)
+    return f"\nBEGIN;\nDELETE FROM {table} WHERE {key_column} IN ({key_list});\nCOMMIT;"
+
+def delta_statements(table, columns, changes, batch_size=DEFAULT_BATCH_SIZE,
+                     key_column='original_id', insert_expressions=None, update_expressions=None):
+    """Yield SQL applying diff_records changes, batch_size rows per transaction.
+
+    Inserts upsert on key_column, so re-applying a delta is harmless.
+    UPDATEs rewrite every column of a changed row, since only hashes of the
+    previous rows are kept. DELETEs come last, batched by ID. At most
+    batch_size pending changes of each kind are held at a time.
+    """
+    insert_expressions = insert_expressions or {}
+    update_expressions = update_expressions or {}
+    conflict_updates = [f'{column} = EXCLUDED.{column}' for column in columns if column != key_column]
+    conflict_updates.extend(f'{column} = {expression}' for column, expression in update_expressions.items())
+    pending = {'insert': [], 'update': [], 'delete': []}
+
+    def flush(kind):
+        rows = pending[kind]
+        pending[kind] = []
+        if kind == 'insert':
+            return list(insert_batches(
+                table, columns, rows, batch_size,
+                conflict_columns=[key_column], conflict_updates=conflict_updates,
+                expressions=insert_expressions
+            ))
+        if kind == 'update':
+            return [_update_statements(table, columns, rows, key_column, update_expressions)]
+        return [_delete_statement(table, rows, key_column)]
+
+    for kind, change in changes:
+        if kind == 'delete':
+            # Deletes follow every record; write out the last upserts first
+            for other in ('insert', 'update'):
+                if pending[other]:
+                    yield from flush(other)
+        pending[kind].append(change)
+        if len(pending[kind]) >= batch_size:
+            yield from flush(kind)
+    for kind in ('insert', 'update', 'delete'):
+        if pending[kind]:
+            yield from flush(kind)
@@ -0,0 +1,26 @@
+"""
+Smoke test for the Lacrosse Lab matcher benchmark
+A tiny run must report every field and agree with the exhaustive baseline
+"""
+
+import json
+
+import pytest
+
+from benchmark_lacrosse_lab_matcher import run_benchmark
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_tiny_benchmark(workers):
+    result = json.loads(json.dumps(run_benchmark(40, None, workers, 0, 10000)))
+    assert set(result) == {
+        'rows', 'videos', 'labs', 'matched', 'unmatched', 'wall_seconds', 'scored_pairs',
+        'effective_pairs_per_second', 'cross_product_pairs_per_second', 'peak_memory_mb',
+        'peak_worker_memory_mb', 'baseline'
+    }
+    assert set(result['baseline']) == {'sample_rows', 'pairs', 'pairs_per_second', 'agreement'}
+    assert result['rows'] == 40
+    assert result['matched'] + result['unmatched'] == result['labs']
+    assert result['peak_memory_mb'] > 0
+    if workers > 1:
+        assert result['peak_worker_memory_mb'] > 0
+    assert result['baseline']['agreement'] == 1.0
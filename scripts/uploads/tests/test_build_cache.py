@@ -0,0 +1,68 @@
+"""
+Tests for the content-addressed build cache
+"""
+
+import pytest
+
+import build_cache
+from build_cache import local_sources, run_cached
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_cache, 'BUILD_CACHE_DIR', str(tmp_path / 'cache'))
+    (tmp_path / 'helper.py').write_text('VALUE = 1\n')
+    (tmp_path / 'script.py').write_text('import os\nfrom helper import VALUE\n')
+    (tmp_path / 'input.csv').write_text('ID,Title\n1,Cradle\n')
+    return tmp_path
+
+def make_stage(project, builds):
+    source = project / 'input.csv'
+    output = project / 'output.sql'
+
+    def build():
+        builds.append(1)
+        output.write_text(source.read_text().upper())
+
+    def run(options=None, force=False):
+        return run_cached('stage', str(project / 'script.py'), [str(source)], [str(output)],
+                          build, options=options, force=force)
+    return run, source, output
+
+def test_sources_follow_sibling_imports(project):
+    assert local_sources(str(project / 'script.py')) == sorted([
+        str(project / 'helper.py'), str(project / 'script.py')
+    ])
+
+def test_unchanged_inputs_skip_the_build(project):
+    builds = []
+    run, source, output = make_stage(project, builds)
+    assert run() is True
+    assert run() is False
+    assert builds == [1]
+
+    source.write_text('ID,Title\n1,Dodge\n')
+    assert run() is True
+    assert output.read_text() == 'ID,TITLE\n1,DODGE\n'
+    assert run(options={'batch_size': 7}) is True
+    assert run(options={'batch_size': 7}, force=True) is True
+    assert len(builds) == 4
+
+def test_source_change_rebuilds(project):
+    builds = []
+    run, _, _ = make_stage(project, builds)
+    run()
+    (project / 'helper.py').write_text('VALUE = 2\n')
+    assert run() is True
+    assert len(builds) == 2
+
+def test_changed_or_deleted_outputs_are_restored(project):
+    builds = []
+    run, _, output = make_stage(project, builds)
+    run()
+    output.write_text('edited by hand')
+    assert run() is False
+    assert output.read_text() == 'ID,TITLE\n1,CRADLE\n'
+    output.unlink()
+    assert run() is False
+    assert output.read_text() == 'ID,TITLE\n1,CRADLE\n'
+    assert builds == [1]
@@ -0,0 +1,119 @@
+"""
+Tests for record-aligned CSV chunking
+Rows read chunk by chunk must match a single csv.DictReader pass
+"""
+
+import csv
+import random
+
+import pytest
+
+import csv_chunks
+from csv_chunks import chunk_boundaries, csv_chunk_tasks, map_csv_chunks, read_chunk_rows
+
+def random_field(rng):
+    pieces = ['plain', 'a,b', 'say "hi"', 'line\nbreak', 'crlf\r\nbreak', '""', '', 'é ü', '\n']
+    return ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 4)))
+
+def write_export(path, rows, line_terminator):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, lineterminator=line_terminator)
+        writer.writerow(['ID', 'Title', 'Content'])
+        writer.writerows(rows)
+
+def serial_rows(path):
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
+def collect_rows(rows):
+    return rows
+
+def chunked_rows(path, chunk_bytes, workers=1):
+    tasks = csv_chunk_tasks(path, chunk_bytes)
+    return [row for part in map_csv_chunks(collect_rows, tasks, workers) for row in part]
+
+@pytest.mark.parametrize('line_terminator', ['\n', '\r\n'])
+@pytest.mark.parametrize('chunk_bytes', [1, 50, 333, 10 ** 6])
+def test_chunks_match_serial_read(tmp_path, line_terminator, chunk_bytes):
+    rng = random.Random(chunk_bytes)
+    rows = [[str(i), random_field(rng), random_field(rng)] for i in range(300)]
+    path = str(tmp_path / 'export.csv')
+    write_export(path, rows, line_terminator)
+
+    assert chunked_rows(path, chunk_bytes) == serial_rows(path)
+
+def test_boundaries_skip_quoted_newlines(tmp_path):
+    path = str(tmp_path / 'export.csv')
+    write_export(path, [['1', 'a', 'x\ny'], ['2', 'b', 'z']], '\n')
+    with open(path, 'rb') as f:
+        data = f.read()
+    offsets = chunk_boundaries(path, 1)
+    assert offsets == [data.index(b'\n') + 1, data.index(b'"\n2') + 2, len(data)]
+
+@pytest.mark.parametrize('workers', [1, 2])
+@pytest.mark.parametrize('chunk_bytes', [1, 7, 30, 64])
+def test_quoted_field_straddling_a_seek_point(tmp_path, monkeypatch, workers, chunk_bytes):
+    # The quoted Content holds lines that parse as records of the right
+    # width, so resyncing inside it guesses wrong and the chunk before it
+    # must be read again exactly
+    monkeypatch.setattr(csv_chunks, 'RESYNC_RECORDS', 2)
+    path = str(tmp_path / 'export.csv')
+    write_export(path, [['1', 'a', 'x'], ['2', 'b', 'intro\n5,fake,row\n6,also,fake\n7,more,fake\nend'],
+                        ['3', 'c', 'y'], ['4', 'd', 'z\nw']], '\n')
+    with open(path, 'rb') as f:
+        data = f.read()
+    inside = data.index(b'5,fake')
+    assert inside in chunk_boundaries(path, inside - data.index(b'\n') - 1)
+    assert chunked_rows(path, chunk_bytes, workers) == serial_rows(path)
+    assert chunked_rows(path, inside - data.index(b'\n') - 1, workers) == serial_rows(path)
+
+def test_chunk_end_check(tmp_path):
+    path = str(tmp_path / 'export.csv')
+    write_export(path, [['1', 'a', 'x\ny'], ['2', 'b', 'z']], '\n')
+    with open(path, 'rb') as f:
+        data = f.read()
+    fieldnames = ['ID', 'Title', 'Content']
+    start = data.index(b'\n') + 1
+    assert read_chunk_rows(path, fieldnames, start, data.index(b'y"') , check_end=True) is None
+    assert read_chunk_rows(path, fieldnames, start, data.index(b'2,'), check_end=True) == \
+        [{'ID': '1', 'Title': 'a', 'Content': 'x\ny'}]
+    assert read_chunk_rows(path, fieldnames, start, start, check_end=True) == []
+
+@pytest.mark.parametrize('chunk_bytes', [1, 20, 10 ** 6])
+def test_stray_quotes_in_unquoted_fields(tmp_path, chunk_bytes):
+    # A quote-parity scan would think the 6" opens a quoted field and split
+    # inside the quoted Content of the next record
+    path = str(tmp_path / 'export.csv')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('ID,Title,Content\n1,6" stick,plain\n2,Clear,"line\nbreak"\n3,Ride,"a ""b"""\n'
+                '4,12" pocket,x\n5,Dodge,"more\nlines\nhere"\n')
+
+    chunked = chunked_rows(path, chunk_bytes)
+    assert chunked == serial_rows(path)
+    assert [row['ID'] for row in chunked] == ['1', '2', '3', '4', '5']
+
+def test_header_only_export(tmp_path):
+    path = str(tmp_path / 'export.csv')
+    write_export(path, [], '\n')
+    assert csv_chunk_tasks(path, 1) == []
+
+def test_pool_returns_chunks_in_order(tmp_path):
+    rng = random.Random(7)
+    rows = [[str(i), random_field(rng), random_field(rng)] for i in range(200)]
+    path = str(tmp_path / 'export.csv')
+    write_export(path, rows, '\n')
+
+    tasks = csv_chunk_tasks(path, 200)
+    assert len(tasks) > 4
+    merged = [row for part in map_csv_chunks(collect_rows, tasks, 3) for row in part]
+    assert merged == serial_rows(path)
+
+def test_timed_results_count_rows(tmp_path):
+    path = str(tmp_path / 'export.csv')
+    write_export(path, [[str(i), 'title', 'x\ny'] for i in range(50)], '\n')
+
+    tasks = csv_chunk_tasks(path, 100)
+    timed = list(map_csv_chunks(collect_rows, tasks, 1, timed=True))
+    assert [rows for rows, _, _ in timed] == list(map_csv_chunks(collect_rows, tasks, 1))
+    assert sum(count for _, count, _ in timed) == 50
+    assert all(seconds >= 0 for _, _, seconds in timed)
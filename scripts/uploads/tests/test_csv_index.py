@@ -0,0 +1,86 @@
+"""
+Tests for ID lookups through the sidecar offset index
+Rows read by ID must match what a full csv.DictReader pass returns
+"""
+
+import csv
+import random
+
+import pytest
+
+import csv_index
+from csv_index import build_row_index, index_path, load_row_index, read_rows_by_id
+
+def write_export(path, rows, line_terminator='\n'):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, lineterminator=line_terminator)
+        writer.writerow(['ID', 'Title', 'Content'])
+        writer.writerows(rows)
+
+def serial_rows(path):
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return {row['ID']: row for row in csv.DictReader(f)}
+
+@pytest.mark.parametrize('line_terminator', ['\n', '\r\n'])
+def test_lookups_match_serial_read(tmp_path, line_terminator):
+    rng = random.Random(3)
+    pieces = ['plain', 'a,b', 'say "hi"', 'line\nbreak', 'crlf\r\nbreak', 'é ü', '']
+    rows = [[str(100 + i), rng.choice(pieces), ''.join(rng.choice(pieces) for _ in range(3))] for i in range(200)]
+    path = str(tmp_path / 'export.csv')
+    write_export(path, rows, line_terminator)
+
+    expected = serial_rows(path)
+    wanted = ['150', 100, '299', '7']
+    assert read_rows_by_id(path, wanted) == {str(key): expected[str(key)] for key in wanted if str(key) in expected}
+    assert read_rows_by_id(path, list(expected)) == expected
+
+def test_stray_quotes_in_unquoted_fields(tmp_path):
+    path = str(tmp_path / 'export.csv')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('ID,Title,Content\n1,6" stick,plain\n2,"quoted\nline",x\n3,last,"a ""b"""\n')
+    assert read_rows_by_id(path, ['1', '2', '3']) == serial_rows(path)
+
+def test_index_is_reused_until_the_export_changes(tmp_path, monkeypatch):
+    path = str(tmp_path / 'export.csv')
+    write_export(path, [['1', 'Cradle', ''], ['2', 'Dodge', '']])
+    assert build_row_index(path)['count'] == 2
+    with open(index_path(path), 'rb') as f:
+        assert f.read(len(csv_index.INDEX_MAGIC)) == csv_index.INDEX_MAGIC
+
+    def no_rebuild(*args):
+        raise AssertionError('index rebuilt')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(csv_index, 'build_row_index', no_rebuild)
+        assert read_rows_by_id(path, [2])['2']['Title'] == 'Dodge'
+
+    write_export(path, [['1', 'Cradle', ''], ['2', 'Dodge', ''], ['3', 'Shoot', '']])
+    assert read_rows_by_id(path, [3])['3']['Title'] == 'Shoot'
+    header, _, table = load_row_index(path)
+    table.close()
+    assert header['count'] == 3
+
+def test_unreadable_sidecar_is_rebuilt(tmp_path):
+    path = str(tmp_path / 'export.csv')
+    write_export(path, [['1', 'Cradle', '']])
+    with open(index_path(path), 'wb') as f:
+        f.write(b'{"version": 1}')
+    assert read_rows_by_id(path, ['1'])['1']['Title'] == 'Cradle'
+
+def test_shared_hashes_fall_back_to_the_key(tmp_path, monkeypatch):
+    # Every key hashes alike, so each lookup walks all entries and must
+    # pick its record by the key itself, the first of a repeated key
+    monkeypatch.setattr(csv_index, 'key_hash', lambda value: 7)
+    path = str(tmp_path / 'export.csv')
+    write_export(path, [['1', 'Cradle', ''], ['2', 'Dodge', ''], ['1', 'Repeat', ''], ['', 'Blank', '']])
+    rows = read_rows_by_id(path, ['2', '1', '9'])
+    assert list(rows) == ['2', '1']
+    assert rows['1']['Title'] == 'Cradle'
+    assert rows['2']['Title'] == 'Dodge'
+
+def test_missing_key_column(tmp_path):
+    path = str(tmp_path / 'export.csv')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('Title,Content\nCradle,x\n')
+    with pytest.raises(KeyError):
+        read_rows_by_id(path, ['1'])
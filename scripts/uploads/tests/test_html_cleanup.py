@@ -0,0 +1,49 @@
+"""
+Tests for the shared HTML and shortcode cleanup
+"""
+
+import re
+
+from html_cleanup import clean_html
+
+def sequential_clean(text, shortcodes=True, collapse_whitespace=True):
+    """The per-script regex passes clean_html replaced"""
+    text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
+    text = re.sub(r'<[^>]+>', '', text)
+    if shortcodes:
+        text = re.sub(r'\[.*?\]', '', text)
+    if collapse_whitespace:
+        text = ' '.join(text.split())
+    return text.strip()
+
+SAMPLES = [
+    '',
+    '<p>Complete <strong>5</strong> workouts</p>',
+    '<!-- wp:paragraph {"a": "<b>"} -->\n<p>Hip Hitter</p>\n<!-- /wp:paragraph -->',
+    '[gamipress_achievement id="12"]Earn it[/gamipress_achievement] today',
+    '<a href="[link]">Go</a>  \n\t now',
+    '[unclosed\n] stays',
+    '<div\nclass="x">Line one\n\nLine two</div>',
+]
+
+def test_matches_sequential_passes():
+    for text in SAMPLES:
+        assert clean_html(text) == sequential_clean(text)
+        assert clean_html(text, shortcodes=False) == sequential_clean(text, shortcodes=False)
+        assert clean_html(text, shortcodes=False, collapse_whitespace=False) == \
+            sequential_clean(text, shortcodes=False, collapse_whitespace=False)
+
+def test_decodes_entities_as_text():
+    assert clean_html('To Unlock&nbsp;Complete &amp; Submit') == 'To Unlock Complete & Submit'
+    assert clean_html('&lt;b&gt;bold&lt;/b&gt; &#8217; &#x2014;') == '<b>bold</b> ’ —'
+    assert clean_html('a &nbsp; &nbsp; b') == 'a b'
+    assert clean_html('AT&T &unknown; &') == 'AT&T &unknown; &'
+
+def test_keeps_line_breaks_without_collapse():
+    assert clean_html('<p>One</p>\n<p>Two&nbsp;</p>', collapse_whitespace=False) == 'One\nTwo'
+
+def test_repeated_blocks_hit_the_cache():
+    clean_html.cache_clear()
+    for _ in range(3):
+        clean_html('<p>Repeated requirement</p>')
+    assert clean_html.cache_info().hits == 2
@@ -0,0 +1,66 @@
+"""
+Tests for the one-to-one assignment of lab rows to video rows
+The augmenting-path solver must reach the brute-force maximum total score
+"""
+
+import random
+
+import pytest
+
+from lab_match_assignment import assign_one_to_one, greedy_choices
+
+def brute_force_best(edges_by_row):
+    """Highest total score over every one-to-one assignment, by exhaustive search"""
+    def best_from(row, taken):
+        if row == len(edges_by_row):
+            return 0.0
+        best = best_from(row + 1, taken)
+        for position, score in edges_by_row[row]:
+            if position not in taken:
+                best = max(best, score + best_from(row + 1, taken | {position}))
+        return best
+    return best_from(0, frozenset())
+
+def random_graph(rng, rows, videos, density, integer_scores):
+    edges_by_row = []
+    for _ in range(rows):
+        positions = [position for position in range(videos) if rng.random() < density]
+        edges_by_row.append([
+            (position, float(rng.randint(50, 60)) if integer_scores else rng.uniform(50, 100))
+            for position in positions
+        ])
+    return edges_by_row
+
+def assignment_total(edges_by_row, assignment):
+    positions = [position for position in assignment if position is not None]
+    assert len(positions) == len(set(positions)), 'a video was assigned twice'
+    total = 0.0
+    for edges, position in zip(edges_by_row, assignment):
+        if position is not None:
+            scores = dict(edges)
+            assert position in scores, 'assigned a video the row has no edge to'
+            total += scores[position]
+    return total
+
+@pytest.mark.parametrize('integer_scores', [False, True])
+def test_matches_brute_force_on_random_graphs(integer_scores):
+    rng = random.Random(11 + integer_scores)
+    for _ in range(400):
+        edges_by_row = random_graph(rng, rng.randint(1, 7), rng.randint(1, 6), rng.uniform(0.2, 0.9),
+                                    integer_scores)
+        assignment, greedy = assign_one_to_one(edges_by_row)
+        assert greedy == greedy_choices(edges_by_row)
+        assert assignment_total(edges_by_row, assignment) == pytest.approx(brute_force_best(edges_by_row))
+
+def test_uncontested_rows_keep_their_greedy_choice():
+    edges_by_row = [[(0, 90.0), (1, 80.0)], [(1, 70.0)], [], [(2, 55.0)]]
+    assignment, greedy = assign_one_to_one(edges_by_row)
+    assert greedy == [0, 1, None, 2]
+    assert assignment == greedy
+
+def test_contested_video_goes_where_the_total_is_highest():
+    # Both rows prefer video 0; row 1 has nowhere else to go
+    edges_by_row = [[(0, 90.0), (1, 85.0)], [(0, 88.0)]]
+    assignment, greedy = assign_one_to_one(edges_by_row)
+    assert greedy == [0, 0]
+    assert assignment == [1, 0]
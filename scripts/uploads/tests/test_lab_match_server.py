@@ -0,0 +1,110 @@
+"""
+Tests for the Lacrosse Lab match server, run on a free local port
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from lab_match_server import MatchRequestHandler, MatchService
+
+VIDEO_ROWS = [
+    {'Id': '11', 'name': '2-3-1 Motion Offense', 'type': 'Offense', 'Content': 'Ball movement around the 2-3-1'},
+    {'Id': '12', 'name': 'Clearing Patterns', 'type': 'Transition', 'Content': 'Clearing against a ride'},
+    {'Id': '13', 'name': 'Man Down Defense', 'type': 'Defense', 'Content': 'Rotations when a man down'},
+]
+
+@pytest.fixture(scope='module')
+def address():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), MatchRequestHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def server(address):
+    """The server's URL, answering from a fresh service for each test"""
+    MatchRequestHandler.service = MatchService(VIDEO_ROWS)
+    yield address
+    MatchRequestHandler.service = None
+
+def request(url, payload=None, body=None):
+    """(status, JSON response) for a GET, or a POST of payload or raw body"""
+    if payload is not None:
+        body = json.dumps(payload).encode('utf-8')
+    req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def test_health(server):
+    status, body = request(server + '/health')
+    assert status == 200
+    assert body['videos'] == 3
+    assert body['scoring'] == MatchRequestHandler.service.scoring
+
+def test_match_accepts_rows_list_or_single_row(server):
+    status, body = request(server + '/match', {'rows': [
+        {'name': 'Clearing Patterns', 'folderPath': 'Transition'},
+        {'name': ''},
+    ]})
+    assert status == 200
+    assert [(r['Id'], r['accepted']) for r in body['results']] == [('12', True)]
+
+    status, body = request(server + '/match', {'name': '2-3-1 Motion Offense'})
+    assert status == 200 and body['results'][0]['Id'] == '11'
+    status, body = request(server + '/match', [{'name': 'Man Down Defense'}])
+    assert status == 200 and body['results'][0]['Id'] == '13'
+
+def test_reload_applies_deltas(server):
+    status, body = request(server + '/reload', {
+        'upsert': [{'Id': '14', 'name': 'Ride Schemes', 'type': 'Transition', 'Content': ''}],
+        'delete': ['12'],
+    })
+    assert status == 200
+    assert (body['removed'], body['added'], body['videos']) == (1, 1, 3)
+
+    _, body = request(server + '/match', {'name': 'Ride Schemes'})
+    assert body['results'][0]['Id'] == '14'
+    _, body = request(server + '/match', {'name': 'Clearing Patterns'})
+    assert body['results'][0]['Id'] != '12'
+
+def test_reload_rebuilds_from_video_csv(server, tmp_path):
+    path = tmp_path / 'videos.csv'
+    path.write_text('Id,name,type,Content\n21,Faceoff Wing Play,Faceoff,\n,No Id,,\n', encoding='utf-8')
+    status, body = request(server + '/reload', {'video_csv': str(path)})
+    assert status == 200
+    assert body['rebuilt'] is True and body['videos'] == 1
+
+@pytest.mark.parametrize('path, payload', [
+    ('/match', 'Clearing Patterns'),
+    ('/match', ['Clearing Patterns']),
+    ('/match', {'rows': {'name': 'Clearing Patterns'}}),
+    ('/match', {'rows': [{'name': 42}]}),
+    ('/reload', []),
+    ('/reload', {'upsert': {'Id': '1'}}),
+    ('/reload', {'upsert': ['1']}),
+    ('/reload', {'delete': '12'}),
+    ('/reload', {'video_csv': 7}),
+    ('/reload', {'video_csv': '/no/such/videos.csv'}),
+])
+def test_bad_input_is_rejected(server, path, payload):
+    status, body = request(server + path, payload)
+    assert status == 400
+    assert body['error']
+    # The service is untouched and still answering
+    assert request(server + '/health')[1]['videos'] == 3
+
+def test_invalid_json_and_unknown_endpoints(server):
+    status, body = request(server + '/match', body=b'{not json')
+    assert status == 400 and body['error'].startswith('Invalid JSON')
+    assert request(server + '/nowhere', {})[0] == 404
+    assert request(server + '/nowhere')[0] == 404
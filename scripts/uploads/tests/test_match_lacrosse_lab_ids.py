@@ -0,0 +1,185 @@
+"""
+Tests for the Lacrosse Lab matcher
+Blocked, pruned, parallel and incremental matching must all agree with an
+exhaustive score_features scan over the whole Video Sheet
+"""
+
+import random
+import re
+
+import pytest
+
+from match_lacrosse_lab_ids import (
+    MATCH_THRESHOLD, TYPE_MAPPINGS, best_video_match, build_match_context, candidate_indices,
+    compile_term_matcher, extract_key_terms, lab_features, load_term_vocabulary, match_lab_rows,
+    match_lab_rows_incremental, match_lab_rows_one_to_one, overlapping_terms, score_features,
+    stream_top_k, top_video_matches
+)
+
+WORDS = ['motion', 'offense', 'zone', 'defense', 'clear', 'ride', 'dodge', 'pick', 'wheel', 'swing',
+         'rotation', 'fast break', 'man up', 'man down', 'face off', 'slide', 'crease', 'wing',
+         'alley', 'hopkins', 'duke', 'invert', 'stack', 'split', 'triangle', 'box', 'corner',
+         '2-3-1', '1-4-1', 'adjacent', 'help', 'skip', 'pass']
+
+SCORINGS = [
+    None,
+    {'name': 'levenshtein'},
+    {'content': 'minhash'},
+    {'name': 'levenshtein', 'content': 'minhash'},
+]
+
+def typo(rng, text):
+    position = rng.randrange(len(text))
+    return text[:position] + rng.choice('aeiourst') + text[position + 1:]
+
+def make_corpus(seed, videos=120, labs=150):
+    """Video rows and lab rows built from a shared vocabulary, so lab rows
+    range from exact copies through near misses to unrelated names"""
+    rng = random.Random(seed)
+    video_data = []
+    for i in range(videos):
+        if video_data and rng.random() < 0.1:
+            name = rng.choice(video_data)['name']
+        else:
+            name = ' '.join(rng.sample(WORDS, rng.randint(2, 4))).title()
+        video_data.append({
+            'Id': str(1000 + i),
+            'name': name,
+            'type': ';'.join(rng.sample(list(TYPE_MAPPINGS), rng.randint(0, 2))),
+            'Content': ' '.join(rng.sample(WORDS, rng.randint(0, 6))),
+        })
+
+    lab_data = []
+    for i in range(labs):
+        video_row = rng.choice(video_data)
+        words = video_row['name'].split()
+        variant = rng.randrange(5)
+        if variant == 0:
+            name = video_row['name']
+        elif variant == 1 and len(words) > 2:
+            name = ' '.join(words[:-1])
+        elif variant == 2:
+            name = typo(rng, video_row['name'])
+        elif variant == 3:
+            name = ' '.join(words[::-1])
+        else:
+            name = ' '.join(rng.sample(WORDS, 3)).title()
+        lab_data.append({
+            'name': name,
+            'folderPath': rng.choice(rng.choice(list(TYPE_MAPPINGS.values()))) + f'Lab {i}',
+            'description': rng.choice(['', video_row['Content'], ' '.join(rng.sample(WORDS, 4))]),
+        })
+    return video_data, lab_data
+
+def exhaustive_scores(context, lab_row):
+    lab = lab_features(lab_row, context['scoring'])
+    return [score_features(video, lab) for video in context['videos']]
+
+def exhaustive_best(scores):
+    """(position, score) of the first highest-scoring video row"""
+    best_position, best_score = None, 0
+    for position, score in enumerate(scores):
+        if score > best_score:
+            best_position, best_score = position, score
+    return best_position, best_score
+
+@pytest.mark.parametrize('scoring', SCORINGS)
+def test_best_match_equals_exhaustive_scan(scoring):
+    video_data, lab_data = make_corpus(5)
+    context = build_match_context(video_data, scoring)
+    near_threshold = 0
+    for lab_row in lab_data:
+        scores = exhaustive_scores(context, lab_row)
+        expected = exhaustive_best(scores)
+        near_threshold += MATCH_THRESHOLD - 5 <= expected[1] < MATCH_THRESHOLD + 5
+
+        lab = lab_features(lab_row, context['scoring'])
+        found = best_video_match(context['videos'], context['index'], lab)
+        if expected[1] >= MATCH_THRESHOLD:
+            assert found == expected, lab_row['name']
+        else:
+            assert found[1] < MATCH_THRESHOLD
+        # Without a floor, pruning finds the exact best among the blocked candidates
+        candidates = set(candidate_indices(context['index'], lab))
+        blocked = [score if position in candidates else 0 for position, score in enumerate(scores)]
+        found = best_video_match(context['videos'], context['index'], lab, min_score=0)
+        assert found == exhaustive_best(blocked)
+    # The corpus exercises pruning right around the acceptance threshold
+    assert near_threshold >= 10
+
+@pytest.mark.parametrize('scoring', SCORINGS)
+def test_top_k_equals_exhaustive_ranking(scoring):
+    video_data, lab_data = make_corpus(6, labs=60)
+    context = build_match_context(video_data, scoring)
+    for lab_row in lab_data:
+        scores = exhaustive_scores(context, lab_row)
+        ranked = sorted((position for position, score in enumerate(scores) if score >= MATCH_THRESHOLD),
+                        key=lambda position: (-scores[position], position))
+        lab = lab_features(lab_row, context['scoring'])
+        for k in (1, 3):
+            found = top_video_matches(context['videos'], context['index'], lab, k)
+            assert found == [(position, scores[position]) for position in ranked[:k]], lab_row['name']
+
+def test_parallel_runs_match_sequential():
+    video_data, lab_data = make_corpus(7)
+    assert match_lab_rows(video_data, lab_data, workers=2) == match_lab_rows(video_data, lab_data)
+    assert match_lab_rows_one_to_one(video_data, lab_data, workers=2) == \
+        match_lab_rows_one_to_one(video_data, lab_data)
+    assert list(stream_top_k(video_data, iter(lab_data), 3, workers=2)) == \
+        list(stream_top_k(video_data, lab_data, 3))
+
+def test_incremental_runs_match_a_fresh_run(tmp_path):
+    state_path = str(tmp_path / 'state.json')
+    video_data, lab_data = make_corpus(8)
+    matches, unmatched, stats = match_lab_rows_incremental(video_data, lab_data, state_path)
+    assert (matches, unmatched) == match_lab_rows(video_data, lab_data)
+    assert stats['labs_rescored'] == len(lab_data)
+
+    # An unchanged rerun reuses every lab row
+    assert match_lab_rows_incremental(video_data, lab_data, state_path)[2]['labs_reused'] == len(lab_data)
+
+    # Drop, edit and append video rows and edit a few lab rows
+    more_videos, more_labs = make_corpus(9, videos=15, labs=5)
+    for i, video_row in enumerate(more_videos):
+        video_row['Id'] = str(5000 + i)
+    video_data = video_data[:10] + video_data[11:] + more_videos
+    video_data[20] = dict(video_data[20], name=video_data[20]['name'] + ' Drill')
+    lab_data = lab_data[:-5] + more_labs
+
+    matches, unmatched, stats = match_lab_rows_incremental(video_data, lab_data, state_path, workers=2)
+    assert (matches, unmatched) == match_lab_rows(video_data, lab_data)
+    assert stats['videos_added'] == 16 and stats['videos_removed'] == 2
+    assert 0 < stats['labs_reused'] < len(lab_data)
+
+def per_pattern_terms(vocabulary, text):
+    """Key terms as the original loop found them: one findall per term"""
+    patterns = [r'\b' + pattern + r'\b' for pattern in vocabulary['patterns']]
+    patterns += [r'\b' + re.escape(term) + r'\b' for term in vocabulary['terms']]
+    found = set()
+    for pattern in patterns:
+        found.update(re.findall(pattern, text.lower()))
+    return found
+
+def test_term_alternation_equals_per_pattern_search():
+    vocabulary = load_term_vocabulary()
+    pieces = vocabulary['terms'] + ['1-4-1', '2-3-1-4', '10-4-1', 'man', 'up', 'face', 'off', 'state',
+                                    'Penn', 'UNC\'s', 'ducks', 'clearing', '-', '_', '/', ',', '.', '']
+    adversarial = [
+        'man up man down', 'Man-Up/Man-Down', 'faceoff face off face-off', '1-2-3-4-5', '1-4-1-4-1',
+        'penn state penn', 'setplay set play set  play', 'ride_clear ride', 'zone2-3-1', 'okeefe\'s wheel',
+    ]
+    rng = random.Random(11)
+    texts = adversarial + [
+        rng.choice(['', ' ']).join(rng.choice(pieces) for _ in range(rng.randint(1, 8)))
+        for _ in range(2000)
+    ]
+    for text in texts:
+        assert extract_key_terms(text) == per_pattern_terms(vocabulary, text), text
+
+def test_vocabulary_has_no_overlapping_terms():
+    assert overlapping_terms(load_term_vocabulary()['terms']) == []
+    assert overlapping_terms(['man up', 'man', 'set play', 'play action']) == [
+        ('man up', 'man'), ('set play', 'play action')
+    ]
+    with pytest.raises(ValueError, match='man up'):
+        compile_term_matcher({'patterns': [], 'terms': ['man up', 'man']})
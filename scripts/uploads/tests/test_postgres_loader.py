@@ -0,0 +1,129 @@
+"""
+Tests for the direct Postgres loader
+Database tests run against a throwaway Postgres named by POWLAX_TEST_DSN,
+e.g. postgresql://postgres@localhost/powlax_test, using session temp tables
+"""
+
+import csv
+import os
+
+import pytest
+
+from badges_upload import BADGE_CATEGORIES
+from postgres_loader import badge_records, load_records, rank_records
+from ranks_upload import RANK_COLUMNS, RANK_CONFLICT_UPDATES
+from skills_academy_upload import DRILL_COLUMNS
+
+TEST_DSN = os.environ.get('POWLAX_TEST_DSN')
+
+DRILLS = [
+    [1, 'Tab\there', '111', ['Offense (with ball)', 'Say "hi"'], [], {'do_it': {'min': 6}},
+     'Back\\slash', 'foundation', 'Line\nbreak', 5, {'lax_credit': 1}, ['Skills-Academy']],
+    [2, "O'Neil", None, ['a,b', '{braces}'], ['Goal'], {}, None, None, '', None, {}, ['\\.']],
+    [3, 'Third', '333', ['NULL'], ['Cones'], {'own_it': None}, '', 'advanced', None, 10, {}, []],
+]
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql):
+        self.connection.log.append(('execute', sql.split('\n')[0]))
+
+    def copy_expert(self, sql, buffer):
+        self.connection.log.append(('copy', sql, buffer.read().count('\n')))
+
+class FakeConnection:
+    def __init__(self):
+        self.log = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.log.append(('commit',))
+
+    def rollback(self):
+        self.log.append(('rollback',))
+
+def test_commits_each_chunk():
+    connection = FakeConnection()
+    rows, _ = load_records(connection, 'skills_academy_drills', DRILL_COLUMNS, iter(DRILLS), chunk_size=2)
+    assert rows == 3
+    assert [entry[0] for entry in connection.log] == ['copy', 'commit', 'copy', 'commit']
+    assert [entry[2] for entry in connection.log if entry[0] == 'copy'] == [2, 1]
+
+def test_upsert_goes_through_staging():
+    connection = FakeConnection()
+    ranks = [[10, 'Rookie', 'rookie', None, None, 1, None, {}]]
+    load_records(connection, 'player_ranks', RANK_COLUMNS, ranks,
+                 conflict_columns=['original_id'], conflict_updates=RANK_CONFLICT_UPDATES)
+    assert connection.log[0][1].startswith('CREATE TEMP TABLE player_ranks_staging')
+    assert connection.log[1][1].startswith('COPY player_ranks_staging (')
+    assert connection.log[2][1].startswith('INSERT INTO player_ranks (')
+    assert connection.log[3] == ('commit',)
+
+def write_export(path, rows):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['ID', 'Title', 'Content', 'Order'])
+        writer.writeheader()
+        writer.writerows(rows)
+
+def test_badge_records_follow_category_order(tmp_path):
+    expected = []
+    for number, filename in enumerate(BADGE_CATEGORIES.values()):
+        rows = [{'ID': str(number * 100 + i), 'Title': f'Badge {i}', 'Content': 'Line\nbreak', 'Order': ''}
+                for i in range(20)]
+        write_export(str(tmp_path / filename), rows)
+        expected.extend(number * 100 + i for i in range(20))
+    for workers in (1, 2):
+        assert [record[0] for record in badge_records(str(tmp_path), workers)] == expected
+
+def test_rank_records_are_in_rank_order(tmp_path):
+    path = str(tmp_path / 'ranks.csv')
+    write_export(path, [{'ID': '12', 'Title': 'Captain', 'Content': '', 'Order': '3'},
+                        {'ID': '10', 'Title': 'Rookie', 'Content': '', 'Order': '1'},
+                        {'ID': '11', 'Title': 'Starter', 'Content': '', 'Order': '2'}])
+    assert [(record[0], record[5]) for record in rank_records(path)] == [(10, 1), (11, 2), (12, 3)]
+
+@pytest.fixture
+def connection():
+    if not TEST_DSN:
+        pytest.skip('POWLAX_TEST_DSN is not set')
+    psycopg2 = pytest.importorskip('psycopg2')
+    connection = psycopg2.connect(TEST_DSN)
+    cursor = connection.cursor()
+    cursor.execute("""
+CREATE TEMP TABLE skills_academy_drills (
+    original_id INTEGER, title TEXT, vimeo_id TEXT, drill_category TEXT[],
+    equipment_needed TEXT[], age_progressions JSONB, space_needed TEXT,
+    complexity TEXT, sets_and_reps TEXT, duration_minutes INTEGER,
+    point_values JSONB, tags TEXT[], created_at TIMESTAMP DEFAULT NOW()
+);
+CREATE TEMP TABLE player_ranks (
+    original_id INTEGER UNIQUE, title TEXT, slug TEXT, description TEXT,
+    excerpt TEXT, rank_order INTEGER, image_url TEXT, metadata JSONB,
+    created_at TIMESTAMP DEFAULT NOW(), updated_at TIMESTAMP DEFAULT NOW()
+);
+""")
+    connection.commit()
+    yield connection
+    connection.close()
+
+def test_copy_round_trip(connection):
+    rows, _ = load_records(connection, 'skills_academy_drills', DRILL_COLUMNS, iter(DRILLS), chunk_size=2)
+    assert rows == 3
+    cursor = connection.cursor()
+    cursor.execute(f"SELECT {', '.join(DRILL_COLUMNS)} FROM skills_academy_drills ORDER BY original_id")
+    assert [list(row) for row in cursor.fetchall()] == DRILLS
+
+def test_upsert_updates_existing_rows(connection):
+    ranks = [[10, 'Rookie', 'rookie', None, None, 1, None, {}],
+             [11, 'Starter', 'starter', 'Desc', None, 2, None, {'a': '1'}]]
+    load_records(connection, 'player_ranks', RANK_COLUMNS, ranks,
+                 conflict_columns=['original_id'], conflict_updates=RANK_CONFLICT_UPDATES)
+    load_records(connection, 'player_ranks', RANK_COLUMNS, [[10, 'Rookie II', 'rookie', None, None, 3, None, {}]],
+                 conflict_columns=['original_id'], conflict_updates=RANK_CONFLICT_UPDATES)
+    cursor = connection.cursor()
+    cursor.execute("SELECT original_id, title, rank_order FROM player_ranks ORDER BY original_id")
+    assert cursor.fetchall() == [(10, 'Rookie II', 3), (11, 'Starter', 2)]
@@ -0,0 +1,186 @@
+"""
+Parity tests for the compiled Skills Academy category parser
+The legacy if/elif parsers are kept here verbatim as the reference
+"""
+
+import csv
+import os
+import random
+import re
+
+import pytest
+
+from skills_academy_categories import (
+    drill_points_and_tags,
+    scan_categories,
+    workout_points,
+    workout_tags,
+    workout_type,
+)
+
+EXPORT_CSV = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    '..', '..', '..', 'docs', "Wordpress CSV's", 'Quizzes-Workouts-Export-2025-July-31-0920.csv'
+)
+
+def legacy_parse_points_and_tags(categories_str, tags_str):
+    points = {}
+    tags = []
+    if categories_str:
+        parts = categories_str.split('|')
+        for part in parts:
+            part = part.strip()
+            if 'Lax Credit' in part:
+                match = re.search(r'(\w+)\s+Lax Credits?', part, re.IGNORECASE)
+                if match:
+                    points['lax_credit'] = 1 if match.group(1).lower() == 'one' else int(match.group(1)) if match.group(1).isdigit() else 0
+                else:
+                    match = re.search(r'(\d+)\s+Lax Credits?', part, re.IGNORECASE)
+                    points['lax_credit'] = int(match.group(1)) if match else 1
+            elif 'Midfield Medal' in part:
+                match = re.search(r'(\w+)\s+Midfield Medal', part)
+                points['midfield_medal'] = 1 if match and match.group(1).lower() == 'one' else 0
+            elif 'Defense Dollar' in part:
+                match = re.search(r'(\w+)\s+Defense Dollar', part)
+                points['defense_dollar'] = 1 if match and match.group(1).lower() == 'one' else 0
+            elif 'Attack Token' in part:
+                match = re.search(r'(\w+)\s+Attack Token', part)
+                points['attack_token'] = 1 if match and match.group(1).lower() == 'one' else 0
+            elif 'Rebound Reward' in part:
+                match = re.search(r'(\w+)\s+Rebound Reward', part)
+                points['rebound_reward'] = 1 if match and match.group(1).lower() == 'one' else 0
+            elif 'Wall Ball' in part:
+                match = re.search(r'Wall Ball\s*(\d+)', part)
+                if match:
+                    points['rebound_reward'] = int(match.group(1))
+                    tags.append('wall-ball')
+            elif 'Flex Points' in part:
+                match = re.search(r'Flex Points.*?(\d+)', part)
+                points['flex_points'] = int(match.group(1)) if match else 0
+            else:
+                tags.append(part)
+    if tags_str:
+        tag_parts = [t.strip() for t in tags_str.split('|')]
+        tags.extend(tag_parts)
+    if 'Skills-Academy' not in tags:
+        tags.append('Skills-Academy')
+    return points, tags
+
+def legacy_extract_workout_type(title, categories):
+    title_lower = title.lower()
+    if 'wall ball' in title_lower:
+        return 'wall_ball'
+    elif 'attack' in title_lower or 'Attack Drills>Attack' in categories:
+        return 'attack'
+    elif 'defense' in title_lower:
+        return 'defense'
+    elif 'midfield' in title_lower or 'midfielder' in title_lower:
+        return 'midfield'
+    elif 'self-guided' in title_lower:
+        return 'flex'
+    else:
+        return 'general'
+
+def legacy_parse_workout_points(categories_str, workout_type, duration):
+    points = {}
+    if categories_str:
+        if 'Flex Points' in categories_str:
+            match = re.search(r'Flex Points[>\s]*(\d+)', categories_str)
+            points['flex_points'] = int(match.group(1)) if match else 0
+        if 'Lax Credits' in categories_str or 'Lacrosse Player Points' in categories_str:
+            match = re.search(r'(\d+)\s*Lax Credits?', categories_str)
+            points['lax_credit'] = int(match.group(1)) if match else 0
+        if 'Wall Ball' in categories_str:
+            match = re.search(r'Wall Ball\s*(\d+)', categories_str)
+            points['rebound_reward'] = int(match.group(1)) if match else (duration or 0)
+        if 'Attack' in categories_str:
+            match = re.search(r'Attack\s*(\d+)', categories_str)
+            if match:
+                points['attack_token'] = int(match.group(1)) // 5
+    if workout_type == 'wall_ball' and 'rebound_reward' not in points:
+        points['rebound_reward'] = duration or 5
+    return points
+
+def legacy_parse_workout_tags(tags_str, categories_str, title):
+    tags = []
+    if tags_str:
+        tags.extend([t.strip() for t in tags_str.split('|')])
+    if categories_str:
+        badge_patterns = [
+            'Foundation Ace', 'Dominant Dodger', 'Stamina Star', 'Finishing Phenom',
+            'Bullet Snatcher', 'Long Pole Lizard', 'Wall Ball Hawk', 'The Wall Wizard',
+            'Independent Improver'
+        ]
+        for badge in badge_patterns:
+            if badge in categories_str:
+                tags.append(badge.lower().replace(' ', '-'))
+        if 'Long Workout' in categories_str:
+            tags.append('long-workout')
+        elif '10 Drill Workout' in categories_str:
+            tags.append('10-drill-workout')
+        elif '5 Drill Workout' in categories_str:
+            tags.append('5-drill-workout')
+    if 'Skills-Academy' not in tags:
+        tags.append('Skills-Academy')
+    return list(set(tags))
+
+def assert_parity(title, categories, tags_str, duration):
+    assert drill_points_and_tags(categories, tags_str) == legacy_parse_points_and_tags(categories, tags_str)
+
+    scan = scan_categories(categories)
+    wtype = workout_type(title, scan)
+    assert wtype == legacy_extract_workout_type(title, categories)
+    assert workout_points(scan, wtype, duration) == legacy_parse_workout_points(categories, wtype, duration)
+    assert sorted(workout_tags(tags_str, scan)) == sorted(legacy_parse_workout_tags(tags_str, categories, title))
+
+def export_rows():
+    if not os.path.exists(EXPORT_CSV):
+        return []
+    with open(EXPORT_CSV, 'r', encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
+@pytest.mark.skipif(not os.path.exists(EXPORT_CSV), reason='Quizzes-Workouts-Export not available')
+def test_export_rows_match_legacy_parsers():
+    for row in export_rows():
+        title = row.get('Title', '').strip()
+        match = re.search(r'(\d+)\s*[Mm]inute', title)
+        assert_parity(
+            title,
+            row.get('Quiz / Workout Categories', ''),
+            row.get('Quiz / Workout Tags', ''),
+            int(match.group(1)) if match else None
+        )
+
+@pytest.mark.parametrize('categories', [
+    '',
+    '|',
+    'a||b',
+    ' Academy Points>One Lax Credit | Two Midfield Medal ',
+    'Lax Credit',
+    '5 lax credits and Lax Credit',
+    'Points>x7 Lax Credit',
+    '1 Midfield Medal|one Defense Dollar|ONE Attack Token|Three Rebound Reward',
+    'Wall Ball 10|Wall Ball Hawk|Wall Ball',
+    'Wall Ball Hawk 5 Lax Credits',
+    'Flex Points>12|Flex Points|Flex Points\n3',
+    'Attack Drills>Attack 10|Attack Token',
+    'Workout Length>15 Drill Workout|Long Workout|10 Drill Workout',
+    'Lacrosse Player Points>3Lax Credits|The Wall Wizard|Independent Improver',
+    'Lax Credit Wall Ball 5 Flex Points 2 Midfield Medal',
+])
+def test_edge_cases_match_legacy_parsers(categories):
+    for title in ('Wall Ball Workout', 'Attack 10 Minutes', 'Self-Guided', 'Something'):
+        for duration in (None, 0, 10):
+            assert_parity(title, categories, 'Tag A| Tag B', duration)
+
+def test_random_categories_match_legacy_parsers():
+    fragments = [
+        'Lax Credit', 'Lax Credits', 'lax credits', 'One', 'one', 'Two', '3', '15', ' ', '  ', '>', '|',
+        'Midfield Medal', 'Defense Dollar', 'Attack Token', 'Rebound Reward', 'Wall Ball', 'Flex Points',
+        'Attack', 'Attack Drills>Attack', 'Lacrosse Player Points', 'Foundation Ace', 'Wall Ball Hawk',
+        'The Wall Wizard', 'Long Workout', '10 Drill Workout', '5 Drill Workout', 'Academy', '\n', 'x'
+    ]
+    rng = random.Random(14)
+    for _ in range(5000):
+        categories = ''.join(rng.choice(fragments) for _ in range(rng.randint(0, 12)))
+        assert_parity('Workout', categories, '', rng.choice([None, 5]))
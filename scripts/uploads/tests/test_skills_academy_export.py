@@ -0,0 +1,81 @@
+"""
+Tests for the single read of the Quizzes-Workouts export
+The drills and workouts builds must share one pass over the file
+"""
+
+import csv
+
+import pytest
+
+import skills_academy_export
+import skills_academy_upload
+import skills_academy_workouts_upload
+from skills_academy_complete_upload import build_source_files
+
+EXPORT_ROWS = [
+    {'ID': '1', 'Title': 'Cradle Drill', 'Content': '<a href="https://vimeo.com/101">Watch</a>',
+     'Quiz / Workout Categories': 'Attack Drills'},
+    {'ID': '2', 'Title': 'Wall Ball Workout - 5 Minutes', 'Content': '',
+     'Quiz / Workout Categories': 'Wall Ball'},
+    {'ID': '3', 'Title': 'Broken Embed', 'Content': 'vimeo.com/not-an-id', 'Quiz / Workout Categories': ''},
+    {'ID': '4', 'Title': 'Split Dodge', 'Content': 'https://vimeo.com/202', 'Quiz / Workout Categories': ''},
+]
+
+@pytest.fixture
+def export_reads(tmp_path, monkeypatch):
+    """Point every export read at a small export and count the reads;
+    stage caching and output writing are replaced so nothing else is touched"""
+    path = str(tmp_path / 'export.csv')
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(EXPORT_ROWS[0]))
+        writer.writeheader()
+        writer.writerows(EXPORT_ROWS)
+
+    reads = []
+    iter_export_rows = skills_academy_export.iter_export_rows
+
+    def counted(*args, **kwargs):
+        reads.append(1)
+        return iter_export_rows(path)
+    monkeypatch.setattr(skills_academy_export, 'iter_export_rows', counted)
+
+    written = {}
+    for module, name in [(skills_academy_upload, 'write_drill_outputs'),
+                         (skills_academy_workouts_upload, 'write_workout_outputs')]:
+        def write(parts, name=name, **kwargs):
+            written[name] = [record for records, _ in parts for record in records]
+        monkeypatch.setattr(module, name, write)
+    return reads, written
+
+def use_cache(monkeypatch, cached):
+    def run_cached(stage, script, inputs, outputs, build, options=None, force=False, out=None):
+        if cached and not force:
+            return False
+        build()
+        return True
+    monkeypatch.setattr(skills_academy_upload, 'run_cached', run_cached)
+    monkeypatch.setattr(skills_academy_workouts_upload, 'run_cached', run_cached)
+
+def test_rebuild_reads_the_export_once(export_reads, monkeypatch):
+    reads, written = export_reads
+    use_cache(monkeypatch, cached=False)
+    counts = build_source_files()
+    assert len(reads) == 1
+    assert counts == {'drill': 2, 'workout': 1, 'rejected': 1}
+    assert len(written['write_drill_outputs']) == 2
+    assert len(written['write_workout_outputs']) == 1
+
+def test_cached_run_never_reads_the_export(export_reads, monkeypatch):
+    reads, written = export_reads
+    use_cache(monkeypatch, cached=True)
+    assert build_source_files() is None
+    assert reads == [] and written == {}
+
+    assert build_source_files(force=True) is not None
+    assert len(reads) == 1
+
+def test_rejected_rows_are_only_counted(export_reads):
+    counts = {}
+    streams = skills_academy_export.read_export_streams(counts=counts)
+    assert sorted(streams) == ['drill', 'workout']
+    assert counts == {'drill': 2, 'workout': 1, 'rejected': 1}
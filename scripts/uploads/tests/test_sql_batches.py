@@ -0,0 +1,70 @@
+"""
+Tests for batched SQL emission
+Literal quoting, conflict-aware batch splitting and the BEGIN/COMMIT
+wrapping of multi-row INSERTs
+"""
+
+from sql_batches import insert_batches, record_batches, sql_jsonb, sql_literal, sql_text_array, sql_value
+
+def test_literals():
+    assert sql_literal(None) == 'NULL'
+    assert sql_literal(True) == 'true'
+    assert sql_literal(False) == 'false'
+    assert sql_literal(0) == '0'
+    assert sql_literal(2.5) == '2.5'
+    assert sql_literal("O'Neil") == "'O''Neil'"
+    # standard_conforming_strings: backslashes are taken literally
+    assert sql_literal('Back\\slash') == "'Back\\slash'"
+    assert sql_literal('') == "''"
+
+def test_text_arrays():
+    assert sql_text_array([]) == 'ARRAY[]::text[]'
+    assert sql_text_array(["it's", None, 'a,b']) == "ARRAY['it''s', NULL, 'a,b']::text[]"
+
+def test_jsonb():
+    assert sql_jsonb({}) == "'{}'::jsonb"
+    assert sql_jsonb({'name': "O'Neil", 'ok': True, 'none': None}) == \
+        "'{\"name\": \"O''Neil\", \"ok\": true, \"none\": null}'::jsonb"
+    assert sql_jsonb({'path': 'a\\b'}) == "'{\"path\": \"a\\\\b\"}'::jsonb"
+
+def test_values_dispatch_on_type():
+    assert sql_value(['x']) == "ARRAY['x']::text[]"
+    assert sql_value({'a': 1}) == "'{\"a\": 1}'::jsonb"
+    assert sql_value(None) == 'NULL'
+
+def test_batches_split_on_size():
+    records = [[i] for i in range(7)]
+    assert [len(batch) for batch in record_batches(records, 3)] == [3, 3, 1]
+    assert [len(batch) for batch in record_batches(records, 7)] == [7]
+    assert list(record_batches([], 3)) == []
+
+def test_repeated_conflict_key_starts_a_new_batch():
+    records = [[1, 'a'], [2, 'b'], [1, 'c'], [3, 'd'], [2, 'e']]
+    assert list(record_batches(records, 10, [0])) == [
+        [[1, 'a'], [2, 'b']], [[1, 'c'], [3, 'd'], [2, 'e']]
+    ]
+    # Without conflict keys repeats stay together
+    assert len(list(record_batches(records, 10))) == 1
+
+def test_insert_statements_are_wrapped_in_transactions():
+    statements = list(insert_batches('badges', ['original_id', 'title'], [[i, f'T{i}'] for i in range(5)],
+                                     batch_size=2, expressions={'created_at': 'NOW()'}))
+    assert len(statements) == 3
+    for statement in statements:
+        lines = statement.strip().split('\n')
+        assert lines[0] == 'BEGIN;'
+        assert lines[1] == 'INSERT INTO badges ('
+        assert lines[-1] == 'COMMIT;'
+    assert "(0, 'T0', NOW()),\n(1, 'T1', NOW());" in statements[0]
+    assert "(4, 'T4', NOW());" in statements[2]
+    assert '    created_at\n) VALUES' in statements[0]
+
+def test_upserts_never_touch_a_key_twice():
+    statements = list(insert_batches('badges', ['original_id', 'title'], [[1, 'a'], [1, 'b']],
+                                     conflict_columns=['original_id'],
+                                     conflict_updates=['title = EXCLUDED.title']))
+    assert len(statements) == 2
+    for statement in statements:
+        assert statement.endswith(
+            'ON CONFLICT (original_id) DO UPDATE SET\n    title = EXCLUDED.title;\nCOMMIT;'
+        )
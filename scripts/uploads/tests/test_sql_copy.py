@@ -0,0 +1,106 @@
+"""
+Tests for COPY-format SQL emission
+COPY lines are decoded here the way Postgres reads them, so escaping is
+checked without a database
+"""
+
+import json
+import re
+
+import pytest
+
+from sql_copy import copy_array, copy_batches, copy_field, copy_lines, staging_sql
+
+RECORDS = [
+    [1, 'Tab\there', ['Offense (with ball)', 'Say "hi"', 'Back\\slash', None, 'NULL'],
+     {'text': 'Line\nbreak\t"quoted"\\', 'missing': None}, True, None],
+    [2, '', [], {}, False, 'Carriage\r\nreturn'],
+    [3, '\\N', ['a,b', '{braces}', ''], {'nested': {'list': ['x', None]}}, None, 'plain'],
+]
+
+TEXT_UNESCAPES = {'\\\\': '\\', '\\n': '\n', '\\r': '\r', '\\t': '\t'}
+
+def read_text_line(line):
+    """Fields of a COPY text line, with \\N as None"""
+    fields = []
+    for field in line.split('\t'):
+        if field == '\\N':
+            fields.append(None)
+        else:
+            fields.append(re.sub(r'\\[\\nrt]', lambda match: TEXT_UNESCAPES[match.group()], field))
+    return fields
+
+def read_csv_line(line):
+    """Fields of a COPY CSV line whose non-NULL fields are all quoted, with
+    empty unquoted fields as None"""
+    tokens = re.findall(r'(?:^|,)("(?:[^"]|"")*"|)(?=,|$)', line, re.DOTALL)
+    return [token[1:-1].replace('""', '"') if token else None for token in tokens]
+
+def read_array(literal):
+    """Elements of a TEXT[] input literal whose elements are quoted or NULL"""
+    elements = re.findall(r'"((?:[^"\\]|\\.)*)"|NULL', literal[1:-1])
+    raw = re.findall(r'"(?:[^"\\]|\\.)*"|NULL', literal[1:-1])
+    return [None if token == 'NULL' else re.sub(r'\\(.)', r'\1', element)
+            for element, token in zip(elements, raw)]
+
+def decode(fields):
+    """Record values back from decoded COPY fields in RECORDS column order"""
+    record_id, title, tags, metadata, flag, note = fields
+    return [int(record_id), title, read_array(tags), json.loads(metadata),
+            None if flag is None else flag == 't', note]
+
+@pytest.mark.parametrize('copy_format, read_line', [('text', read_text_line), ('csv', read_csv_line)])
+def test_lines_decode_to_the_records(copy_format, read_line):
+    lines = list(copy_lines(RECORDS, copy_format))
+    assert len(lines) == len(RECORDS)
+    if copy_format == 'text':
+        # Text format keeps every record on one physical line
+        assert all('\n' not in line and '\r' not in line for line in lines)
+    assert [decode(read_line(line)) for line in lines] == RECORDS
+
+def test_text_null_and_escapes():
+    assert copy_field(None) == '\\N'
+    assert copy_field('\\N') == '\\\\N'
+    assert copy_field('a\tb\nc\rd\\e') == 'a\\tb\\nc\\rd\\\\e'
+    assert copy_field('') == ''
+    assert copy_field(True) == 't'
+
+def test_csv_null_is_the_only_empty_field():
+    assert copy_field(None, 'csv') == ''
+    assert copy_field('', 'csv') == '""'
+    assert copy_field('Say "hi"', 'csv') == '"Say ""hi"""'
+    assert copy_field(False, 'csv') == '"f"'
+
+def test_array_elements():
+    assert copy_array([]) == '{}'
+    assert copy_array(['NULL', None]) == '{"NULL",NULL}'
+    assert copy_array(['Say "hi"', 'a\\b']) == '{"Say \\"hi\\"","a\\\\b"}'
+
+def test_staging_upsert_sql():
+    staging, create, upsert = staging_sql('player_ranks', ['original_id', 'title'], ['original_id'],
+                                          ['title = EXCLUDED.title', 'updated_at = NOW()'])
+    assert staging == 'player_ranks_staging'
+    assert create == ('CREATE TEMP TABLE player_ranks_staging ON COMMIT DROP AS '
+                      'SELECT original_id, title FROM player_ranks WITH NO DATA')
+    assert upsert == ('INSERT INTO player_ranks (original_id, title)\n'
+                      'SELECT original_id, title FROM player_ranks_staging\n'
+                      'ON CONFLICT (original_id) DO UPDATE SET\n'
+                      '    title = EXCLUDED.title,\n'
+                      '    updated_at = NOW()')
+
+def test_upsert_batches_copy_through_staging():
+    records = [[1, 'a'], [2, 'b'], [1, 'c']]
+    batches = list(copy_batches('player_ranks', ['original_id', 'title'], records, batch_size=10,
+                                conflict_columns=['original_id'], conflict_updates=['title = EXCLUDED.title']))
+    # The repeated key starts a second transaction
+    assert len(batches) == 2
+    lines = batches[0].strip().split('\n')
+    assert lines[0] == 'BEGIN;'
+    assert lines[1].startswith('CREATE TEMP TABLE player_ranks_staging ')
+    assert lines[2:6] == ['COPY player_ranks_staging (original_id, title) FROM STDIN;', '1\ta', '2\tb', '\\.']
+    assert lines[6] == 'INSERT INTO player_ranks (original_id, title)'
+    assert lines[-1] == 'COMMIT;'
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        list(copy_batches('t', ['a'], [[1]], copy_format='binary'))
@@ -0,0 +1,48 @@
+"""
+Tests for delta SQL against a previous export snapshot
+"""
+
+from sql_delta import delta_statements, diff_records, snapshot_hashes
+
+COLUMNS = ['original_id', 'title', 'tags', 'point_values']
+
+PREVIOUS = [
+    [1, 'Cradle', ['a'], {'lax_credit': 1}],
+    [2, 'Dodge', ['b'], {}],
+    [3, 'Shoot', [], {'attack_token': 1}],
+]
+
+def test_diff_classifies_rows():
+    current = [
+        [1, 'Cradle', ['a'], {'lax_credit': 1}],
+        [3, 'Shoot', [], {'attack_token': 2}],
+        [4, "O'Neil", ['c'], {}],
+    ]
+    counts = {}
+    changes = list(diff_records(snapshot_hashes(PREVIOUS), current, counts=counts))
+    assert changes == [('update', current[1]), ('insert', current[2]), ('delete', 2)]
+    assert counts == {'insert': 1, 'update': 1, 'delete': 1, 'unchanged': 1}
+
+def test_unchanged_export_has_no_statements():
+    changes = diff_records(snapshot_hashes(PREVIOUS), [list(record) for record in PREVIOUS])
+    assert list(delta_statements('drills', COLUMNS, changes)) == []
+
+def test_dict_key_order_does_not_count_as_change():
+    current = [[1, 'Cradle', ['a'], {'lax_credit': 1}], [2, 'Dodge', ['b'], {}],
+               [3, 'Shoot', [], {'attack_token': 1}]]
+    current[0][3] = dict(reversed(list(current[0][3].items())))
+    assert list(diff_records(snapshot_hashes(PREVIOUS), current)) == []
+
+def test_statements_batch_each_kind():
+    changes = [('insert', [10 + i, f'New {i}', [], {}]) for i in range(3)]
+    changes += [('update', [1, 'Cradle 2', ['a'], {}])]
+    changes += [('delete', 2), ('delete', 3)]
+    statements = list(delta_statements('drills', COLUMNS, changes, batch_size=2,
+                                       insert_expressions={'created_at': 'NOW()'},
+                                       update_expressions={'updated_at': 'NOW()'}))
+    assert len(statements) == 4
+    assert statements[0].count('INSERT INTO drills') == 1 and '(11, ' in statements[0]
+    assert '(12, ' in statements[1] and 'ON CONFLICT (original_id) DO UPDATE SET' in statements[1]
+    assert "UPDATE drills SET\n    title = 'Cradle 2'" in statements[2]
+    assert 'updated_at = NOW()\nWHERE original_id = 1;' in statements[2]
+    assert 'DELETE FROM drills WHERE original_id IN (2, 3);' in statements[3]
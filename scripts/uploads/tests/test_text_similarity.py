@@ -0,0 +1,67 @@
+"""
+Tests for the text similarity helpers
+Bit-parallel Levenshtein must agree with the textbook dynamic program
+"""
+
+import random
+
+import pytest
+
+from text_similarity import (
+    compile_levenshtein_pattern, levenshtein_distance, levenshtein_ratio, levenshtein_ratio_batch,
+    pattern_distance
+)
+
+def dp_distance(a, b):
+    """Levenshtein distance by the full dynamic-programming table, row by row"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+def random_pairs(seed, count, max_length, alphabet):
+    rng = random.Random(seed)
+    for _ in range(count):
+        a = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+        # Half the pairs are edits of a, so distances span small to large
+        if rng.random() < 0.5:
+            b = list(a)
+            for _ in range(rng.randint(0, 5)):
+                position = rng.randint(0, len(b))
+                b[position:position + rng.randint(0, 1)] = rng.choice(['', rng.choice(alphabet)])
+            b = ''.join(b)
+        else:
+            b = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+        yield a, b
+
+@pytest.mark.parametrize('a, b', [
+    ('', ''), ('', 'dodge'), ('split', ''), ('2-3-1', '2-3-1'), ('kitten', 'sitting'),
+    ('flaw', 'lawn'), ('face off', 'faceoff'), ('é ü', 'e u'), ('a' * 64, 'a' * 63 + 'b'),
+    ('x' * 65, ''), ('ab' * 40, 'ba' * 40),
+])
+def test_known_pairs(a, b):
+    assert levenshtein_distance(a, b) == dp_distance(a, b)
+    assert levenshtein_distance(b, a) == dp_distance(a, b)
+
+@pytest.mark.parametrize('seed, max_length', [(1, 10), (2, 63), (3, 64), (4, 65), (5, 200)])
+def test_random_pairs_match_dynamic_program(seed, max_length):
+    for a, b in random_pairs(seed, 150, max_length, 'abcde -'):
+        assert levenshtein_distance(a, b) == dp_distance(a, b), (a, b)
+
+def test_compiled_pattern_is_reusable():
+    query = 'motion offense against a zone defense with a long description ' * 2
+    pattern = compile_levenshtein_pattern(query)
+    candidates = ['', query, query[:70], query.upper(), 'zone defense', query[::-1]]
+    for candidate in candidates:
+        assert pattern_distance(pattern, candidate) == dp_distance(query, candidate)
+    ratios = levenshtein_ratio_batch(query, candidates)
+    assert ratios == [levenshtein_ratio(query, candidate) for candidate in candidates]
+    assert ratios[0] == 0.0 and ratios[1] == 1.0
+
+def test_ratio_of_empty_strings():
+    assert levenshtein_ratio('', '') == 1.0
+    assert levenshtein_ratio('', 'ride') == 0.0
+    assert levenshtein_ratio('ride', 'rude') == 0.75
@@ -0,0 +1,144 @@
+"""
+Tests for the dependency-graph runner in upload_pipeline
+"""
+
+import sys
+import threading
+
+import pytest
+
+import skills_academy_complete_upload
+import upload_pipeline
+from sql_batches import write_sql_file
+from upload_pipeline import critical_path, export_rows, read_export, run_stages, with_dependencies
+
+def make_stages(log, release=None):
+    def stage(name, value):
+        def run(results, options, out):
+            if release is not None and name in ('left', 'right') and not release.wait(5):
+                raise AssertionError(f'{name} did not overlap with alone')
+            log.append(name)
+            print(f"{name} says hi", file=out)
+            return value(results, options)
+        return run
+    return {
+        'source': {'deps': [], 'run': stage('source', lambda results, options: [1, 2, 3])},
+        'left': {'deps': ['source'], 'run': stage('left', lambda results, options: sum(results['source']))},
+        'right': {'deps': ['source'], 'run': stage('right', lambda results, options: len(results['source']))},
+        'join': {'deps': ['left', 'right'],
+                 'run': stage('join', lambda results, options: results['left'] * options['scale'] + results['right'])},
+        'alone': {'deps': [], 'run': stage('alone', lambda results, options: None)},
+    }
+
+def test_dependencies_are_pulled_in_stage_order():
+    stages = make_stages([])
+    assert with_dependencies(['join'], stages) == ['source', 'left', 'right', 'join']
+    assert with_dependencies(['alone', 'left'], stages) == ['source', 'left', 'alone']
+
+def test_results_pass_between_stages_in_memory(capsys):
+    log = []
+    stages = make_stages(log)
+    outcomes = run_stages(list(stages), {'scale': 10}, stages=stages)
+    assert outcomes['join'][0] == 63
+    assert log.index('join') > max(log.index('left'), log.index('right')) > log.index('source')
+    out = capsys.readouterr().out
+    # Each stage's prints come out as one block ending with its timing
+    assert 'join says hi\n✅ join finished in' in out
+
+def test_stages_print_to_their_own_stream(capsys):
+    stdout = sys.stdout
+    seen = []
+
+    def run(results, options, out):
+        # sys.stdout is left alone for other threads and libraries
+        seen.append(sys.stdout is stdout)
+        out.write('first\n')
+        out.write('second\n')
+    stages = {'solo': {'deps': [], 'run': run}}
+    run_stages(['solo'], {}, stages=stages)
+    assert seen == [True]
+    assert 'first\nsecond\n✅ solo finished in' in capsys.readouterr().out
+
+def test_independent_stages_run_concurrently():
+    release = threading.Event()
+    log = []
+    stages = make_stages(log, release)
+    stages['alone']['run'] = lambda results, options, out: release.set()
+    outcomes = run_stages(list(stages), {'scale': 1}, stages=stages)
+    assert outcomes['join'][0] == 9
+
+def test_failure_is_raised_and_dependents_skipped():
+    log = []
+    stages = make_stages(log)
+
+    def broken(results, options, out):
+        raise ValueError('bad export')
+    stages['left']['run'] = broken
+    with pytest.raises(ValueError, match='bad export'):
+        run_stages(list(stages), {'scale': 1}, stages=stages)
+    assert 'join' not in log
+
+def test_critical_path_follows_the_longest_chain():
+    stages = make_stages([])
+    durations = {'source': 1.0, 'left': 0.5, 'right': 2.0, 'join': 1.0, 'alone': 3.5}
+    assert critical_path(durations, stages) == (4.0, ['source', 'right', 'join'])
+    durations['alone'] = 4.5
+    assert critical_path(durations, stages) == (4.5, ['alone'])
+
+def test_stages_depend_only_on_what_they_read():
+    assert with_dependencies(['ranks']) == ['ranks']
+    assert with_dependencies(['badges']) == ['badges']
+    assert with_dependencies(['skills_academy_complete']) == ['export', 'drills', 'workouts',
+                                                              'skills_academy_complete']
+    # Badges, ranks and gamification_complete are separate chains, so the
+    # critical path never strings them together
+    durations = {name: 1.0 for name in upload_pipeline.STAGES}
+    assert critical_path(durations)[1] == ['export', 'drills', 'skills_academy_complete']
+
+def without_timestamps(text):
+    return [line for line in text.split('\n') if not line.startswith('-- Generated')]
+
+def test_complete_file_uses_the_sql_written_upstream(tmp_path, monkeypatch):
+    drills_sql = str(tmp_path / 'drills.sql')
+    workouts_sql = str(tmp_path / 'workouts.sql')
+    monkeypatch.setattr(skills_academy_complete_upload, 'DRILLS_SQL', drills_sql)
+    monkeypatch.setattr(skills_academy_complete_upload, 'WORKOUTS_SQL', workouts_sql)
+    monkeypatch.setattr(skills_academy_complete_upload, 'COMPLETE_SQL', str(tmp_path / 'complete.sql'))
+    sql = {}
+    write_sql_file(drills_sql, ['INSERT drill;', "'a\r\nb';"], lambda: '-- Drills\n', keep=sql)
+    with open(workouts_sql, 'w', encoding='utf-8') as f:
+        f.write('-- Workouts\nINSERT workout;\n')
+
+    from_disk = open(skills_academy_complete_upload.combine_sql_files(), encoding='utf-8').read()
+    # The drills file is never opened when its text is handed over
+    with open(drills_sql, 'w', encoding='utf-8') as f:
+        f.write('stale\n')
+    from_memory = open(skills_academy_complete_upload.combine_sql_files(sql=sql), encoding='utf-8').read()
+    assert without_timestamps(from_memory) == without_timestamps(from_disk)
+    assert 'INSERT drill;' in from_memory and 'INSERT workout;' in from_memory
+
+def test_sql_stages_hand_on_their_text(monkeypatch):
+    def build(batch_size, sql=None):
+        sql['drills.sql'] = f'{batch_size} rows'
+        return True
+    assert upload_pipeline.with_sql(build, 5) == (True, {'drills.sql': '5 rows'})
+    assert upload_pipeline.rebuilt((True, {})) and upload_pipeline.rebuilt(True)
+    assert not upload_pipeline.rebuilt((False, {})) and not upload_pipeline.rebuilt({'drill': []})
+
+@pytest.mark.parametrize('cached, force, reads', [(True, False, 0), (False, False, 1), (True, True, 1)])
+def test_export_is_read_only_for_stages_that_rebuild(monkeypatch, capsys, cached, force, reads):
+    calls = []
+    monkeypatch.setattr(upload_pipeline, 'drill_files_cached', lambda *args: cached)
+    monkeypatch.setattr(upload_pipeline, 'workout_files_cached', lambda *args: cached)
+    monkeypatch.setattr(upload_pipeline, 'read_export_streams',
+                        lambda counts: calls.append(1) or counts.update(drill=2, workout=1, rejected=4)
+                        or {'drill': [1, 2], 'workout': [3]})
+
+    streams = read_export({'batch_size': 10, 'copy_format': None, 'force': force}, sys.stdout)
+    assert len(calls) == reads
+    if reads:
+        assert export_rows(streams, 'drill')() == [1, 2]
+        assert '2 drill, 1 workout, 4 rejected' in capsys.readouterr().out
+    else:
+        # The drills and workouts stages would read the export themselves
+        assert streams is None and export_rows(streams, 'drill') is None
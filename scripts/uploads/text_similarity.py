@@ -0,0 +1,139 @@
+"""
+Fast approximate text similarity helpers for the Lacrosse Lab matcher
+MinHash signatures and LSH band keys for long content fields,
+and bit-parallel Levenshtein for names
+"""
+
+import random
+import zlib
+
+# MinHash settings: 64 permutations split into 16 LSH bands of 4 rows
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+def _hash_permutations(count, seed=1):
+    """Build deterministic (a, b) coefficients for universal hashing"""
+    rng = random.Random(seed)
+    return [
+        (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+        for _ in range(count)
+    ]
+
+_PERMUTATIONS = _hash_permutations(MINHASH_PERMUTATIONS)
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Return the set of word shingles in already-normalized text"""
+    words = text.split()
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def minhash_signature(text):
+    """Compute the MinHash signature of normalized text.
+
+    Shingles are hashed with crc32 rather than hash() so signatures are
+    stable across processes and runs. Empty text gives an empty signature.
+    """
+    hashes = {zlib.crc32(shingle.encode('utf-8')) for shingle in shingles(text)}
+    if not hashes:
+        return ()
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    )
+
+def estimated_jaccard(signature_a, signature_b):
+    """Estimate the Jaccard similarity of two texts from their signatures"""
+    if not signature_a or not signature_b:
+        # Mirror SequenceMatcher: two empty texts are identical
+        return 1.0 if signature_a == signature_b else 0.0
+    same = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return same / len(signature_a)
+
+def lsh_keys(signature, bands=LSH_BANDS):
+    """Split a signature into per-band bucket keys"""
+    rows = len(signature) // bands
+    return [(band, signature[band * rows:(band + 1) * rows]) for band in range(bands)]
+
+def lsh_candidates(index, signature, bands=LSH_BANDS):
+    """Return positions sharing at least one LSH band with the signature.
+
+    index maps each lsh_keys bucket key to the positions filed under it.
+    """
+    candidates = set()
+    if not signature:
+        return candidates
+    for key in lsh_keys(signature, bands):
+        candidates.update(index.get(key, ()))
+    return candidates
+
+def compile_levenshtein_pattern(query):
+    """Precompute the per-character bit masks for bit-parallel Levenshtein.
+
+    Compile once and reuse the pattern to score one query against many
+    candidate strings.
+    """
+    masks = {}
+    for i, char in enumerate(query):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks, len(query)
+
+def pattern_distance(pattern, text):
+    """Levenshtein distance between a compiled pattern and text.
+
+    Myers' bit-vector algorithm in Hyyro's formulation: each column of the
+    dynamic-programming matrix is updated with a handful of integer ops,
+    and Python's unbounded ints let the pattern be any length.
+    """
+    masks, length = pattern
+    if not length:
+        return len(text)
+    
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    positive = full
+    negative = 0
+    distance = length
+    
+    for char in text:
+        eq = masks.get(char, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        horizontal_positive = negative | ~(xh | positive)
+        horizontal_negative = positive & xh
+        
+        if horizontal_positive & last:
+            distance += 1
+        elif horizontal_negative & last:
+            distance -= 1
+        
+        horizontal_positive = (horizontal_positive << 1) | 1
+        horizontal_negative <<= 1
+        positive = (horizontal_negative | ~(xv | horizontal_positive)) & full
+        negative = horizontal_positive & xv & full
+    
+    return distance
+
+def pattern_ratio(pattern, text):
+    """Normalized Levenshtein similarity in [0, 1] for a compiled pattern"""
+    longest = max(pattern[1], len(text))
+    if not longest:
+        return 1.0
+    return 1.0 - pattern_distance(pattern, text) / longest
+
+def levenshtein_distance(a, b):
+    """Levenshtein edit distance between two strings"""
+    return pattern_distance(compile_levenshtein_pattern(a), b)
+
+def levenshtein_ratio(a, b):
+    """Normalized Levenshtein similarity: 1 - distance / longer length"""
+    return pattern_ratio(compile_levenshtein_pattern(a), b)
+
+def levenshtein_ratio_batch(query, candidates):
+    """Score one query against many candidates, compiling the query once"""
+    pattern = compile_levenshtein_pattern(query)
+    return [pattern_ratio(pattern, candidate) for candidate in candidates]
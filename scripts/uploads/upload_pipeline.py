@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+POWLAX Upload Pipeline
+Runs every upload script as one dependency graph: independent stages run
+concurrently, the export is read once (or not at all when the stages using
+it are cached) and handed to them in memory, and the run ends with the critical path and the order to apply
+the generated SQL in
+"""
+
+import argparse
+import concurrent.futures
+import io
+import sys
+import threading
+import time
+
+from badges_upload import BADGES_SQL, build_badge_files
+from gamification_complete_upload import GAMIFICATION_SQL, build_gamification_files
+from ranks_upload import RANKS_SQL, build_rank_files
+from skills_academy_complete_upload import COMPLETE_SQL, build_complete_files
+from skills_academy_export import STREAMS, read_export_streams
+from skills_academy_upload import build_drill_files, drill_files_cached
+from skills_academy_workouts_upload import build_workout_files, workout_files_cached
+from sql_batches import DEFAULT_BATCH_SIZE
+from sql_copy import COPY_FORMATS
+
+def read_export(options, out):
+    """Stage: read and classify the export once for the drills and workouts
+    stages, or skip the read (returning None) when the build cache already
+    has both of their outputs"""
+    if not options['force'] and drill_files_cached(options['batch_size'], options['copy_format']) \
+            and workout_files_cached(options['batch_size'], options['copy_format']):
+        print("♻️  export: drills and workouts are cached, export not read", file=out)
+        return None
+    counts = {stream: 0 for stream in STREAMS}
+    streams = read_export_streams(counts=counts)
+    summary = ', '.join(f"{counts[stream]} {stream}" for stream in STREAMS)
+    print(f"✅ Sorted export rows: {summary}", file=out)
+    return streams
+
+def with_sql(build, *args, **kwargs):
+    """Run a SQL stage's build; returns (rebuilt, {path: SQL text}) so a
+    later stage can use the text without reading the file back. The text
+    is empty when the stage was cached"""
+    sql = {}
+    return build(*args, sql=sql, **kwargs), sql
+
+def rebuilt(result):
+    """Whether a stage result says the stage was rebuilt"""
+    if isinstance(result, tuple):
+        result = result[0]
+    return result is True
+
+def export_rows(streams, stream):
+    """rows hook for a build reusing the export stage's read; None (read the
+    export itself) if the export stage skipped it because the stage was cached"""
+    return None if streams is None else lambda: streams[stream]
+
+# Stages, their dependencies and how to run them from the dependency
+# results, the command line options and the stream to print to. Listed in
+# a valid run order. A stage depends only on stages whose results it uses;
+# the order the SQL is applied in is APPLY_ORDER.
+STAGES = {
+    'export': {
+        'deps': [],
+        'run': lambda results, options, out: read_export(options, out),
+    },
+    'drills': {
+        'deps': ['export'],
+        'run': lambda results, options, out: with_sql(
+            build_drill_files, options['batch_size'], options['copy_format'],
+            rows=export_rows(results['export'], 'drill'), force=options['force'], out=out),
+    },
+    'workouts': {
+        'deps': ['export'],
+        'run': lambda results, options, out: with_sql(
+            build_workout_files, options['batch_size'], options['copy_format'],
+            rows=export_rows(results['export'], 'workout'), force=options['force'], out=out),
+    },
+    'skills_academy_complete': {
+        'deps': ['drills', 'workouts'],
+        'run': lambda results, options, out: build_complete_files(
+            options['force'], out, sql={**results['drills'][1], **results['workouts'][1]}),
+    },
+    'gamification_complete': {
+        'deps': [],
+        'run': lambda results, options, out: build_gamification_files(options['force'], out),
+    },
+    'badges': {
+        'deps': [],
+        'run': lambda results, options, out: build_badge_files(
+            options['batch_size'], options['copy_format'], options['workers'],
+            force=options['force'], out=out),
+    },
+    'ranks': {
+        'deps': [],
+        'run': lambda results, options, out: build_rank_files(
+            options['batch_size'], options['copy_format'], force=options['force'], out=out),
+    },
+}
+
+# Generated SQL in the order it has to be applied: the gamification setup
+# before the badges and ranks that use its tables
+APPLY_ORDER = [COMPLETE_SQL, GAMIFICATION_SQL, BADGES_SQL, RANKS_SQL]
+
+def with_dependencies(names, stages=STAGES):
+    """names and every stage they depend on, in STAGES order"""
+    needed = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(stages[name]['deps'])
+    return [name for name in stages if name in needed]
+
+def critical_path(durations, stages=STAGES):
+    """(seconds, [stage, ...]) for the longest chain of dependent stages"""
+    finish = {}
+    previous = {}
+    for name in durations:
+        deps = [dep for dep in stages[name]['deps'] if dep in finish]
+        before = max(deps, key=finish.get, default=None)
+        finish[name] = durations[name] + (finish[before] if before else 0.0)
+        previous[name] = before
+    if not finish:
+        return 0.0, []
+    name = max(finish, key=finish.get)
+    seconds = finish[name]
+    path = []
+    while name:
+        path.append(name)
+        name = previous[name]
+    return seconds, path[::-1]
+
+def run_stages(names, options, jobs=None, stages=STAGES):
+    """Run the named stages, each as soon as its dependencies are done.
+
+    Stages run on threads, so results pass between them in memory; stages
+    that parse in process pools still get their own workers. Each stage
+    prints to its own buffer, passed to it as out, and the buffer is
+    printed as one block when the stage ends, so concurrent stages never
+    interleave. Returns {stage: (result, seconds)}; the first failure is
+    raised once the stages already running have finished.
+    """
+    lock = threading.Lock()
+    results = {}
+    durations = {}
+    remaining = list(names)
+    running = {}
+
+    def run(name):
+        out = io.StringIO()
+        started = time.perf_counter()
+        try:
+            deps = {dep: results[dep] for dep in stages[name]['deps']}
+            result = stages[name]['run'](deps, options, out)
+            seconds = time.perf_counter() - started
+            print(f"✅ {name} finished in {seconds:.2f}s", file=out)
+            return result, seconds
+        finally:
+            with lock:
+                sys.stdout.write(out.getvalue())
+
+    failure = None
+    with concurrent.futures.ThreadPoolExecutor(jobs or len(names) or 1) as executor:
+        while remaining or running:
+            if failure is None:
+                for name in list(remaining):
+                    if all(dep in results for dep in stages[name]['deps']):
+                        remaining.remove(name)
+                        with lock:
+                            print(f"▶️  {name}")
+                        running[executor.submit(run, name)] = name
+            elif not running:
+                break
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name], durations[name] = future.result()
+                except Exception as error:
+                    with lock:
+                        print(f"❌ {name} failed: {error}")
+                    failure = failure or error
+    if failure is not None:
+        raise failure
+    return {name: (results[name], durations[name]) for name in names}
+
+def main():
+    parser = argparse.ArgumentParser(description='Build every POWLAX upload file as one dependency graph')
+    parser.add_argument('stages', nargs='*', metavar='stage',
+                        help=f"Stages to build, with their dependencies: {', '.join(STAGES)} (default: all)")
+    parser.add_argument('--jobs', type=int, default=0, help='Stages run at once (default: all that are ready)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per multi-row INSERT or COPY block')
+    parser.add_argument('--copy', choices=COPY_FORMATS, dest='copy_format',
+                        help='Emit COPY ... FROM STDIN data in this format instead of INSERTs (run with psql)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes parsing the badge category exports (0 = one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild every stage even if the build cache has its outputs')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    names = with_dependencies(args.stages or list(STAGES))
+    options = {'batch_size': args.batch_size, 'copy_format': args.copy_format,
+               'workers': args.workers, 'force': args.force}
+
+    print(f"🧭 Running {len(names)} stages: {', '.join(names)}\n")
+    started = time.perf_counter()
+    outcomes = run_stages(names, options, args.jobs)
+    wall = time.perf_counter() - started
+
+    durations = {name: seconds for name, (_, seconds) in outcomes.items()}
+    path_seconds, path = critical_path(durations)
+    rebuilt_stages = [name for name, (result, _) in outcomes.items() if rebuilt(result)]
+    print(f"\n📊 Pipeline Summary:")
+    print(f"  Wall time: {wall:.2f}s (stage time {sum(durations.values()):.2f}s)")
+    print(f"  Critical path: {' → '.join(path)} ({path_seconds:.2f}s)")
+    print(f"  Rebuilt: {', '.join(rebuilt_stages) or 'nothing, every stage was cached'}")
+    print("\n📋 Apply in Supabase in this order:")
+    for i, path_name in enumerate(APPLY_ORDER, 1):
+        print(f"  {i}. {path_name}")
+
+if __name__ == "__main__":
+    main()